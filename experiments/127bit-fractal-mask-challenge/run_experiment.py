@@ -18,11 +18,18 @@ Configuration per technical memo:
 - K-values: [0.30, 0.35, 0.40]
 """
 
+import os
+import sys
 import mpmath as mp
 from typing import Tuple, Optional, List, Dict
 import time
 from math import log, e
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from mandelbrot_scoring import score_segments
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
+
 # 127-bit challenge
 CHALLENGE_127 = 137524771864208156028430259349934309717
 EXPECTED_P = 10508623501177419659
@@ -60,33 +67,6 @@ SMALL_PRIMES = [
 ]
 
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
-    """Embed integer n into 7D torus using geodesic mapping."""
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        coords.append(coord)
-    return coords
-
-
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """Compute Riemannian geodesic distance on 7D torus."""
-    if len(p1) != len(p2):
-        raise ValueError("Points must have same dimension")
-    dist_sq = mp.mpf(0)
-    for c1, c2 in zip(p1, p2):
-        diff = abs(c1 - c2)
-        wrap_diff = mp.mpf(1) - diff
-        min_diff = min(diff, wrap_diff)
-        dist_sq += min_diff * min_diff
-    return mp.sqrt(dist_sq)
-
-
 def is_valid_candidate(candidate: int, N: int, sqrt_N: int, 
                        n_prime_factors: set) -> bool:
     """
@@ -272,14 +252,19 @@ def run_127bit_challenge(verbose: bool = True) -> Optional[Tuple[int, int]]:
         # Phase 1: Score all segments
         print(f"Phase 1: Scoring {SEGMENTS} segments...")
         segment_size = (window_end - window_start) // SEGMENTS
-        segment_scores = []
+        segments = []
         
         for i in range(SEGMENTS):
             seg_start = window_start + i * segment_size
             seg_end = seg_start + segment_size if i < SEGMENTS - 1 else window_end
-            
-            score = score_segment_with_mandelbrot(seg_start, seg_end, N, sqrt_N)
-            segment_scores.append((score, seg_start, seg_end))
+            segments.append((seg_start, seg_end))
+        
+        # Same scores as score_segment_with_mandelbrot (κ = 0.5), one batch
+        scores = score_segments(segments, N, sqrt_N, kappa=0.5,
+                                max_iterations=MANDELBROT_ITERATIONS,
+                                escape_radius=ESCAPE_RADIUS).tolist()
+        segment_scores = [(score, seg_start, seg_end)
+                          for score, (seg_start, seg_end) in zip(scores, segments)]
         
         # Sort and show distribution
         segment_scores_sorted = sorted(segment_scores, reverse=True, key=lambda x: x[0])
@@ -15,7 +15,9 @@ Key functions:
 - apply_wheel(candidates, wheel) -> candidates' - Wheel mask filter
 - scan_band_Z5D(band, params) -> Peaks - Z5D intra-band scanning
 - is_flat(window, tau, L) -> bool - Flat-surface detector
+- FlatDetector(tau, L).update(a) -> bool - Streaming is_flat, O(1) per step
 - run_scan(N, params, guards) -> Report - Full scan with optional early-exit
+- scan_bands_parallel(bands, ...) -> [BandResult] - Process-pool band scheduler
 
 Constants:
 - CHALLENGE_127 = 137524771864208156028430259349934309717
@@ -25,9 +27,11 @@ Constants:
 
 import sys
 import os
-import json
 import time
+import itertools
 import subprocess
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass, field, asdict
 from typing import List, Tuple, Optional, Iterator, Dict, Any
 from math import log, isqrt
@@ -38,6 +42,8 @@ import mpmath as mp
 # Add path to z5d-informed-gva for wheel_residues
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'z5d-informed-gva'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'z5d-comprehensive-challenge'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from wheel_residues import (
     is_admissible, next_admissible, prev_admissible,
@@ -45,6 +51,8 @@ from wheel_residues import (
     WHEEL_MODULUS, WHEEL_SIZE, WHEEL_210_RESIDUES
 )
 from z5d_api import local_prime_density, expected_gap
+from jsonl_log import BufferedJSONLWriter
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
 
 # Precompute residue-to-index mapping for O(1) lookup
 WHEEL_RESIDUE_INDEX = {r: i for i, r in enumerate(WHEEL_210_RESIDUES)}
@@ -65,6 +73,7 @@ DEFAULT_WHEEL = 210     # Wheel modulus
 DEFAULT_TAU_GRAD = 1e-6 # Gradient threshold for flat detection
 DEFAULT_TAU_CURV = 1e-8 # Curvature threshold for flat detection
 DEFAULT_L = 8           # Window size for flat detection
+DEFAULT_CHUNK_STEPS = 64  # Steps per work unit in the parallel scheduler
 
 
 # ============================================================================
@@ -152,34 +161,60 @@ class ScanReport:
     
     # Artifacts
     bands: List[Dict] = field(default_factory=list)
+    band_stats: List[Dict] = field(default_factory=list)
     peaks: List[Dict] = field(default_factory=list)
 
 
+@dataclass
+class BandResult:
+    """Outcome of scanning one band."""
+    band_id: int
+    steps: int = 0
+    early_exited: bool = False
+    peaks: List[Peak] = field(default_factory=list)
+
+
+@dataclass
+class _ChunkResult:
+    """Outcome of scanning steps [start, stop) of one band."""
+    band_id: int
+    start: int
+    steps: int
+    early_exited: bool
+    peaks: List[Peak]
+    samples: List[Tuple[int, int, float]]  # (step, candidate, amplitude) every 100 steps
+
+
 # ============================================================================
 # JSONL Logger
 # ============================================================================
 
 class JSONLLogger:
-    """Logs events to JSONL file."""
+    """
+    Logs events to JSONL file.
     
-    def __init__(self, filepath: str, base_params: Dict[str, Any]):
+    base_params are written once, as the leading 'header' record; event
+    records carry only their own fields. Writes are buffered on a
+    background thread (see jsonl_log.BufferedJSONLWriter).
+    """
+    
+    def __init__(self, filepath: str, base_params: Dict[str, Any],
+                 compress: bool = False):
         self.filepath = filepath
         self.base_params = base_params
-        self.file = open(filepath, 'w')
+        self.writer = BufferedJSONLWriter(filepath, compress=compress)
+        self.log('header', **base_params)
     
     def log(self, event: str, **kwargs):
-        """Log an event with base params + kwargs."""
-        record = {
+        """Log an event with kwargs."""
+        self.writer.write({
             'event': event,
-            **self.base_params,
             **kwargs,
             'timestamp_utc': timestamp_utc()
-        }
-        self.file.write(json.dumps(record) + '\n')
-        self.file.flush()
+        })
     
     def close(self):
-        self.file.close()
+        self.writer.close()
 
 
 # ============================================================================
@@ -313,31 +348,6 @@ def generate_band_candidates(band: Band, sqrt_N: int, wheel: int = DEFAULT_WHEEL
             current += (WHEEL_MODULUS - residue) + WHEEL_210_RESIDUES[0]
 
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
-    """Embed integer n into 7D torus using geodesic mapping."""
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        coords.append(coord)
-    return coords
-
-
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """Compute Riemannian geodesic distance on 7D torus."""
-    dist_sq = mp.mpf(0)
-    for c1, c2 in zip(p1, p2):
-        diff = abs(c1 - c2)
-        wrap_diff = mp.mpf(1) - diff
-        min_diff = min(diff, wrap_diff)
-        dist_sq += min_diff * min_diff
-    return mp.sqrt(dist_sq)
-
-
 def compute_amplitude(candidate: int, N_embedding: List[mp.mpf], k: float = 0.35) -> float:
     """
     Compute geodesic amplitude for a candidate.
@@ -397,6 +407,57 @@ def is_flat(amplitudes: List[float], tau_grad: float = DEFAULT_TAU_GRAD,
     return max_grad < tau_grad and max_curv < tau_curv
 
 
+class FlatDetector:
+    """
+    Streaming form of is_flat for one band.
+    
+    update(a) appends an amplitude and returns what is_flat would return
+    for the sequence seen so far. Only the last two amplitudes and the last
+    L-1 gradient / L-2 curvature threshold checks are kept, with running
+    counts of the violations, so each step is O(1) and memory is O(L).
+    """
+    
+    def __init__(self, tau_grad: float = DEFAULT_TAU_GRAD,
+                 tau_curv: float = DEFAULT_TAU_CURV, L: int = DEFAULT_L):
+        self.tau_grad = tau_grad
+        self.tau_curv = tau_curv
+        self.L = L
+        self.count = 0
+        self._prev_amplitude: Optional[float] = None
+        self._prev_gradient: Optional[float] = None
+        self._grad_violations = deque(maxlen=max(L - 1, 1))
+        self._curv_violations = deque(maxlen=max(L - 2, 1))
+        self._grad_violation_count = 0
+        self._curv_violation_count = 0
+    
+    @staticmethod
+    def _push(window: deque, violation: bool, count: int) -> int:
+        if len(window) == window.maxlen:
+            count -= window[0]
+        window.append(violation)
+        return count + violation
+    
+    def update(self, amplitude: float) -> bool:
+        """Add the next amplitude; True if the surface is now flat."""
+        self.count += 1
+        if self._prev_amplitude is not None:
+            gradient = amplitude - self._prev_amplitude
+            self._grad_violation_count = self._push(
+                self._grad_violations, not abs(gradient) < self.tau_grad,
+                self._grad_violation_count)
+            if self._prev_gradient is not None:
+                curvature = gradient - self._prev_gradient
+                self._curv_violation_count = self._push(
+                    self._curv_violations, not abs(curvature) < self.tau_curv,
+                    self._curv_violation_count)
+            self._prev_gradient = gradient
+        self._prev_amplitude = amplitude
+        
+        if self.count < self.L or self.L < 3:
+            return False
+        return self._grad_violation_count == 0 and self._curv_violation_count == 0
+
+
 def scan_band_Z5D(band: Band, N: int, sqrt_N: int, N_embedding: List[mp.mpf],
                   k: float = 0.35, max_steps: int = 10000,
                   early_exit: bool = False,
@@ -424,7 +485,7 @@ def scan_band_Z5D(band: Band, N: int, sqrt_N: int, N_embedding: List[mp.mpf],
         Tuple of (peaks found, steps taken, early_exited)
     """
     peaks = []
-    amplitudes = []
+    flat = FlatDetector(tau_grad, tau_curv, L)
     steps = 0
     early_exited = False
     
@@ -436,7 +497,7 @@ def scan_band_Z5D(band: Band, N: int, sqrt_N: int, N_embedding: List[mp.mpf],
         
         # Compute amplitude
         amplitude = compute_amplitude(candidate, N_embedding, k)
-        amplitudes.append(amplitude)
+        is_flat_now = flat.update(amplitude)
         
         # Check for factor
         if N % candidate == 0:
@@ -459,7 +520,7 @@ def scan_band_Z5D(band: Band, N: int, sqrt_N: int, N_embedding: List[mp.mpf],
                       candidate=candidate, amplitude=amplitude)
         
         # Check early exit condition
-        if early_exit and is_flat(amplitudes, tau_grad, tau_curv, L):
+        if early_exit and is_flat_now:
             early_exited = True
             if logger:
                 logger.log('early_exit', band_id=band.id, step=steps,
@@ -469,6 +530,187 @@ def scan_band_Z5D(band: Band, N: int, sqrt_N: int, N_embedding: List[mp.mpf],
     return peaks, steps, early_exited
 
 
+# ============================================================================
+# Parallel Band Scheduler
+# ============================================================================
+
+def band_step_count(band: Band, sqrt_N: int, max_steps: int) -> int:
+    """Number of steps scan_band_Z5D takes on a band without early exit."""
+    start = sqrt_N + min(band.delta_start, band.delta_end)
+    end = sqrt_N + max(band.delta_start, band.delta_end)
+    return min(max_steps, count_admissible_in_range(start, end))
+
+
+def _scan_band_chunk(band: Band, N: int, sqrt_N: int, N_embedding: List[mp.mpf],
+                     k: float, dps: int, start: int, stop: int,
+                     early_exit: bool, tau_grad: float, tau_curv: float,
+                     L: int) -> _ChunkResult:
+    """
+    Scan steps [start, stop) of a band (0-based candidate indices).
+    
+    With early exit on, the L-1 candidates before start are re-evaluated as
+    a warm-up window, so the flatness detector sees exactly the amplitudes
+    the sequential scan sees at every step.
+    """
+    warmup = min(start, L - 1) if early_exit else 0
+    flat = FlatDetector(tau_grad, tau_curv, L)
+    peaks = []
+    samples = []
+    steps = 0
+    early_exited = False
+    
+    with mp.workdps(dps):
+        candidates = itertools.islice(generate_band_candidates(band, sqrt_N),
+                                      start - warmup, stop)
+        for index, candidate in enumerate(candidates, start - warmup):
+            amplitude = compute_amplitude(candidate, N_embedding, k)
+            is_flat_now = flat.update(amplitude)
+            if index < start:
+                continue
+            
+            steps += 1
+            step = index + 1
+            if N % candidate == 0:
+                peaks.append(Peak(candidate=candidate, delta=candidate - sqrt_N,
+                                  amplitude=amplitude, band_id=band.id,
+                                  step_index=step))
+            if step % 100 == 0:
+                samples.append((step, candidate, amplitude))
+            
+            if early_exit and is_flat_now:
+                early_exited = True
+                break
+    
+    return _ChunkResult(band.id, start, steps, early_exited, peaks, samples)
+
+
+def scan_bands_parallel(bands: List[Band], N: int, sqrt_N: int,
+                        N_embedding: List[mp.mpf], k: float = 0.35,
+                        max_steps: int = 10000,
+                        early_exit: bool = False,
+                        tau_grad: float = DEFAULT_TAU_GRAD,
+                        tau_curv: float = DEFAULT_TAU_CURV,
+                        L: int = DEFAULT_L,
+                        workers: Optional[int] = None,
+                        chunk_steps: int = DEFAULT_CHUNK_STEPS,
+                        stop_on_peak: bool = False,
+                        logger: Optional[JSONLLogger] = None) -> List[BandResult]:
+    """
+    Scan bands on a process pool.
+    
+    Every band is cut into chunks of chunk_steps steps, queued in band
+    priority order. A worker takes the next chunk as soon as it is idle, so
+    once the short bands are done the remaining steps of long bands are
+    spread over all workers instead of one. Chunks past one that exited
+    early are not submitted. With stop_on_peak, a peak in a band stops
+    submission of later bands' chunks; that band and the ones before it
+    are still scanned to the end, and the results are cut after the first
+    band with a peak, as the sequential scan stops there.
+    
+    Args:
+        bands: Bands in priority order (from plan_bands)
+        N: Semiprime
+        sqrt_N: Square root of N
+        N_embedding: Pre-computed N embedding
+        k: Geodesic exponent
+        max_steps: Maximum steps per band
+        early_exit: Enable early-exit guard
+        tau_grad: Gradient threshold for flat detection
+        tau_curv: Curvature threshold for flat detection
+        L: Window size for flat detection
+        workers: Pool size (defaults to os.cpu_count())
+        chunk_steps: Steps per work unit
+        stop_on_peak: Stop after the first band with a peak
+        logger: Optional JSONL logger (events are logged in band and step
+            order, as the sequential scan logs them)
+        
+    Returns:
+        BandResult per scanned band, in the order of bands. Identical to
+        the sequential scan's, with or without stop_on_peak.
+    """
+    if chunk_steps < 1:
+        raise ValueError("chunk_steps must be >= 1")
+    
+    workers = workers or os.cpu_count() or 1
+    in_flight_cap = 2 * workers
+    dps = mp.mp.dps
+    units = iter([
+        (position, band, start, min(start + chunk_steps, total))
+        for position, band in enumerate(bands)
+        for total in [band_step_count(band, sqrt_N, max_steps)]
+        for start in range(0, total, chunk_steps)
+    ])
+    position_of = {band.id: position for position, band in enumerate(bands)}
+    chunks: Dict[int, Dict[int, _ChunkResult]] = {band.id: {} for band in bands}
+    exited_at: Dict[int, int] = {}
+    # With stop_on_peak: position of the earliest band with a peak so far
+    last_position = len(bands) - 1
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        try:
+            while True:
+                while len(pending) < in_flight_cap:
+                    unit = next(units, None)
+                    if unit is None or unit[0] > last_position:
+                        break
+                    _, band, start, stop = unit
+                    if start > exited_at.get(band.id, start):
+                        continue
+                    pending.add(pool.submit(
+                        _scan_band_chunk, band, N, sqrt_N, N_embedding, k, dps,
+                        start, stop, early_exit, tau_grad, tau_curv, L
+                    ))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = future.result()
+                    chunks[chunk.band_id][chunk.start] = chunk
+                    if chunk.early_exited:
+                        exited_at[chunk.band_id] = min(
+                            chunk.start, exited_at.get(chunk.band_id, chunk.start))
+                    if stop_on_peak and chunk.peaks:
+                        last_position = min(last_position, position_of[chunk.band_id])
+        finally:
+            for future in pending:
+                future.cancel()
+    
+    # Merge chunks per band; anything past an early exit is discarded.
+    results = []
+    for band in bands:
+        result = BandResult(band_id=band.id)
+        for start in sorted(chunks[band.id]):
+            chunk = chunks[band.id][start]
+            result.steps += chunk.steps
+            result.peaks.extend(chunk.peaks)
+            if logger:
+                # A peak is logged before the periodic step record of its step
+                events = sorted([(peak.step_index, 0, peak) for peak in chunk.peaks]
+                                + [(sample[0], 1, sample) for sample in chunk.samples],
+                                key=lambda event: event[:2])
+                for _, kind, event in events:
+                    if kind == 0:
+                        logger.log('peak', candidate=event.candidate, delta=event.delta,
+                                  amplitude=event.amplitude, band_id=band.id,
+                                  step=event.step_index)
+                    else:
+                        step, candidate, amplitude = event
+                        logger.log('step', band_id=band.id, step=step,
+                                  candidate=candidate, amplitude=amplitude)
+            if chunk.early_exited:
+                result.early_exited = True
+                if logger:
+                    logger.log('early_exit', band_id=band.id, step=result.steps,
+                              reason='flat_surface')
+                break
+        results.append(result)
+        if stop_on_peak and result.peaks:
+            break
+    
+    return results
+
+
 def run_scan(N: int, seed: int, C: float = DEFAULT_C, alpha: float = DEFAULT_ALPHA,
              wheel: int = DEFAULT_WHEEL, num_bands: int = 20,
              max_steps_per_band: int = 10000, k: float = 0.35,
@@ -477,10 +719,16 @@ def run_scan(N: int, seed: int, C: float = DEFAULT_C, alpha: float = DEFAULT_ALP
              tau_curv: float = DEFAULT_TAU_CURV,
              L: int = DEFAULT_L,
              log_file: Optional[str] = None,
-             verbose: bool = False) -> ScanReport:
+             verbose: bool = False,
+             workers: int = 1,
+             chunk_steps: int = DEFAULT_CHUNK_STEPS,
+             stop_on_peak: bool = False) -> ScanReport:
     """
     Run full band-router scan with optional early-exit guard.
     
+    With workers > 1 the bands are scanned by scan_bands_parallel; the
+    report is the same as the sequential scan's.
+    
     Args:
         N: Semiprime to factor
         seed: Random seed for reproducibility
@@ -496,6 +744,9 @@ def run_scan(N: int, seed: int, C: float = DEFAULT_C, alpha: float = DEFAULT_ALP
         L: Window size
         log_file: Path for JSONL log
         verbose: Enable verbose output
+        workers: Process-pool size (1 scans in-process)
+        chunk_steps: Steps per work unit when workers > 1
+        stop_on_peak: Stop the scan after the first band with a peak
         
     Returns:
         ScanReport with full results
@@ -575,28 +826,48 @@ def run_scan(N: int, seed: int, C: float = DEFAULT_C, alpha: float = DEFAULT_ALP
         N_embedding = embed_torus_geodesic(N, k)
         
         # Scan each band
-        all_peaks = []
-        total_steps = 0
-        early_exits = 0
-        
-        for band in bands:
+        if workers > 1:
             if verbose:
-                print(f"  Scanning band {band.id}: δ=[{band.delta_start}, {band.delta_end}]")
-            
-            peaks, steps, exited = scan_band_Z5D(
-                band, N, sqrt_N, N_embedding, k,
+                print(f"  Scanning {len(bands)} bands on {workers} workers")
+            band_results = scan_bands_parallel(
+                bands, N, sqrt_N, N_embedding, k,
                 max_steps=max_steps_per_band,
                 early_exit=early_exit,
                 tau_grad=tau_grad,
                 tau_curv=tau_curv,
                 L=L,
+                workers=workers,
+                chunk_steps=chunk_steps,
+                stop_on_peak=stop_on_peak,
                 logger=logger
             )
-            
-            all_peaks.extend(peaks)
-            total_steps += steps
-            if exited:
-                early_exits += 1
+        else:
+            band_results = []
+            for band in bands:
+                if verbose:
+                    print(f"  Scanning band {band.id}: δ=[{band.delta_start}, {band.delta_end}]")
+                
+                peaks, steps, exited = scan_band_Z5D(
+                    band, N, sqrt_N, N_embedding, k,
+                    max_steps=max_steps_per_band,
+                    early_exit=early_exit,
+                    tau_grad=tau_grad,
+                    tau_curv=tau_curv,
+                    L=L,
+                    logger=logger
+                )
+                band_results.append(BandResult(band.id, steps, exited, peaks))
+                if stop_on_peak and peaks:
+                    break
+        
+        all_peaks = [peak for result in band_results for peak in result.peaks]
+        total_steps = sum(result.steps for result in band_results)
+        early_exits = sum(result.early_exited for result in band_results)
+        report.band_stats = [
+            {'band_id': r.band_id, 'steps': r.steps,
+             'early_exited': r.early_exited, 'peaks': len(r.peaks)}
+            for r in band_results
+        ]
         
         report.candidates_scanned = total_steps
         report.z5d_steps = total_steps
@@ -37,7 +37,7 @@ from band_router import (
     plan_bands, apply_wheel, run_scan, compute_band_coverage,
     compute_reduction_ratio, count_admissible_in_range,
     expected_gap, is_flat, adaptive_precision, get_git_head,
-    timestamp_utc, DEFAULT_C, DEFAULT_ALPHA, DEFAULT_WHEEL,
+    timestamp_utc, FlatDetector, DEFAULT_C, DEFAULT_ALPHA, DEFAULT_WHEEL,
     DEFAULT_TAU_GRAD, DEFAULT_TAU_CURV, DEFAULT_L
 )
 
@@ -47,6 +47,7 @@ from band_router import (
 # ============================================================================
 
 ARTIFACT_DIR = Path(__file__).parent
+GATE_1 = 1073217479  # 32749 × 32771
 
 
 # ============================================================================
@@ -402,6 +403,20 @@ class TestFlatDetection:
         amplitudes = [0.5 + 0.01 * i for i in range(10)]
         assert not is_flat(amplitudes, tau_grad=1e-6, tau_curv=1e-8, L=8), \
             "Surface with significant gradient should not be detected as flat"
+    
+    @pytest.mark.parametrize("L", [2, 3, 4, 8])
+    def test_streaming_detector_matches_is_flat(self, L):
+        """FlatDetector.update agrees with is_flat at every step."""
+        import random
+        rng = random.Random(L)
+        amplitudes = []
+        detector = FlatDetector(tau_grad=1e-3, tau_curv=1e-3, L=L)
+        for _ in range(2000):
+            # Long flat runs broken by occasional jumps and slopes
+            step = rng.choice([0.0, 0.0, 0.0, 5e-4, -5e-4, 1e-2])
+            amplitudes.append((amplitudes[-1] if amplitudes else 0.5) + step)
+            assert detector.update(amplitudes[-1]) == \
+                is_flat(amplitudes, tau_grad=1e-3, tau_curv=1e-3, L=L)
 
 
 # ============================================================================
@@ -475,6 +490,69 @@ class TestWheelFiltering:
             apply_wheel(candidates, wheel=30)
 
 
+# ============================================================================
+# Parallel Scheduler Unit Tests
+# ============================================================================
+
+class TestParallelScheduler:
+    """Unit tests for run_scan(workers > 1)."""
+    
+    def test_matches_sequential_with_early_exit(self):
+        """Chunked parallel scan reproduces the sequential report, including
+        early exits that fall inside a later chunk."""
+        params = dict(N=CHALLENGE_127, seed=1, alpha=8.0, num_bands=4,
+                      max_steps_per_band=90, early_exit=True,
+                      tau_grad=0.2, tau_curv=0.4, L=3)
+        sequential = run_scan(**params)
+        parallel = run_scan(workers=2, chunk_steps=2, **params)
+        
+        assert sequential.early_exits == len(sequential.band_stats)
+        assert any(s['steps'] > 2 for s in sequential.band_stats)
+        assert parallel.band_stats == sequential.band_stats
+        assert parallel.z5d_steps == sequential.z5d_steps
+        assert parallel.peaks == sequential.peaks
+    
+    def test_finds_factors(self):
+        """Peaks from every band are merged in band order."""
+        sequential = run_scan(GATE_1, seed=1, num_bands=6)
+        parallel = run_scan(GATE_1, seed=1, num_bands=6, workers=2, chunk_steps=2)
+        
+        assert parallel.factors_found == (32749, 32771)
+        assert parallel.peaks == sequential.peaks
+    
+    def test_stop_on_peak(self):
+        """The first band with a peak ends the scan, as in the sequential scan."""
+        sequential = run_scan(GATE_1, seed=1, num_bands=6, stop_on_peak=True)
+        parallel = run_scan(GATE_1, seed=1, num_bands=6, workers=2, chunk_steps=2,
+                            stop_on_peak=True)
+        
+        assert parallel.factors_found == (32749, 32771)
+        assert len(sequential.band_stats) < len(sequential.bands)
+        assert parallel.band_stats == sequential.band_stats
+        assert parallel.peaks == sequential.peaks
+        assert parallel.z5d_steps == sequential.z5d_steps
+    
+    def test_log_events_match_sequential(self, tmp_path):
+        """Peak, step and early-exit events are logged in the sequential order."""
+        def events(log_file):
+            with open(log_file) as f:
+                records = [json.loads(line) for line in f]
+            return [(r['event'], r.get('band_id'), r.get('step')) for r in records
+                    if r.get('event') in ('peak', 'step', 'early_exit')]
+        
+        # 32749 × 40009 with wide bands: 40009 sits late in band 0, after
+        # several periodic step records of the same chunk
+        params = dict(N=32749 * 40009, seed=1, alpha=400.0, num_bands=2)
+        run_scan(log_file=str(tmp_path / 'seq.jsonl'), **params)
+        run_scan(log_file=str(tmp_path / 'par.jsonl'), workers=2, chunk_steps=1000,
+                 **params)
+        
+        sequential = events(tmp_path / 'seq.jsonl')
+        kinds = [e[:2] for e in sequential]
+        assert kinds.index(('step', 0)) < kinds.index(('peak', 0))
+        assert events(tmp_path / 'par.jsonl') == sequential
+
+
 # ============================================================================
 # Run Tests
 # ============================================================================
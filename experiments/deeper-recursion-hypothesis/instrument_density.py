@@ -13,11 +13,9 @@ import mpmath as mp
 import json
 import time
 from typing import Dict, List, Any
-from gva_factorization import (
-    adaptive_precision,
-    embed_torus_geodesic,
-    riemannian_distance
-)
+from gva_factorization import adaptive_precision
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from density_pyramid import DensityPyramid
 
 
 def profile_density(N: int, segments: int = 32, samples_per_segment: int = 100,
@@ -68,7 +66,8 @@ def profile_density(N: int, segments: int = 32, samples_per_segment: int = 100,
         if verbose:
             print(f"\nProfiling k = {k}...")
         
-        N_coords = embed_torus_geodesic(N, k)
+        # Shared with the two/three-stage prototypes (k = 0.35) across runs
+        pyramid = DensityPyramid(N, k, persist=True)
         segment_size = (2 * base_window) // segments
         
         segment_data = []
@@ -77,19 +76,8 @@ def profile_density(N: int, segments: int = 32, samples_per_segment: int = 100,
             start_offset = -base_window + i * segment_size
             end_offset = start_offset + segment_size
             
-            step = max(1, segment_size // samples_per_segment)
-            distances = []
-            
-            for offset in range(start_offset, end_offset, step):
-                candidate = sqrt_N + offset
-                if candidate <= 1 or candidate >= N:
-                    continue
-                if candidate % 2 == 0:
-                    continue
-                
-                cand_coords = embed_torus_geodesic(candidate, k)
-                dist = riemannian_distance(N_coords, cand_coords)
-                distances.append(float(dist))
+            distances = pyramid.segment_distances(start_offset, end_offset,
+                                                  samples_per_segment)
             
             if distances:
                 avg_dist = sum(distances) / len(distances)
@@ -114,6 +102,7 @@ def profile_density(N: int, segments: int = 32, samples_per_segment: int = 100,
             })
         
         profiles[f'k_{k}'] = segment_data
+        pyramid.save()
     
     runtime = time.time() - start_time
     
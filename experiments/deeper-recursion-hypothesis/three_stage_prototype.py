@@ -15,45 +15,23 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 import mpmath as mp
 import time
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Tuple, Optional, Dict, Any
 from math import sqrt
-from gva_factorization import (
-    adaptive_precision,
-    embed_torus_geodesic,
-    riemannian_distance
-)
+from gva_factorization import adaptive_precision
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from density_pyramid import DensityPyramid
 
 
-def score_segment(N: int, sqrt_N: int, start_offset: int, end_offset: int,
-                  N_coords: List[mp.mpf], k: float, sample_count: int = 50) -> float:
+def score_segment(pyramid: DensityPyramid, start_offset: int, end_offset: int,
+                  sample_count: int = 50) -> float:
     """
     Score a segment by average geodesic distance.
     
     Lower distance = higher score (factor-bearing regions have low distance).
+    Only the segment's own grid is scored; Stage 1 samples on a Stage 2
+    grid are reused instead of recomputed.
     """
-    segment_size = end_offset - start_offset
-    if segment_size == 0:
-        return 0.0
-    
-    step = max(1, segment_size // sample_count)
-    distances = []
-    
-    for offset in range(start_offset, end_offset, step):
-        candidate = sqrt_N + offset
-        if candidate <= 1 or candidate >= N:
-            continue
-        if candidate % 2 == 0:  # Quick filter
-            continue
-        
-        cand_coords = embed_torus_geodesic(candidate, k)
-        dist = riemannian_distance(N_coords, cand_coords)
-        distances.append(float(dist))
-    
-    if not distances:
-        return 0.0
-    
-    avg_dist = sum(distances) / len(distances)
-    return 1.0 / (avg_dist + 1e-10)
+    return pyramid.segment_stats(start_offset, end_offset, sample_count).score
 
 
 def three_stage_gva(N: int,
@@ -63,7 +41,8 @@ def three_stage_gva(N: int,
                     stage2_top_k: int = 2,
                     stage2_threshold: float = 0.7,
                     early_exit: bool = True,
-                    verbose: bool = False) -> Dict[str, Any]:
+                    verbose: bool = False,
+                    pyramid: Optional[DensityPyramid] = None) -> Dict[str, Any]:
     """
     Three-stage recursive factorization with dynamic thresholds.
     
@@ -80,6 +59,8 @@ def three_stage_gva(N: int,
         stage2_threshold: Minimum score to proceed to Stage 3 (early exit)
         early_exit: Enable early exit based on threshold
         verbose: Enable detailed logging
+        pyramid: Density pyramid for (N, k=0.35) shared with other runs
+            (default: a new, unpersisted one)
         
     Returns:
         Dictionary with results and metrics
@@ -114,7 +95,9 @@ def three_stage_gva(N: int,
         print(f"Search window: ±{base_window} around sqrt(N) = {sqrt_N}")
     
     k = 0.35  # Use middle k value
-    N_coords = embed_torus_geodesic(N, k)
+    if pyramid is None:
+        pyramid = DensityPyramid(N, k)
+    reused_before = pyramid.reused
     
     # ========== Stage 1: Very Coarse Scoring ==========
     if verbose:
@@ -129,7 +112,7 @@ def three_stage_gva(N: int,
         start_offset = -base_window + i * stage1_segment_size
         end_offset = start_offset + stage1_segment_size
         
-        score = score_segment(N, sqrt_N, start_offset, end_offset, N_coords, k, sample_count=50)
+        score = score_segment(pyramid, start_offset, end_offset, sample_count=50)
         stage1_scores.append((i, score, start_offset, end_offset))
         samples_stage1 += 50
     
@@ -162,7 +145,7 @@ def three_stage_gva(N: int,
             sub_start = parent_start + j * subseg_size
             sub_end = sub_start + subseg_size
             
-            score = score_segment(N, sqrt_N, sub_start, sub_end, N_coords, k, sample_count=50)
+            score = score_segment(pyramid, sub_start, sub_end, sample_count=50)
             subseg_scores.append((parent_idx, j, score, sub_start, sub_end))
             samples_stage2 += 50
             max_score_stage2 = max(max_score_stage2, score)
@@ -172,6 +155,8 @@ def three_stage_gva(N: int,
         stage2_regions.extend(subseg_scores[:stage2_top_k])
     
     stage2_time = time.time() - stage2_start
+    pyramid.save()
+    samples_reused = pyramid.reused - reused_before
     
     # Early exit check
     early_exited = False
@@ -192,6 +177,7 @@ def three_stage_gva(N: int,
             'stage3_time': 0.0,
             'stage1_samples': samples_stage1,
             'stage2_samples': samples_stage2,
+            'samples_reused': samples_reused,
             'stage3_tested': 0,
             'total_candidates': samples_stage1 + samples_stage2,
             'coverage': 0.0,  # Early exit
@@ -204,6 +190,7 @@ def three_stage_gva(N: int,
         print(f"  Samples: {samples_stage2}")
         print(f"  Time: {stage2_time:.3f}s")
         print(f"  Max score: {max_score_stage2:.4f}")
+        print(f"  Reused samples: {samples_reused}")
         print(f"  {len(stage2_regions)} regions selected for Stage 3")
     
     # ========== Stage 3: Fine Search ==========
@@ -264,6 +251,7 @@ def three_stage_gva(N: int,
         'stage3_time': stage3_time,
         'stage1_samples': samples_stage1,
         'stage2_samples': samples_stage2,
+        'samples_reused': samples_reused,
         'stage3_tested': candidates_tested,
         'total_candidates': samples_stage1 + samples_stage2 + candidates_tested,
         'coverage': coverage,
@@ -17,63 +17,38 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 import mpmath as mp
 import time
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Tuple, Optional, Dict, Any
 from math import sqrt
-from gva_factorization import (
-    adaptive_precision,
-    embed_torus_geodesic,
-    riemannian_distance
-)
+from gva_factorization import adaptive_precision
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from density_pyramid import DensityPyramid
 
 
-def score_segment(N: int, sqrt_N: int, start_offset: int, end_offset: int,
-                  N_coords: List[mp.mpf], k: float, sample_count: int = 50) -> float:
+def score_segment(pyramid: DensityPyramid, start_offset: int, end_offset: int,
+                  sample_count: int = 50) -> float:
     """
     Score a segment by average geodesic distance.
     
     Lower distance = higher score (factor-bearing regions have low distance).
+    Only the segment's own grid is scored; grid points already in the
+    pyramid are reused instead of recomputed.
     
     Args:
-        N: Semiprime
-        sqrt_N: Square root of N
+        pyramid: Density pyramid for (N, k)
         start_offset: Start offset from sqrt_N
         end_offset: End offset from sqrt_N
-        N_coords: N's coordinates in 7D torus
-        k: Geodesic exponent
         sample_count: Number of samples to take in segment
         
     Returns:
         Average geodesic score (1 / avg_distance)
     """
-    segment_size = end_offset - start_offset
-    if segment_size == 0:
-        return 0.0
-    
-    step = max(1, segment_size // sample_count)
-    distances = []
-    
-    for offset in range(start_offset, end_offset, step):
-        candidate = sqrt_N + offset
-        if candidate <= 1 or candidate >= N:
-            continue
-        if candidate % 2 == 0:  # Quick filter
-            continue
-        
-        # Compute geodesic distance
-        cand_coords = embed_torus_geodesic(candidate, k)
-        dist = riemannian_distance(N_coords, cand_coords)
-        distances.append(float(dist))
-    
-    if not distances:
-        return 0.0
-    
-    avg_dist = sum(distances) / len(distances)
     # Score is inverse of distance (lower distance = higher score)
-    return 1.0 / (avg_dist + 1e-10)
+    return pyramid.segment_stats(start_offset, end_offset, sample_count).score
 
 
 def two_stage_gva(N: int, segments: int = 32, top_k: int = 16,
-                  verbose: bool = False) -> Dict[str, Any]:
+                  verbose: bool = False,
+                  pyramid: Optional[DensityPyramid] = None) -> Dict[str, Any]:
     """
     Two-stage coarse-to-fine factorization.
     
@@ -85,6 +60,8 @@ def two_stage_gva(N: int, segments: int = 32, top_k: int = 16,
         segments: Number of segments in Stage 1
         top_k: Number of top segments to search in Stage 2
         verbose: Enable detailed logging
+        pyramid: Density pyramid for (N, k=0.35) shared with other runs
+            (default: a new, unpersisted one)
         
     Returns:
         Dictionary with results and metrics
@@ -121,7 +98,9 @@ def two_stage_gva(N: int, segments: int = 32, top_k: int = 16,
         print(f"\n--- Stage 1: Coarse Scoring ---")
     
     k = 0.35  # Use middle k value
-    N_coords = embed_torus_geodesic(N, k)
+    if pyramid is None:
+        pyramid = DensityPyramid(N, k)
+    reused_before = pyramid.reused
     
     segment_size = (2 * base_window) // segments
     segment_scores = []
@@ -133,11 +112,13 @@ def two_stage_gva(N: int, segments: int = 32, top_k: int = 16,
         start_offset = -base_window + i * segment_size
         end_offset = start_offset + segment_size
         
-        score = score_segment(N, sqrt_N, start_offset, end_offset, N_coords, k, sample_count=50)
+        score = score_segment(pyramid, start_offset, end_offset, sample_count=50)
         segment_scores.append((i, score, start_offset, end_offset))
         samples_stage1 += 50
     
     stage1_time = time.time() - stage1_start
+    samples_reused = pyramid.reused - reused_before
+    pyramid.save()
     
     # Sort by score (descending) and select top-K
     segment_scores.sort(key=lambda x: x[1], reverse=True)
@@ -202,6 +183,7 @@ def two_stage_gva(N: int, segments: int = 32, top_k: int = 16,
         'stage1_time': stage1_time,
         'stage2_time': stage2_time,
         'stage1_samples': samples_stage1,
+        'stage1_reused': samples_reused,
         'stage2_tested': candidates_tested,
         'total_candidates': samples_stage1 + candidates_tested,
         'coverage': coverage,
@@ -0,0 +1,226 @@
+"""
+Geodesic Density Pyramid
+========================
+
+Shared store of sampled geodesic distances for the coarse-to-fine
+prototypes (deeper-recursion-hypothesis two/three-stage GVA and density
+profiling, fractal-recursive-gva-110bit).
+
+Each stage samples the same window around √N at a different granularity.
+A DensityPyramid for one (N, k) keeps every distance it has computed, keyed
+by the candidate's offset from √N, and indexes them in a dyadic segment
+tree: the node (level, i) covers offsets [i·2^level, (i+1)·2^level) and
+holds count, sum and min of the samples below it. Nodes exist only where
+samples were taken, so refinement is lazy: a stage that zooms into a
+sub-window adds samples there and nowhere else.
+
+- distances(candidates) returns distances for any candidates, computing
+  only those not sampled before (one batched geofac.kernels call).
+- segment_distances(start, end, sample_count) is the strided sampling of
+  the prototypes' score_segment; a finer stage reuses every coarse sample
+  that falls on its grid.
+- segment_stats(start, end, sample_count) is how the prototypes score a
+  segment: DensityStats over that segment's own grid. Samples taken
+  elsewhere (another stage or prototype, an earlier run) only save
+  computing the grid points they share, so scores do not depend on what
+  ran before.
+- stats(start, end) is the min/mean/count over all samples in a range, at
+  whatever resolution they were taken, in O(log window) nodes.
+
+With persist=True the samples are loaded from and saved to the table cache
+(table_cache.load_table / store_table), keyed by N, k, dimensions, kernel
+and precision, so later runs and other stages start from earlier work.
+
+method='mp' computes at gva_factorization.adaptive_precision(N), the same
+values as the prototypes' global-precision loops.
+
+Usage from an experiment subdirectory:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from density_pyramid import DensityPyramid
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from math import isqrt
+from typing import Dict, Iterable, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from gva_factorization import engine_context
+from geofac.kernels import DEFAULT_DIMENSIONS, FIXED_BITS, geodesic_distances
+from table_cache import load_table, store_table
+
+CACHE_KIND = 'density_pyramid'
+
+
+@dataclass
+class DensityStats:
+    """Aggregate of the samples in an offset range."""
+    count: int = 0
+    total: float = 0.0
+    min: float = float('inf')
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def score(self) -> float:
+        """Segment score 1 / (mean distance + 1e-10), 0 for no samples."""
+        return 1.0 / (self.mean + 1e-10) if self.count else 0.0
+
+    def merge(self, count: int, total: float, minimum: float) -> None:
+        self.count += count
+        self.total += total
+        self.min = min(self.min, minimum)
+
+
+def segment_offsets(start_offset: int, end_offset: int, sample_count: int) -> range:
+    """Strided sample offsets of score_segment: step max(1, size // sample_count)."""
+    step = max(1, (end_offset - start_offset) // sample_count)
+    return range(start_offset, end_offset, step)
+
+
+class DensityPyramid:
+    """Sampled distances for one (N, k), indexed by offset from √N."""
+
+    def __init__(self, N: int, k: float, dimensions: int = DEFAULT_DIMENSIONS,
+                 method: str = 'mp', persist: bool = False):
+        """
+        Args:
+            N: Semiprime
+            k: Geodesic exponent
+            dimensions: Torus dimensions
+            method: Distance kernel ('mp', 'float' or 'fixed'; see geofac.kernels)
+            persist: Load earlier samples from the table cache (save() writes back)
+        """
+        self.N = N
+        self.k = k
+        self.dimensions = dimensions
+        self.method = method
+        self.sqrt_N = isqrt(N)
+        self.ctx = engine_context(N) if method == 'mp' else None
+        self.persist = persist
+        self.levels = N.bit_length()
+        self.computed = 0
+        self.reused = 0
+        self._samples: Dict[int, float] = {}
+        # (level, offset >> level) -> [count, sum, min]
+        self._nodes: Dict[Tuple[int, int], list] = {}
+        if persist:
+            for offset, distance in load_table(CACHE_KIND, self.cache_params(), {}).items():
+                self._insert(offset, distance)
+
+    def cache_params(self) -> Dict:
+        """Table-cache key of this pyramid's samples."""
+        precision = self.ctx.prec if self.ctx is not None else (
+            FIXED_BITS if self.method == 'fixed' else 53)
+        return {'N': str(self.N), 'k': self.k, 'dimensions': self.dimensions,
+                'method': self.method, 'precision': precision}
+
+    def save(self) -> None:
+        """Write all samples to the table cache (no-op unless persist=True)."""
+        if self.persist:
+            store_table(CACHE_KIND, self.cache_params(), dict(self._samples))
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def _insert(self, offset: int, distance: float) -> None:
+        self._samples[offset] = distance
+        for level in range(self.levels + 1):
+            node = self._nodes.get((level, offset >> level))
+            if node is None:
+                self._nodes[(level, offset >> level)] = [1, distance, distance]
+            else:
+                node[0] += 1
+                node[1] += distance
+                if distance < node[2]:
+                    node[2] = distance
+
+    def distances(self, candidates: Iterable[int]) -> List[float]:
+        """
+        Distances from N to each candidate, computing only unsampled ones.
+
+        Args:
+            candidates: Integers to compare against N
+
+        Returns:
+            Distances aligned with candidates
+        """
+        candidates = list(candidates)
+        missing = list(dict.fromkeys(c for c in candidates
+                                     if c - self.sqrt_N not in self._samples))
+        if missing:
+            computed = geodesic_distances(self.N, missing, self.k, self.dimensions,
+                                          self.method, self.ctx)
+            for candidate, distance in zip(missing, computed.tolist()):
+                self._insert(candidate - self.sqrt_N, distance)
+        self.computed += len(missing)
+        self.reused += len(candidates) - len(missing)
+        return [self._samples[c - self.sqrt_N] for c in candidates]
+
+    def segment_distances(self, start_offset: int, end_offset: int,
+                          sample_count: int = 50) -> List[float]:
+        """
+        Strided samples of a segment, as score_segment takes them.
+
+        Offsets start, start + step, ... below end (step = size // sample_count);
+        candidates outside (1, N) and even candidates are skipped.
+
+        Args:
+            start_offset: Segment start relative to √N
+            end_offset: Segment end relative to √N (exclusive)
+            sample_count: Target number of samples
+
+        Returns:
+            Distances in offset order
+        """
+        candidates = [self.sqrt_N + offset
+                      for offset in segment_offsets(start_offset, end_offset, sample_count)]
+        return self.distances(c for c in candidates if 1 < c < self.N and c % 2 != 0)
+
+    def segment_stats(self, start_offset: int, end_offset: int,
+                      sample_count: int = 50) -> DensityStats:
+        """
+        DensityStats of segment_distances(start, end, sample_count).
+
+        Only the segment's own grid is scored; distances already in the
+        pyramid are reused, not counted toward sample_count.
+
+        Args:
+            start_offset: Segment start relative to √N
+            end_offset: Segment end relative to √N (exclusive)
+            sample_count: Target number of samples
+
+        Returns:
+            DensityStats of the grid samples
+        """
+        stats = DensityStats()
+        for distance in self.segment_distances(start_offset, end_offset, sample_count):
+            stats.merge(1, distance, distance)
+        return stats
+
+    def stats(self, start_offset: int, end_offset: int) -> DensityStats:
+        """
+        count / mean / min over all samples with offset in [start, end).
+
+        Args:
+            start_offset: Range start relative to √N
+            end_offset: Range end relative to √N (exclusive)
+
+        Returns:
+            DensityStats of the range
+        """
+        stats = DensityStats()
+        position = start_offset
+        while position < end_offset:
+            # Largest aligned dyadic block starting at position inside the range
+            level = min((position & -position).bit_length() - 1 if position else self.levels,
+                        (end_offset - position).bit_length() - 1, self.levels)
+            node = self._nodes.get((level, position >> level))
+            if node is not None:
+                stats.merge(*node)
+            position += 1 << level
+        return stats
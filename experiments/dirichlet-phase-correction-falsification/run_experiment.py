@@ -24,6 +24,11 @@ import time
 import numpy as np
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from geofac.kernels import embed_torus_geodesic
 
 # Configure seed for reproducibility
 SEED = 42
@@ -68,32 +73,6 @@ def wrap_to_pi(angle: float) -> float:
     return (angle + math.pi) % (2 * math.pi) - math.pi
 
 
-def embed_torus_geodesic(n: int, k: float = 0.35, dimensions: int = 7) -> List[mp.mpf]:
-    """
-    Embed integer n into a 7D torus using golden ratio geodesic mapping.
-    
-    Args:
-        n: Integer to embed
-        k: Geodesic exponent (default 0.35)
-        dimensions: Torus dimensions (default 7)
-        
-    Returns:
-        List of coordinates in 7D torus [0,1)^7
-    """
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2  # Golden ratio
-    
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        if abs(k - 1.0) > 1e-15:  # Use tolerance for float comparison
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        coords.append(coord)
-    
-    return coords
-
-
 def compute_phase_from_embedding(coords: List[mp.mpf]) -> float:
     """
     Compute phase angle from 7D torus embedding.
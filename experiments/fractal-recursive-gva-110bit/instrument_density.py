@@ -14,7 +14,9 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 import mpmath as mp
-from gva_factorization import embed_torus_geodesic, riemannian_distance, adaptive_precision
+from gva_factorization import adaptive_precision
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from density_pyramid import DensityPyramid
 import time
 import json
 
@@ -69,8 +71,8 @@ def analyze_density_profile():
     
     start_time = time.time()
     
-    # Embed N in 7D torus
-    N_coords = embed_torus_geodesic(N, K)
+    # Distances are kept in a density pyramid shared with two_stage_prototype.py
+    pyramid = DensityPyramid(N, K, persist=True)
     
     # Define segments: divide [-BASE_WINDOW, +BASE_WINDOW] into NUM_SEGMENTS
     segment_width = (2 * BASE_WINDOW) // NUM_SEGMENTS
@@ -91,7 +93,7 @@ def analyze_density_profile():
         # Sample uniformly within segment
         step = max(1, segment_width // SAMPLES_PER_SEGMENT)
         
-        distances = []
+        offsets = []
         candidates = []
         
         for i in range(SAMPLES_PER_SEGMENT):
@@ -109,13 +111,13 @@ def analyze_density_profile():
             # Skip small prime factors (but don't skip everything)
             # For large numbers, most won't have these factors anyway
             
-            # Compute geodesic distance
-            cand_coords = embed_torus_geodesic(candidate, K)
-            dist = float(riemannian_distance(N_coords, cand_coords))
-            
-            distances.append(dist)
+            offsets.append(offset)
             candidates.append(candidate)
-            
+        
+        # Geodesic distances for the whole segment in one batch
+        distances = pyramid.distances(candidates)
+        
+        for offset, candidate, dist in zip(offsets, candidates, distances):
             # Check if this is one of the expected factors
             if candidate == EXPECTED_P or candidate == EXPECTED_Q:
                 print(f"  ✓ Factor found in segment {seg_idx}: offset={offset}, dist={dist:.6f}")
@@ -139,6 +141,7 @@ def analyze_density_profile():
                 'contains_factor': contains_factor,
             })
     
+    pyramid.save()
     elapsed = time.time() - start_time
     
     # Sort segments by min distance
@@ -16,7 +16,9 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 import mpmath as mp
-from gva_factorization import embed_torus_geodesic, riemannian_distance, adaptive_precision
+from gva_factorization import adaptive_precision
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from density_pyramid import DensityPyramid
 import time
 from typing import Tuple, Optional, List
 
@@ -41,7 +43,8 @@ TOP_SEGMENTS = 16  # Keep top 50% of segments
 # Stage 2: Dense search - use full 110-bit parameters
 
 
-def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
+def two_stage_gva_factor(verbose: bool = True,
+                         pyramid: Optional[DensityPyramid] = None) -> Optional[dict]:
     """
     Two-stage GVA factorization with coarse-to-fine search.
     
@@ -56,6 +59,14 @@ def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
     - Apply full 110-bit search to ultra-inner region + top segments
     - Use ultra_inner_bound, inner_bound, middle_bound, local_window
     
+    Geodesic distances come from a density pyramid for (N, K); pass a
+    persisted one to reuse samples from instrument_density.py and earlier
+    runs (run_experiment does).
+    
+    Args:
+        verbose: Enable detailed logging
+        pyramid: Density pyramid for (N, K) (default: a new, unpersisted one)
+    
     Returns:
         Dictionary with results or None if failed
     """
@@ -83,8 +94,8 @@ def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
     
     start_time = time.time()
     
-    # Embed N in 7D torus
-    N_coords = embed_torus_geodesic(N, K)
+    if pyramid is None:
+        pyramid = DensityPyramid(N, K)
     
     # ===================================================================
     # STAGE 1: COARSE SWEEP (OUTER REGIONS ONLY)
@@ -123,7 +134,7 @@ def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
         seg_range = seg_end - seg_start
         step = max(1, seg_range // SAMPLES_PER_SEGMENT)
         
-        min_dist = float('inf')
+        segment_candidates = []
         
         for i in range(SAMPLES_PER_SEGMENT):
             offset = seg_start + i * step
@@ -137,14 +148,10 @@ def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
             if candidate % 2 == 0:
                 candidate += 1
             
-            # Compute geodesic distance
-            cand_coords = embed_torus_geodesic(candidate, K)
-            dist = float(riemannian_distance(N_coords, cand_coords))
-            
-            if dist < min_dist:
-                min_dist = dist
+            segment_candidates.append(candidate)
         
-        if min_dist < float('inf'):
+        if segment_candidates:
+            min_dist = min(pyramid.distances(segment_candidates))
             segment_scores.append({
                 'index': seg_idx,
                 'start_offset': seg_start,
@@ -198,7 +205,7 @@ def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
     stage2_start = time.time()
     
     # Build dense candidate list
-    candidates_with_dist = []
+    stage2_candidates = []
     
     # ALWAYS sample ultra-inner region densely (step 1)
     for offset in range(-ULTRA_INNER_BOUND, ULTRA_INNER_BOUND + 1):
@@ -212,9 +219,7 @@ def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
             candidate += 1
             offset = candidate - sqrt_N
         
-        cand_coords = embed_torus_geodesic(candidate, K)
-        dist = float(riemannian_distance(N_coords, cand_coords))
-        candidates_with_dist.append((dist, candidate))
+        stage2_candidates.append(candidate)
     
     # Sample top outer segments with 110-bit pattern
     for seg in top_segments:
@@ -237,9 +242,7 @@ def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
                     if candidate % 2 == 0:
                         candidate += 1
                     
-                    cand_coords = embed_torus_geodesic(candidate, K)
-                    dist = float(riemannian_distance(N_coords, cand_coords))
-                    candidates_with_dist.append((dist, candidate))
+                    stage2_candidates.append(candidate)
             
             if overlap_end > ULTRA_INNER_BOUND:
                 for offset in range(ULTRA_INNER_BOUND + 1, overlap_end + 1, inner_step):
@@ -249,9 +252,7 @@ def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
                     if candidate % 2 == 0:
                         candidate += 1
                     
-                    cand_coords = embed_torus_geodesic(candidate, K)
-                    dist = float(riemannian_distance(N_coords, cand_coords))
-                    candidates_with_dist.append((dist, candidate))
+                    stage2_candidates.append(candidate)
         
         # Middle: step 900 for ±300000 (if segment overlaps, excluding inner)
         middle_step = 900
@@ -267,9 +268,7 @@ def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
                     if candidate % 2 == 0:
                         candidate += 1
                     
-                    cand_coords = embed_torus_geodesic(candidate, K)
-                    dist = float(riemannian_distance(N_coords, cand_coords))
-                    candidates_with_dist.append((dist, candidate))
+                    stage2_candidates.append(candidate)
             
             if seg_start >= INNER_BOUND and seg_end > INNER_BOUND:
                 overlap_start = max(seg_start, INNER_BOUND)
@@ -281,9 +280,11 @@ def two_stage_gva_factor(verbose: bool = True) -> Optional[dict]:
                     if candidate % 2 == 0:
                         candidate += 1
                     
-                    cand_coords = embed_torus_geodesic(candidate, K)
-                    dist = float(riemannian_distance(N_coords, cand_coords))
-                    candidates_with_dist.append((dist, candidate))
+                    stage2_candidates.append(candidate)
+    
+    # Geodesic distances in one batch (samples already in the pyramid are reused)
+    candidates_with_dist = list(zip(pyramid.distances(stage2_candidates), stage2_candidates))
+    pyramid.save()
     
     # Remove duplicates (same candidate may appear in multiple segments)
     seen_candidates = set()
@@ -394,7 +395,7 @@ def run_experiment():
     print()
     
     start_time = time.time()
-    result = two_stage_gva_factor(verbose=True)
+    result = two_stage_gva_factor(verbose=True, pyramid=DensityPyramid(N, K, persist=True))
     elapsed = time.time() - start_time
     
     print("=" * 70)
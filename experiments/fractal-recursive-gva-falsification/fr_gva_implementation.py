@@ -12,6 +12,10 @@ Key features:
 - Monotone mapping: Preserves locality in segment-to-complex-plane mapping
 - Metrics tracking: segments_scored, segments_searched, candidates_tested,
   window_coverage_pct
+- Best-first search (default): the recursion's windows are laid out up front,
+  every window's top-K segments go into one global priority queue, and a
+  coverage map of certified (segment, stride phase) progressions keeps a
+  candidate from being tested twice. Per-N constants are computed once.
 
 This replaces arbitrary modulo mapping with deterministic, well-informed
 candidate generation that respects number-theoretic constraints.
@@ -20,13 +24,18 @@ Validation range: [10^14, 10^18] per VALIDATION_GATES.md
 Whitelist: 127-bit CHALLENGE_127
 """
 
+import heapq
+import os
+import sys
 import mpmath as mp
+from mpmath.ctx_mp import MPContext
+import numpy as np
 from typing import Tuple, Optional, List, Dict
 import time
 from math import log, e
 
-# Configure high precision
-mp.mp.dps = 50
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from mandelbrot_scoring import score_segments
 
 # Validation gates (from gva_factorization.py)
 GATE_1_30BIT = 1073217479  # 32749 × 32771
@@ -62,6 +71,18 @@ def adaptive_precision(N: int) -> int:
     return max(50, bit_length * 4 + 200)
 
 
+def engine_context(N: int, precision: Optional[int] = None) -> MPContext:
+    """
+    Private mpmath context at max(precision, adaptive_precision(N)) dps.
+    
+    Used instead of the global mp.mp.dps so that engine runs can share a
+    process (see gva_factorization.engine_context).
+    """
+    ctx = mp.mp.clone()
+    ctx.dps = max(precision or 0, adaptive_precision(N))
+    return ctx
+
+
 def compute_kappa(n: int) -> float:
     """
     Compute kappa curvature metric as described in hypothesis.
@@ -148,10 +169,65 @@ def is_valid_candidate(candidate: int, N: int, sqrt_N: int, n_prime_factors: set
     return True
 
 
+def segment_candidate_mask(seg_start: int, seg_end: int, stride: int, N: int, sqrt_N: int,
+                           n_prime_factors: set) -> np.ndarray:
+    """
+    is_valid_candidate for every strided candidate of a segment at once.
+    
+    Candidate i is seg_start + i·stride. Range and band limits cut the index
+    range; each small prime p not dividing N is strided through the lattice
+    from its first multiple (solving seg_start + i·stride ≡ 0 mod p), so the
+    cost is one slice per prime instead of one modulo per prime per candidate.
+    The few candidates ≤ the largest small prime (where a prime ≥ candidate
+    is not applied) go through is_valid_candidate itself.
+    
+    Args:
+        seg_start: First candidate
+        seg_end: Segment end (exclusive)
+        stride: Candidate stride
+        N: Semiprime to factor
+        sqrt_N: Integer square root of N
+        n_prime_factors: Small primes that divide N
+        
+    Returns:
+        Boolean array, True where the candidate passes every prefilter
+    """
+    count = max(0, -(-(seg_end - seg_start) // stride))
+    mask = np.ones(count, dtype=bool)
+    
+    # Range (1 < c < N) and factor band (|c − √N| ≤ max_deviation) as index bounds
+    max_deviation = max(sqrt_N // DEVIATION_DIVISOR, MIN_DEVIATION)
+    low = max(2, sqrt_N - max_deviation)
+    high = min(N - 1, sqrt_N + max_deviation)
+    first = max(0, -(-(low - seg_start) // stride))
+    last = min(count, (high - seg_start) // stride + 1)
+    mask[:first] = False
+    mask[max(first, last):] = False
+    
+    # Parity is the prime 2 (N odd ⇒ 2 ∉ n_prime_factors)
+    for prime in SMALL_PRIMES:
+        if prime in n_prime_factors:
+            continue
+        step = stride % prime
+        residue = seg_start % prime
+        if step == 0:
+            if residue == 0:
+                mask[:] = False
+        else:
+            mask[(-residue * pow(step, -1, prime)) % prime::prime] = False
+    
+    if seg_start <= SMALL_PRIMES[-1]:
+        small = min(count, (SMALL_PRIMES[-1] - seg_start) // stride + 1)
+        for i in range(small):
+            mask[i] = is_valid_candidate(seg_start + i * stride, N, sqrt_N, n_prime_factors)
+    return mask
+
+
 def score_segment_with_mandelbrot(segment_start: int, segment_end: int, 
                                    N: int, kappa: float,
                                    max_iterations: int = 100,
-                                   escape_radius: float = 2.0) -> float:
+                                   escape_radius: float = 2.0,
+                                   sqrt_N: Optional[int] = None) -> float:
     """
     Compute Mandelbrot-based interest score for a segment.
     
@@ -169,13 +245,18 @@ def score_segment_with_mandelbrot(segment_start: int, segment_end: int,
         kappa: Curvature metric
         max_iterations: Maximum fractal iterations
         escape_radius: Escape threshold
+        sqrt_N: Integer square root of N (computed if omitted)
         
     Returns:
         Interest score in [0, 1], higher = more promising
+        
+    mandelbrot_scoring.score_segments computes the same scores, bit for bit,
+    for many segments at once.
     """
     # Monotone mapping: segment position to complex parameter
     # Map segment relative position [0, 1] to a scaled complex offset
-    sqrt_N = int(mp.sqrt(N))
+    if sqrt_N is None:
+        sqrt_N = int(engine_context(N).sqrt(N))
     segment_center = (segment_start + segment_end) // 2
     
     # Normalized position relative to sqrt(N): [-1, 1]
@@ -212,12 +293,197 @@ def score_segment_with_mandelbrot(segment_start: int, segment_end: int,
     return min(score, 1.0)
 
 
+def window_segments(window_start: int, window_end: int) -> List[Tuple[int, int]]:
+    """Coarse segments [start, end) of a window, SEGMENTS_PER_WINDOW or MIN_SEGMENT_SIZE wide."""
+    segment_size = max((window_end - window_start) // SEGMENTS_PER_WINDOW, MIN_SEGMENT_SIZE)
+    segments = []
+    current = window_start
+    while current < window_end:
+        seg_end = min(current + segment_size, window_end)
+        segments.append((current, seg_end))
+        current = seg_end
+    return segments
+
+
+class CoverageMap:
+    """
+    Candidates already certified, as (segment, stride phase) progressions.
+    
+    A searched segment tests seg_start, seg_start + stride, ... < seg_end, i.e.
+    the residue class seg_start mod stride within [seg_start, seg_end).
+    """
+    
+    def __init__(self):
+        self.progressions: List[Tuple[int, int, int]] = []
+    
+    def add(self, seg_start: int, seg_end: int, stride: int) -> None:
+        """Mark a segment's strided candidates as certified."""
+        self.progressions.append((seg_start, seg_end, stride))
+    
+    def overlapping(self, seg_start: int, seg_end: int) -> List[Tuple[int, int, int]]:
+        """Progressions that intersect [seg_start, seg_end)."""
+        return [(s, e_, t) for s, e_, t in self.progressions if s < seg_end and seg_start < e_]
+    
+    def contains(self, seg_start: int, seg_end: int, stride: int) -> bool:
+        """True if one certified progression includes every candidate of the segment."""
+        last = seg_start + (seg_end - 1 - seg_start) // stride * stride
+        return any(s <= seg_start and last < e_ and stride % t == 0 and (seg_start - s) % t == 0
+                   for s, e_, t in self.overlapping(seg_start, seg_end))
+    
+    @staticmethod
+    def covers(progressions: List[Tuple[int, int, int]], candidate: int) -> bool:
+        """True if candidate lies on one of the given progressions."""
+        return any(s <= candidate < e_ and (candidate - s) % t == 0 for s, e_, t in progressions)
+    
+    @staticmethod
+    def covered_mask(progressions: List[Tuple[int, int, int]], seg_start: int,
+                     stride: int, count: int) -> np.ndarray:
+        """covers() for the candidates seg_start + i·stride, i < count."""
+        offsets = np.arange(count, dtype=np.int64) * stride
+        mask = np.zeros(count, dtype=bool)
+        for s, e_, t in progressions:
+            shift = seg_start - s  # candidate − s = offset + shift
+            mask |= (offsets >= -shift) & (offsets < e_ - seg_start) & ((offsets + shift) % t == 0)
+        return mask
+
 
+def best_first_window_search(N: int, window_start: int, window_end: int,
+                             max_depth: int, kappa_threshold: float,
+                             metrics: Dict, verbose: bool = False,
+                             ctx: Optional[MPContext] = None) -> Optional[Tuple[int, int]]:
+    """
+    Best-first FR-GVA over the same windows as recursive_window_subdivision.
+    
+    Each window of the recursion tree (depth 0..max_depth, halves
+    [start, mid] and [mid+1, end]) pushes its top-K Mandelbrot segments onto
+    one priority queue ordered by score (ties in push order); a window's
+    halves are scored and pushed once all of its own segments have been
+    popped, so every depth competes by score but is only scored when
+    reached. Segments are popped best-first;
+    candidates on an already certified (segment, stride phase) progression
+    are skipped, and a segment whose progression is entirely certified is
+    not searched. The union of tested candidates is the recursion's, so the
+    same factors are found, with no candidate certified twice.
+    
+    Args:
+        N: Semiprime to factor
+        window_start: Start of search window
+        window_end: End of search window
+        max_depth: Maximum recursion depth
+        kappa_threshold: Threshold for geodesic density
+        metrics: Dictionary to track metrics (adds candidates_skipped,
+            segments_skipped)
+        verbose: Enable detailed logging
+        ctx: mpmath context (default: engine_context(N))
+        
+    Returns:
+        Tuple (p, q) if factors found, None otherwise
+    """
+    metrics.setdefault('candidates_skipped', 0)
+    metrics.setdefault('segments_skipped', 0)
+    
+    # Per-N constants, once
+    kappa = compute_kappa(N)
+    if kappa <= kappa_threshold:
+        if verbose:
+            print(f"  κ={kappa:.4f} ≤ threshold, no segment is searched")
+        return None
+    ctx = ctx if ctx is not None else engine_context(N)
+    sqrt_N = int(ctx.sqrt(N))
+    n_prime_factors = {p for p in SMALL_PRIMES if N % p == 0}
+    
+    scores: Dict[int, float] = {}  # a score depends only on the segment centre
+    queue = []
+    pending: Dict[int, Tuple[int, int, int, int]] = {}  # node -> (segments left, start, end, depth)
+    counter = [0]
+    
+    def expand(start: int, end: int, depth: int) -> None:
+        # Push a window's top-K segments; windows without segments expand at once
+        segments = window_segments(start, end)
+        unscored = {(seg_start + seg_end) // 2: (seg_start, seg_end)
+                    for seg_start, seg_end in segments
+                    if (seg_start + seg_end) // 2 not in scores}
+        if unscored:
+            batch = score_segments(unscored.values(), N, sqrt_N, kappa)
+            scores.update(zip(unscored, batch.tolist()))
+            metrics['segments_scored'] += len(unscored)
+        segment_scores = [(scores[(seg_start + seg_end) // 2], seg_start, seg_end)
+                          for seg_start, seg_end in segments]
+        segment_scores.sort(reverse=True, key=lambda x: x[0])
+        top = segment_scores[:DEFAULT_TOP_K]
+        node = counter[0]
+        counter[0] += 1
+        if not top:
+            expand_children(start, end, depth)
+            return
+        pending[node] = (len(top), start, end, depth)
+        for score, seg_start, seg_end in top:
+            heapq.heappush(queue, (-score, counter[0], depth, seg_start, seg_end, node))
+            counter[0] += 1
+    
+    def expand_children(start: int, end: int, depth: int) -> None:
+        if depth < max_depth:
+            mid = (start + end) // 2
+            expand(start, mid, depth + 1)
+            expand(mid + 1, end, depth + 1)
+    
+    def segment_done(node: int) -> None:
+        left, start, end, depth = pending[node]
+        if left > 1:
+            pending[node] = (left - 1, start, end, depth)
+        else:
+            del pending[node]
+            expand_children(start, end, depth)
+    
+    expand(window_start, window_end, 0)
+    
+    coverage = CoverageMap()
+    while queue:
+        neg_score, _, depth, seg_start, seg_end, node = heapq.heappop(queue)
+        stride = max((seg_end - seg_start) // STRIDE_DIVISOR, 1)
+        if coverage.contains(seg_start, seg_end, stride):
+            metrics['segments_skipped'] += 1
+            segment_done(node)
+            continue
+        
+        metrics['segments_searched'] += 1
+        if verbose:
+            print(f"    Depth {depth}: searching [{seg_start}, {seg_end}] (score={-neg_score:.4f})")
+        
+        valid = segment_candidate_mask(seg_start, seg_end, stride, N, sqrt_N, n_prime_factors)
+        certified = coverage.overlapping(seg_start, seg_end)
+        coverage.add(seg_start, seg_end, stride)
+        covered = np.zeros(len(valid), dtype=bool)
+        if certified:
+            covered = CoverageMap.covered_mask(certified, seg_start, stride, len(valid))
+            valid &= ~covered
+        for i in np.flatnonzero(valid).tolist():
+            candidate = seg_start + i * stride
+            metrics['candidates_tested'] += 1
+            
+            if N % candidate == 0:
+                metrics['candidates_skipped'] += int(covered[:i].sum())
+                if verbose:
+                    print(f"    ✓ Factor found: {candidate}")
+                return (candidate, N // candidate)
+        metrics['candidates_skipped'] += int(covered.sum())
+        segment_done(node)
+    
+    # Union of searched segments over the whole window
+    covered, reach = 0, window_start
+    for s, e_, _ in sorted(coverage.progressions):
+        if e_ > reach:
+            covered += e_ - max(s, reach)
+            reach = e_
+    total = window_end - window_start
+    metrics['window_coverage_pct'] = (covered / total * 100) if total > 0 else 0
+    return None
 
 
 def recursive_window_subdivision(N: int, window_start: int, window_end: int,
                                  depth: int, max_depth: int, kappa_threshold: float,
-                                 metrics: Dict, verbose: bool = False) -> Optional[Tuple[int, int]]:
+                                 metrics: Dict, verbose: bool = False,
+                                 ctx: Optional[MPContext] = None) -> Optional[Tuple[int, int]]:
     """
     Recursively subdivide search window using segment-based Mandelbrot scoring.
     
@@ -236,6 +502,7 @@ def recursive_window_subdivision(N: int, window_start: int, window_end: int,
         kappa_threshold: Threshold for geodesic density
         metrics: Dictionary to track metrics
         verbose: Enable detailed logging
+        ctx: mpmath context (default: engine_context(N))
         
     Returns:
         Tuple (p, q) if factors found, None otherwise
@@ -248,7 +515,8 @@ def recursive_window_subdivision(N: int, window_start: int, window_end: int,
     
     # Compute kappa for current window
     kappa = compute_kappa(N)
-    sqrt_N = int(mp.sqrt(N))
+    ctx = ctx if ctx is not None else engine_context(N)
+    sqrt_N = int(ctx.sqrt(N))
     
     # Pre-compute small primes that divide N (optimization)
     n_prime_factors = {p for p in SMALL_PRIMES if N % p == 0}
@@ -259,23 +527,16 @@ def recursive_window_subdivision(N: int, window_start: int, window_end: int,
         
         # Divide window into coarse segments
         segment_size = max((window_end - window_start) // SEGMENTS_PER_WINDOW, MIN_SEGMENT_SIZE)
-        segments = []
-        
-        current = window_start
-        while current < window_end:
-            seg_end = min(current + segment_size, window_end)
-            segments.append((current, seg_end))
-            current = seg_end
+        segments = window_segments(window_start, window_end)
         
         if verbose:
             print(f"    Created {len(segments)} segments of size ~{segment_size}")
         
         # Score each segment with Mandelbrot
-        segment_scores = []
-        for seg_start, seg_end in segments:
-            score = score_segment_with_mandelbrot(seg_start, seg_end, N, kappa)
-            segment_scores.append((score, seg_start, seg_end))
-            metrics['segments_scored'] += 1
+        scores = score_segments(segments, N, sqrt_N, kappa).tolist()
+        segment_scores = [(score, seg_start, seg_end)
+                          for score, (seg_start, seg_end) in zip(scores, segments)]
+        metrics['segments_scored'] += len(segments)
         
         # Sort by score (descending) and select top-K
         segment_scores.sort(reverse=True, key=lambda x: x[0])
@@ -297,11 +558,10 @@ def recursive_window_subdivision(N: int, window_start: int, window_end: int,
             # Use deterministic stride based on segment size
             stride = max((seg_end - seg_start) // STRIDE_DIVISOR, 1)
             
-            for candidate in range(seg_start, seg_end, stride):
-                # Apply hard prefilters (pass pre-computed n_prime_factors)
-                if not is_valid_candidate(candidate, N, sqrt_N, n_prime_factors):
-                    continue
-                
+            # Hard prefilters for the whole segment at once
+            valid = segment_candidate_mask(seg_start, seg_end, stride, N, sqrt_N, n_prime_factors)
+            for i in np.flatnonzero(valid).tolist():
+                candidate = seg_start + i * stride
                 metrics['candidates_tested'] += 1
                 
                 # Test candidate
@@ -320,13 +580,13 @@ def recursive_window_subdivision(N: int, window_start: int, window_end: int,
     
     # Search left half
     result = recursive_window_subdivision(N, window_start, mid, depth + 1, 
-                                         max_depth, kappa_threshold, metrics, verbose)
+                                         max_depth, kappa_threshold, metrics, verbose, ctx)
     if result:
         return result
     
     # Search right half
     result = recursive_window_subdivision(N, mid + 1, window_end, depth + 1,
-                                         max_depth, kappa_threshold, metrics, verbose)
+                                         max_depth, kappa_threshold, metrics, verbose, ctx)
     if result:
         return result
     
@@ -335,7 +595,9 @@ def recursive_window_subdivision(N: int, window_start: int, window_end: int,
 
 def fr_gva_factor_search(N: int, max_depth: int = 5, kappa_threshold: float = 0.525,
                          max_candidates: int = 10000, verbose: bool = False,
-                         allow_any_range: bool = False) -> Optional[Tuple[int, int]]:
+                         allow_any_range: bool = False, best_first: bool = True,
+                         metrics: Optional[Dict] = None,
+                         ctx: Optional[MPContext] = None) -> Optional[Tuple[int, int]]:
     """
     Factor semiprime N using Fractal-Recursive GVA (FR-GVA).
     
@@ -352,6 +614,11 @@ def fr_gva_factor_search(N: int, max_depth: int = 5, kappa_threshold: float = 0.
         max_candidates: Maximum candidates to test (for comparison)
         verbose: Enable detailed logging
         allow_any_range: Allow N outside operational range (for testing)
+        best_first: Use best_first_window_search (False: the depth-first
+            recursive_window_subdivision)
+        metrics: Optional dict to receive the metrics below
+        ctx: mpmath context (default: engine_context(N)); the global
+            mpmath precision is not touched
         
     Returns:
         Tuple (p, q) if factors found, None otherwise
@@ -361,6 +628,7 @@ def fr_gva_factor_search(N: int, max_depth: int = 5, kappa_threshold: float = 0.
         - segments_searched: Number of top-K segments actually searched
         - candidates_tested: Number of candidates passing prefilters and tested
         - window_coverage_pct: Percentage of window covered by searched segments
+        - candidates_skipped, segments_skipped (best-first): already certified
     """
     # Validate input range
     if not allow_any_range and N != CHALLENGE_127 and not (RANGE_MIN <= N <= RANGE_MAX):
@@ -371,74 +639,82 @@ def fr_gva_factor_search(N: int, max_depth: int = 5, kappa_threshold: float = 0.
         return (2, N // 2)
     
     # Initialize metrics
-    metrics = {
+    if metrics is None:
+        metrics = {}
+    metrics.update({
         'segments_scored': 0,
         'segments_searched': 0,
         'candidates_tested': 0,
         'window_coverage_pct': 0.0
-    }
+    })
+    
+    # Private context at adaptive precision (the global mp.mp is left alone)
+    if ctx is None:
+        ctx = engine_context(N)
+    if verbose:
+        print(f"FR-GVA Factorization (Segment-Based)")
+        print(f"N = {N}")
+        print(f"Bit length: {N.bit_length()}")
+        print(f"Adaptive precision: {ctx.dps} dps")
+        print(f"Max depth: {max_depth}")
+        print(f"κ threshold: {kappa_threshold}")
+        print(f"Prefilters: parity, first {len(SMALL_PRIMES)} primes, factor band")
+    
+    start_time = time.time()
+    
+    # Compute search window around sqrt(N)
+    sqrt_N = int(ctx.sqrt(N))
+    bit_length = N.bit_length()
     
-    # Set adaptive precision
-    required_dps = adaptive_precision(N)
-    with mp.workdps(required_dps):
-        if verbose:
-            print(f"FR-GVA Factorization (Segment-Based)")
-            print(f"N = {N}")
-            print(f"Bit length: {N.bit_length()}")
-            print(f"Adaptive precision: {required_dps} dps")
-            print(f"Max depth: {max_depth}")
-            print(f"κ threshold: {kappa_threshold}")
-            print(f"Prefilters: parity, first {len(SMALL_PRIMES)} primes, factor band")
-        
-        start_time = time.time()
-        
-        # Compute search window around sqrt(N)
-        sqrt_N = int(mp.sqrt(N))
-        bit_length = N.bit_length()
-        
-        # Adaptive window sizing (matching GVA baseline)
-        if bit_length <= 40:
-            window = max(1000, sqrt_N // 1000)
-        elif bit_length <= 60:
-            window = max(10000, sqrt_N // 5000)
-        elif bit_length <= 85:
-            window = max(100000, sqrt_N // 1000)
-        else:
-            window = max(200000, sqrt_N // 500)
-        
-        window_start = max(2, sqrt_N - window)
-        window_end = min(N - 1, sqrt_N + window)
-        
+    # Adaptive window sizing (matching GVA baseline)
+    if bit_length <= 40:
+        window = max(1000, sqrt_N // 1000)
+    elif bit_length <= 60:
+        window = max(10000, sqrt_N // 5000)
+    elif bit_length <= 85:
+        window = max(100000, sqrt_N // 1000)
+    else:
+        window = max(200000, sqrt_N // 500)
+    
+    window_start = max(2, sqrt_N - window)
+    window_end = min(N - 1, sqrt_N + window)
+    
+    if verbose:
+        print(f"Search window: [{window_start}, {window_end}] (±{window} around sqrt(N)={sqrt_N})")
+    
+    # Execute FR-GVA with segment-based subdivision
+    search = best_first_window_search if best_first else recursive_window_subdivision
+    result = search(N, window_start, window_end,
+                    max_depth=max_depth,
+                    kappa_threshold=kappa_threshold,
+                    metrics=metrics,
+                    verbose=verbose,
+                    ctx=ctx,
+                    **({} if best_first else {'depth': 0}))
+    
+    elapsed = time.time() - start_time
+    
+    if verbose:
+        print(f"\nMetrics:")
+        print(f"  Segments scored: {metrics['segments_scored']}")
+        print(f"  Segments searched: {metrics['segments_searched']}")
+        print(f"  Candidates tested: {metrics['candidates_tested']}")
+        print(f"  Window coverage: {metrics['window_coverage_pct']:.2f}%")
+        if best_first:
+            print(f"  Skipped (already certified): {metrics['candidates_skipped']} candidates, "
+                  f"{metrics['segments_skipped']} segments")
+    
+    if result:
+        p, q = result
         if verbose:
-            print(f"Search window: [{window_start}, {window_end}] (±{window} around sqrt(N)={sqrt_N})")
-        
-        # Execute FR-GVA with segment-based subdivision
-        result = recursive_window_subdivision(N, window_start, window_end, 
-                                             depth=0, max_depth=max_depth,
-                                             kappa_threshold=kappa_threshold,
-                                             metrics=metrics,
-                                             verbose=verbose)
-        
-        elapsed = time.time() - start_time
-        
+            print(f"\n✓ Factor found: {N} = {p} × {q}")
+            print(f"  Time: {elapsed:.3f}s")
+        return result
+    else:
         if verbose:
-            print(f"\nMetrics:")
-            print(f"  Segments scored: {metrics['segments_scored']}")
-            print(f"  Segments searched: {metrics['segments_searched']}")
-            print(f"  Candidates tested: {metrics['candidates_tested']}")
-            print(f"  Window coverage: {metrics['window_coverage_pct']:.2f}%")
-        
-        if result:
-            p, q = result
-            if verbose:
-                print(f"\n✓ Factor found: {N} = {p} × {q}")
-                print(f"  Time: {elapsed:.3f}s")
-            return result
-        else:
-            if verbose:
-                print(f"\n✗ No factors found")
-                print(f"  Time: {elapsed:.3f}s")
-            return None
+            print(f"\n✗ No factors found")
+            print(f"  Time: {elapsed:.3f}s")
+        return None
 
 
 def main():
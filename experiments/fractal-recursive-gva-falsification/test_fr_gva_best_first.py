@@ -0,0 +1,118 @@
+"""
+Test Suite for Best-First FR-GVA
+================================
+
+Checks that the best-first search finds the recursion's factors without
+certifying any candidate twice.
+"""
+
+import sys
+import os
+
+# Add parent directories to path for imports
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, repo_root)
+sys.path.insert(0, os.path.join(repo_root, 'experiments', 'fractal-recursive-gva-falsification'))
+
+from fr_gva_implementation import (CoverageMap, fr_gva_factor_search, GATE_1_30BIT,
+                                   SMALL_PRIMES, is_valid_candidate, segment_candidate_mask)
+
+
+def run_both(N):
+    """(result, metrics) for the recursive and the best-first search."""
+    recursive, best_first = {}, {}
+    r1 = fr_gva_factor_search(N, allow_any_range=True, best_first=False, metrics=recursive)
+    r2 = fr_gva_factor_search(N, allow_any_range=True, metrics=best_first)
+    return (r1, recursive), (r2, best_first)
+
+
+def test_coverage_map():
+    """Progression containment and membership."""
+    print("\n[Test 1] Coverage Map")
+
+    coverage = CoverageMap()
+    coverage.add(1000, 2000, 10)
+
+    assert coverage.contains(1000, 1500, 20), "Sub-progression with same phase"
+    assert not coverage.contains(1005, 1500, 10), "Different stride phase"
+    assert not coverage.contains(1500, 2500, 10), "Extends past the segment"
+    assert CoverageMap.covers(coverage.overlapping(1500, 1600), 1550)
+    assert not CoverageMap.covers(coverage.overlapping(1500, 1600), 1555)
+    assert coverage.overlapping(2000, 3000) == []
+
+    print("  ✓ Coverage map correct")
+
+
+def test_same_factors_fewer_candidates():
+    """47-bit balanced case: same factors, fewer certified candidates."""
+    print("\n[Test 2] Same Factors, Fewer Candidates")
+
+    N = 100000980001501  # 10000019 × 10000079
+    (r1, recursive), (r2, best_first) = run_both(N)
+
+    assert r1 is not None and set(r1) == set(r2), f"Factors differ: {r1} vs {r2}"
+    assert best_first['candidates_tested'] < recursive['candidates_tested']
+    assert best_first['segments_scored'] < recursive['segments_scored']
+
+    (r1, recursive), (r2, best_first) = run_both(GATE_1_30BIT)
+    assert set(r1) == set(r2) == {32749, 32771}
+    assert best_first['candidates_tested'] <= recursive['candidates_tested']
+
+    print(f"  ✓ Candidates tested: {recursive['candidates_tested']} → {best_first['candidates_tested']}")
+
+
+def test_exhaustive_search_skips_covered():
+    """Unfound factor: the whole tree is searched, repeats are skipped."""
+    print("\n[Test 3] Exhaustive Search")
+
+    N = 1000000016000000063  # 1000000007 × 1000000009, outside the window
+    (r1, recursive), (r2, best_first) = run_both(N)
+
+    assert r1 is None and r2 is None
+    assert best_first['candidates_skipped'] > 0
+    assert best_first['candidates_tested'] < recursive['candidates_tested']
+    assert best_first['segments_searched'] + best_first['segments_skipped'] == \
+        recursive['segments_searched']
+
+    print(f"  ✓ Skipped {best_first['candidates_skipped']} already certified candidates")
+
+
+def test_candidate_mask_matches_scalar():
+    """Strided prime bitmap agrees with is_valid_candidate."""
+    print("\n[Test 4] Candidate Mask")
+
+    from math import isqrt
+    for N, segments in [
+        (1073217479, [(3, 900, 1), (32000, 33500, 3), (32700, 32800, 2)]),
+        (3 * 5 * 7919 * 7927, [(1000, 20000, 7), (9000, 9100, 1)]),
+        (100000980001501, [(9999000, 10001000, 1), (10000000, 10002000, 30)]),
+    ]:
+        sqrt_N = isqrt(N)
+        n_prime_factors = {p for p in SMALL_PRIMES if N % p == 0}
+        for start, end, stride in segments:
+            mask = segment_candidate_mask(start, end, stride, N, sqrt_N, n_prime_factors)
+            expected = [is_valid_candidate(c, N, sqrt_N, n_prime_factors)
+                        for c in range(start, end, stride)]
+            assert mask.tolist() == expected, f"Mask differs for N={N}, {(start, end, stride)}"
+
+    print("  ✓ Mask matches the scalar prefilter")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("="*70)
+    print("BEST-FIRST FR-GVA TEST SUITE")
+    print("="*70)
+
+    test_coverage_map()
+    test_same_factors_fewer_candidates()
+    test_exhaustive_search_skips_covered()
+    test_candidate_mask_matches_scalar()
+
+    print("\n" + "="*70)
+    print("ALL TESTS PASSED ✓")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -16,6 +16,11 @@ import json
 from datetime import datetime
 
 import statistics
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
 
 # Configure high precision
 
@@ -44,30 +49,6 @@ def adaptive_precision(N: int) -> int:
     return max(50, bit_length * 4 + 200)
 
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
-    """Embed integer n into 7D torus using golden ratio geodesic mapping."""
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        coords.append(coord)
-    return coords
-
-
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """Compute Riemannian geodesic distance on 7D torus with periodic boundaries."""
-    dist_sq = mp.mpf(0)
-    for x, y in zip(p1, p2):
-        diff = abs(x - y)
-        torus_diff = min(diff, 1 - diff)
-        dist_sq += torus_diff**2
-    return mp.sqrt(dist_sq)
-
-
 def compute_amplitude(N_coords: List[mp.mpf], candidate: int, k: float) -> mp.mpf:
     """Compute GVA amplitude for a candidate (inverse distance)."""
     cand_coords = embed_torus_geodesic(candidate, k)
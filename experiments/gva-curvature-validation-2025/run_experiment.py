@@ -27,6 +27,11 @@ import time
 import json
 from datetime import datetime
 import statistics
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
 
 # 127-bit challenge (whitelist)
 CHALLENGE_127 = 137524771864208156028430259349934309717
@@ -71,44 +76,6 @@ def compute_shell_boundaries(sqrt_N: int) -> Tuple[int, int]:
     return R5_OFFSET, R6_OFFSET
 
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
-    """
-    Embed integer n into 7D torus using golden ratio geodesic mapping.
-    
-    Args:
-        n: Integer to embed
-        k: Geodesic exponent (density warping)
-        dimensions: Torus dimensions (default 7)
-        
-    Returns:
-        List of coordinates in [0,1)^7
-    """
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        coords.append(coord)
-    return coords
-
-
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """
-    Compute Riemannian geodesic distance on 7D torus with periodic boundaries.
-    
-    Distance accounts for wrapping: d(x,y) = min(|x-y|, 1-|x-y|) per dimension.
-    """
-    dist_sq = mp.mpf(0)
-    for x, y in zip(p1, p2):
-        diff = abs(x - y)
-        torus_diff = min(diff, mp.mpf(1) - diff)
-        dist_sq += torus_diff ** 2
-    return mp.sqrt(dist_sq)
-
-
 def compute_amplitude(N_coords: List[mp.mpf], candidate: int, k: float) -> mp.mpf:
     """
     Compute GVA amplitude for a candidate.
@@ -22,13 +22,18 @@ import mpmath as mp
 import json
 import time
 import random
+from math import isqrt
 from typing import List, Tuple, Dict
 from pathlib import Path
 import sys
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from gva_factorization import embed_torus_geodesic, riemannian_distance, adaptive_precision
+from gva_factorization import adaptive_precision
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from primality import next_prime
+sys.path.insert(0, str(Path(__file__).parent))
+from snr_engine import snr_matrix, snr_window
 
 
 def generate_balanced_semiprime(bit_length: int, seed: int) -> Tuple[int, int, int]:
@@ -50,34 +55,11 @@ def generate_balanced_semiprime(bit_length: int, seed: int) -> Tuple[int, int, i
     target_N = 2 ** bit_length
     target_p = int(mp.sqrt(target_N))
     
-    # Search for primes near target_p
-    # Simple prime generation: find next prime after target_p
-    def is_prime_simple(n: int) -> bool:
-        """Simple primality test for small numbers"""
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        for i in range(3, int(n**0.5) + 1, 2):
-            if n % i == 0:
-                return False
-        return True
-    
-    # Find p near target_p
-    p = target_p
-    offset = random.randint(-1000, 1000)
-    p += offset
-    while not is_prime_simple(p):
-        p += 2 if p % 2 == 1 else 1
-    
-    # Find q near target_p to keep balanced
-    q = target_p
-    offset = random.randint(-1000, 1000)
-    q += offset
-    while not is_prime_simple(q) or q == p:
-        q += 2 if q % 2 == 1 else 1
+    # Find p and q near target_p to keep balanced
+    p = next_prime(target_p + random.randint(-1000, 1000))
+    q = next_prime(target_p + random.randint(-1000, 1000))
+    if q == p:
+        q = next_prime(q + 1)
     
     N = p * q
     
@@ -85,7 +67,8 @@ def generate_balanced_semiprime(bit_length: int, seed: int) -> Tuple[int, int, i
 
 
 def measure_geodesic_snr(N: int, p: int, q: int, k: float = 0.35,
-                        num_random_candidates: int = 1000) -> Dict:
+                        num_random_candidates: int = 1000,
+                        method: str = 'float') -> Dict:
     """
     Measure geodesic signal-to-noise ratio for a semiprime.
     
@@ -94,6 +77,7 @@ def measure_geodesic_snr(N: int, p: int, q: int, k: float = 0.35,
         p, q: True factors (p × q = N)
         k: Geodesic exponent
         num_random_candidates: Number of random candidates to sample for noise baseline
+        method: Distance kernel ('float', 'fixed' or 'mp'; see snr_engine)
         
     Returns:
         Dictionary with SNR measurements
@@ -101,54 +85,44 @@ def measure_geodesic_snr(N: int, p: int, q: int, k: float = 0.35,
     bit_length = N.bit_length()
     required_dps = adaptive_precision(N)
     
-    with mp.workdps(required_dps):
-        # Embed N
-        N_coords = embed_torus_geodesic(N, k)
-        
-        # Compute distances at true factors
-        p_coords = embed_torus_geodesic(p, k)
-        q_coords = embed_torus_geodesic(q, k)
-        
-        dist_p = riemannian_distance(N_coords, p_coords)
-        dist_q = riemannian_distance(N_coords, q_coords)
-        min_factor_distance = float(min(dist_p, dist_q))
-        
-        # Sample random candidates near sqrt(N)
-        sqrt_N = int(mp.sqrt(N))
-        window = max(10000, sqrt_N // 100)
-        
-        random_distances = []
-        for _ in range(num_random_candidates):
-            offset = random.randint(-window, window)
-            candidate = sqrt_N + offset
-            
-            if candidate <= 1 or candidate >= N:
-                continue
-            if N % candidate == 0:  # Skip actual factors
-                continue
-            
-            candidate_coords = embed_torus_geodesic(candidate, k)
-            dist = riemannian_distance(N_coords, candidate_coords)
-            random_distances.append(float(dist))
-        
-        if not random_distances:
-            return None
-        
-        avg_random_distance = sum(random_distances) / len(random_distances)
-        snr = min_factor_distance / avg_random_distance if avg_random_distance > 0 else 0.0
+    # Sample random candidates near sqrt(N)
+    sqrt_N = isqrt(N)
+    window = snr_window(sqrt_N)
+    
+    candidates = []
+    for _ in range(num_random_candidates):
+        offset = random.randint(-window, window)
+        candidate = sqrt_N + offset
         
-        return {
-            'N': N,
-            'p': p,
-            'q': q,
-            'bit_length': bit_length,
-            'precision_dps': required_dps,
-            'k': k,
-            'min_factor_distance': min_factor_distance,
-            'avg_random_distance': avg_random_distance,
-            'snr': snr,
-            'num_samples': len(random_distances)
-        }
+        if candidate <= 1 or candidate >= N:
+            continue
+        if N % candidate == 0:  # Skip actual factors
+            continue
+        candidates.append(candidate)
+    
+    if not candidates:
+        return None
+    
+    # One batch for the factors and all candidates
+    matrix = snr_matrix(N, p, q, [k], candidates, method)
+    min_factor_distance = float(matrix.min_factor_distance[0])
+    random_distances = matrix.distances[:, 0].tolist()
+    
+    avg_random_distance = sum(random_distances) / len(random_distances)
+    snr = min_factor_distance / avg_random_distance if avg_random_distance > 0 else 0.0
+    
+    return {
+        'N': N,
+        'p': p,
+        'q': q,
+        'bit_length': bit_length,
+        'precision_dps': required_dps,
+        'k': k,
+        'min_factor_distance': min_factor_distance,
+        'avg_random_distance': avg_random_distance,
+        'snr': snr,
+        'num_samples': len(random_distances)
+    }
 
 
 def run_signal_decay_analysis():
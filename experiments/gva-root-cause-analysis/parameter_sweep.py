@@ -4,6 +4,13 @@ Parameter Sweep Module
 
 Grid search over GVA parameters (k_values, candidate_budgets) to identify
 parameter sensitivity and optimal configurations.
+
+Budgets are replayed, not re-run: a GVA search tests candidates in an order
+that does not depend on max_candidates (except through the phase-1 sample
+size for N ≤ 60 bits, see phase1_sample_size), so a run at budget B succeeds
+iff the factor's certification index under the largest budget is ≤ B. Each
+(N, k, sample plan) is searched once at its largest budget with a trace, and
+the other budgets are derived by replay_budgets.
 """
 
 import sys
@@ -21,7 +28,7 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
-from gva_factorization import gva_factor_search
+from gva_factorization import gva_factor_search, phase1_sample_size
 
 
 def test_parameters(args: Tuple) -> Dict:
@@ -37,6 +44,7 @@ def test_parameters(args: Tuple) -> Dict:
     N, p, q, k_value, candidate_budget, timeout = args
     
     start_time = time.time()
+    trace = {}
     
     try:
         # Run with timeout simulation (simplified - actual timeout in gva_factor_search)
@@ -45,7 +53,8 @@ def test_parameters(args: Tuple) -> Dict:
             k_values=[k_value], 
             max_candidates=candidate_budget,
             verbose=False,
-            allow_any_range=True
+            allow_any_range=True,
+            trace=trace
         )
         
         elapsed = time.time() - start_time
@@ -67,7 +76,8 @@ def test_parameters(args: Tuple) -> Dict:
             'success': success,
             'false_positive': false_positive,
             'runtime': elapsed,
-            'found_factors': result if result else None
+            'found_factors': result if result else None,
+            'trace': trace
         }
     
     except Exception as e:
@@ -82,12 +92,53 @@ def test_parameters(args: Tuple) -> Dict:
         }
 
 
+def replay_budgets(run: Dict, budgets: List[int]) -> List[Dict]:
+    """
+    Derive results for smaller budgets from one traced run.
+    
+    Success at budget B is hit_rank ≤ B. Runtime is the run's fixed cost
+    (setup + phase-1 sampling) plus its phase-2 time scaled by the number of
+    candidates a budget-B run would have tested.
+    
+    Args:
+        run: test_parameters result at the largest budget
+        budgets: Budgets ≤ run['budget'] with the same phase-1 sample size
+        
+    Returns:
+        One result dict per budget; derived ones carry 'replayed': True
+    """
+    trace = run.get('trace')
+    results = []
+    for budget in budgets:
+        if budget == run['budget'] or not trace:  # the run itself, or it errored
+            results.append(dict(run, budget=budget, replayed=budget != run['budget']))
+            continue
+        
+        hit_rank = trace['hit_rank']
+        hit = hit_rank is not None and hit_rank <= budget
+        tested = min(budget, hit_rank if hit_rank is not None else trace['candidates_tested'])
+        fixed = run['runtime'] - trace['search_seconds']
+        search = trace['search_seconds'] * tested / max(1, trace['candidates_tested'])
+        
+        results.append(dict(
+            run,
+            budget=budget,
+            success=run['success'] and hit,
+            false_positive=run['false_positive'] and hit,
+            runtime=fixed + search,
+            found_factors=run['found_factors'] if hit else None,
+            replayed=True
+        ))
+    return results
+
+
 def parameter_sweep(test_cases: List[Dict], 
                    k_values: List[float],
                    candidate_budgets: List[int],
                    timeout: int = 10,
                    output_dir: str = 'results',
-                   parallel: bool = True) -> Dict:
+                   parallel: bool = True,
+                   replay: bool = True) -> Dict:
     """
     Perform grid search over parameters.
     
@@ -98,6 +149,8 @@ def parameter_sweep(test_cases: List[Dict],
         timeout: Timeout per run in seconds
         output_dir: Output directory
         parallel: Use multiprocessing
+        replay: Search each (N, k, sample plan) once at its largest budget and
+            derive the smaller budgets (False: one search per grid point)
         
     Returns:
         Sweep results
@@ -113,17 +166,22 @@ def parameter_sweep(test_cases: List[Dict],
     print(f"Timeout: {timeout}s per run")
     print(f"Parallel: {parallel}")
     print(f"Total runs: {len(test_cases) * len(k_values) * len(candidate_budgets)}")
-    print()
     
-    # Generate all parameter combinations
-    tasks = []
+    # Group budgets that share a candidate order; search each group once at
+    # its largest budget
+    groups = {}
     for case in test_cases:
         for k in k_values:
             for budget in candidate_budgets:
-                tasks.append((case['N'], case['p'], case['q'], k, budget, timeout))
+                plan = phase1_sample_size(case['N'].bit_length(), budget) if replay else budget
+                groups.setdefault((case['N'], case['p'], case['q'], k, plan), []).append(budget)
+    
+    tasks = [(N, p, q, k, max(budgets), timeout) for (N, p, q, k, _), budgets in groups.items()]
+    print(f"Searches: {len(tasks)} (replay={replay})")
+    print()
     
     # Execute sweep
-    results = []
+    runs = []
     
     if parallel:
         # Use multiprocessing for parallel execution
@@ -131,13 +189,20 @@ def parameter_sweep(test_cases: List[Dict],
         print(f"Using {num_workers} parallel workers")
         
         with Pool(num_workers) as pool:
-            results = pool.map(test_parameters, tasks)
+            runs = pool.map(test_parameters, tasks)
     else:
         # Sequential execution
         for i, task in enumerate(tasks):
             print(f"[{i+1}/{len(tasks)}] Testing N={task[0]}, k={task[3]}, budget={task[4]}")
             result = test_parameters(task)
-            results.append(result)
+            runs.append(result)
+    
+    by_point = {}
+    for run, budgets in zip(runs, groups.values()):
+        for r in replay_budgets(run, budgets):
+            by_point[(r['N'], r['k'], r['budget'])] = r
+    results = [by_point[(case['N'], k, budget)]
+               for case in test_cases for k in k_values for budget in candidate_budgets]
     
     # Aggregate results
     os.makedirs(output_dir, exist_ok=True)
@@ -146,7 +211,7 @@ def parameter_sweep(test_cases: List[Dict],
     with open(csv_path, 'w', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=[
             'N', 'bit_length', 'k', 'budget', 'success', 'false_positive', 
-            'runtime', 'found_factors'
+            'runtime', 'found_factors', 'replayed'
         ])
         writer.writeheader()
         
@@ -159,7 +224,8 @@ def parameter_sweep(test_cases: List[Dict],
                 'success': r['success'],
                 'false_positive': r['false_positive'],
                 'runtime': f"{r['runtime']:.3f}",
-                'found_factors': r.get('found_factors', '')
+                'found_factors': r.get('found_factors', ''),
+                'replayed': r.get('replayed', False)
             })
     
     print(f"CSV saved: {csv_path}")
@@ -220,6 +286,7 @@ def parameter_sweep(test_cases: List[Dict],
     summary = {
         'timestamp': datetime.now().isoformat(),
         'total_runs': total_runs,
+        'searches': len(runs),
         'successes': successes,
         'false_positives': false_positives,
         'success_rate': successes / total_runs if total_runs > 0 else 0,
@@ -232,7 +299,7 @@ def parameter_sweep(test_cases: List[Dict],
     print("=" * 70)
     print("Summary")
     print("=" * 70)
-    print(f"Total runs: {total_runs}")
+    print(f"Total runs: {total_runs} ({len(runs)} searches)")
     print(f"Successes: {successes} ({100*summary['success_rate']:.1f}%)")
     print(f"False positives: {false_positives}")
     print(f"Avg runtime: {summary['avg_runtime']:.3f}s")
@@ -13,123 +13,22 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
-import mpmath as mp
 import numpy as np
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
-from gva_factorization import embed_torus_geodesic, riemannian_distance, adaptive_precision
-
-
-def compute_snr(N: int, p: int, q: int, k_values: List[float], 
-                candidate_count: int = 1000, seed: int = 42) -> Dict:
-    """
-    Compute Signal-to-Noise Ratio for geodesic distance at true factors.
-    
-    SNR = min_distance_at_factors / avg_distance_over_candidates
-    
-    Higher SNR indicates better signal discrimination.
-    
-    Args:
-        N: Semiprime to analyze
-        p, q: True factors
-        k_values: List of geodesic exponents to test
-        candidate_count: Number of random candidates to sample
-        seed: Random seed for reproducibility
-        
-    Returns:
-        Dictionary with SNR analysis results
-    """
-    np.random.seed(seed)
-    
-    bit_length = N.bit_length()
-    required_dps = adaptive_precision(N)
-    
-    with mp.workdps(required_dps):
-        sqrt_N = int(mp.sqrt(N))
-        
-        # Compute distances at true factors
-        factor_distances = {}
-        for k in k_values:
-            N_coords = embed_torus_geodesic(N, k)
-            p_coords = embed_torus_geodesic(p, k)
-            q_coords = embed_torus_geodesic(q, k)
-            
-            dist_p = float(riemannian_distance(N_coords, p_coords))
-            dist_q = float(riemannian_distance(N_coords, q_coords))
-            
-            factor_distances[k] = {
-                'dist_p': dist_p,
-                'dist_q': dist_q,
-                'min_dist': min(dist_p, dist_q)
-            }
-        
-        # Sample random candidates around sqrt(N)
-        window = max(10000, sqrt_N // 100)
-        candidate_distances = {k: [] for k in k_values}
-        
-        candidates_sampled = 0
-        while candidates_sampled < candidate_count:
-            offset = np.random.randint(-window, window + 1)
-            candidate = sqrt_N + offset
-            
-            # Skip invalid candidates
-            if candidate <= 1 or candidate >= N:
-                continue
-            if candidate == p or candidate == q:
-                continue
-            if candidate % 2 == 0 or candidate % 3 == 0 or candidate % 5 == 0:
-                continue
-            
-            for k in k_values:
-                N_coords = embed_torus_geodesic(N, k)
-                cand_coords = embed_torus_geodesic(candidate, k)
-                dist = float(riemannian_distance(N_coords, cand_coords))
-                candidate_distances[k].append(dist)
-            
-            candidates_sampled += 1
-        
-        # Compute SNR for each k
-        snr_results = {}
-        for k in k_values:
-            min_factor_dist = factor_distances[k]['min_dist']
-            avg_candidate_dist = np.mean(candidate_distances[k])
-            std_candidate_dist = np.std(candidate_distances[k])
-            
-            snr = min_factor_dist / avg_candidate_dist if avg_candidate_dist > 0 else 0
-            
-            snr_results[k] = {
-                'min_factor_distance': min_factor_dist,
-                'avg_candidate_distance': avg_candidate_dist,
-                'std_candidate_distance': std_candidate_dist,
-                'snr': snr
-            }
-        
-        # Find best k
-        best_k = max(k_values, key=lambda k: snr_results[k]['snr'])
-        
-        return {
-            'N': str(N),
-            'p': str(p),
-            'q': str(q),
-            'bit_length': bit_length,
-            'precision_dps': required_dps,
-            'k_values': k_values,
-            'candidate_count': candidates_sampled,
-            'seed': seed,
-            'factor_distances': {str(k): v for k, v in factor_distances.items()},
-            'snr_results': {str(k): v for k, v in snr_results.items()},
-            'best_k': best_k,
-            'best_snr': snr_results[best_k]['snr']
-        }
+sys.path.insert(0, os.path.dirname(__file__))
+# compute_snr is re-exported for callers that import it from here
+from snr_engine import compute_snr, compute_snr_batch
 
 
 def analyze_snr_decay(test_cases: List[Dict], k_values: List[float],
-                     candidate_count: int = 1000, output_dir: str = 'results') -> Dict:
+                     candidate_count: int = 1000, output_dir: str = 'results',
+                     workers: Optional[int] = None) -> Dict:
     """
     Analyze SNR decay across multiple bit lengths and fit exponential decay.
     
@@ -138,11 +37,11 @@ def analyze_snr_decay(test_cases: List[Dict], k_values: List[float],
         k_values: Geodesic exponents to test
         candidate_count: Candidates per test case
         output_dir: Output directory for results
+        workers: Processes for the per-case SNR (None: serial)
         
     Returns:
         Analysis results with exponential fit
     """
-    results = []
     
     print("=" * 70)
     print("SNR Decay Analysis")
@@ -153,13 +52,10 @@ def analyze_snr_decay(test_cases: List[Dict], k_values: List[float],
     print(f"Output directory: {output_dir}")
     print()
     
-    for i, case in enumerate(test_cases):
-        N, p, q = case['N'], case['p'], case['q']
-        print(f"[{i+1}/{len(test_cases)}] Analyzing N={N} ({N.bit_length()} bits)")
-        
-        snr_data = compute_snr(N, p, q, k_values, candidate_count)
-        results.append(snr_data)
-        
+    results = compute_snr_batch(test_cases, k_values, candidate_count, workers=workers)
+    for i, (case, snr_data) in enumerate(zip(test_cases, results)):
+        N = case['N']
+        print(f"[{i+1}/{len(test_cases)}] Analyzed N={N} ({N.bit_length()} bits)")
         print(f"  Best k={snr_data['best_k']}, SNR={snr_data['best_snr']:.6f}")
         print()
     
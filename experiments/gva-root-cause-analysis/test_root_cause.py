@@ -11,10 +11,14 @@ import json
 import csv
 from pathlib import Path
 
+import mpmath as mp
+import numpy as np
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from signal_decay_analyzer import compute_snr, analyze_snr_decay
-from parameter_sweep import test_parameters, parameter_sweep
+from snr_engine import compute_snr_batch, sample_candidates
+from parameter_sweep import test_parameters, parameter_sweep, replay_budgets
 from theoretical_sim import compute_expected_distance, simulate_phase_cancellation, analyze_theoretical_flaws
 from gva_root_cause import generate_unified_report
 
@@ -84,6 +88,49 @@ def test_signal_decay_analyzer():
     print()
 
 
+def test_snr_engine_matches_reference():
+    """Batched SNR agrees with per-candidate mpmath distances."""
+    print("=" * 70)
+    print("TEST: Batched SNR Engine")
+    print("=" * 70)
+    
+    from gva_factorization import adaptive_precision, embed_torus_geodesic, riemannian_distance
+    
+    N, p, q = 100000980001501, 10000019, 10000079
+    k_values = [0.3, 0.35]
+    
+    # Candidates are the draws of the former np.random.seed + randint loop
+    candidates = sample_candidates(N, p, q, 50, seed=42)
+    np.random.seed(42)
+    sqrt_N = int(mp.sqrt(N))
+    window = max(10000, sqrt_N // 100)
+    expected = []
+    while len(expected) < 50:
+        candidate = sqrt_N + np.random.randint(-window, window + 1)
+        if candidate in (p, q) or candidate % 2 == 0 or candidate % 3 == 0 or candidate % 5 == 0:
+            continue
+        expected.append(int(candidate))
+    assert candidates == expected
+    
+    exact = compute_snr(N, p, q, k_values, candidate_count=50, method='mp')
+    fast = compute_snr(N, p, q, k_values, candidate_count=50)
+    with mp.workdps(adaptive_precision(N)):
+        N_coords = embed_torus_geodesic(N, 0.35)
+        distances = [float(riemannian_distance(N_coords, embed_torus_geodesic(c, 0.35)))
+                     for c in candidates]
+    assert exact['snr_results']['0.35']['avg_candidate_distance'] == np.mean(distances)
+    for k in ['0.3', '0.35']:
+        assert abs(fast['snr_results'][k]['snr'] - exact['snr_results'][k]['snr']) < 1e-12
+    
+    cases = [{'N': 1073217479, 'p': 32749, 'q': 32771}, {'N': N, 'p': p, 'q': q}]
+    serial = compute_snr_batch(cases, k_values, candidate_count=50)
+    assert compute_snr_batch(cases, k_values, candidate_count=50, workers=2) == serial
+    assert serial[1] == fast
+    
+    print("  ✅ PASS: batched SNR matches the mpmath reference")
+    print()
+
+
 def test_parameter_sweep():
     """Test parameter sweep on Gate 1."""
     print("=" * 70)
@@ -122,6 +169,9 @@ def test_parameter_sweep():
     # Gate 1 should have at least some successes
     assert summary['successes'] > 0, "Gate 1 should have some successes"
     
+    # One search per k: 5000 and 10000 share a candidate order
+    assert summary['searches'] == len(k_values)
+    
     # Verify CSV output
     csv_path = os.path.join(output_dir, 'param_sweep.csv')
     assert os.path.exists(csv_path), "CSV output not created"
@@ -145,6 +195,36 @@ def test_parameter_sweep():
     print()
 
 
+def test_budget_replay_matches_direct_runs():
+    """Replayed budgets agree with running each budget separately."""
+    print("=" * 70)
+    print("TEST: Budget Replay")
+    print("=" * 70)
+    
+    N, p, q = 1073217479, 32749, 32771
+    k = 0.35
+    
+    # 2000 and 5000 share the 500-candidate phase-1 sample
+    run = test_parameters((N, p, q, k, 5000, 10))
+    assert run['trace']['hit_rank'] is not None
+    replayed = replay_budgets(run, [2000, 5000])
+    direct = test_parameters((N, p, q, k, 2000, 10))
+    assert replayed[0]['replayed'] and not replayed[1]['replayed']
+    assert replayed[0]['success'] == direct['success']
+    assert replayed[0]['found_factors'] == direct['found_factors']
+    assert replayed[0]['trace']['hit_rank'] == direct['trace']['hit_rank']
+    
+    # A budget below the certification index fails
+    rank = run['trace']['hit_rank']
+    below = replay_budgets(run, [rank - 1, rank])
+    assert not below[0]['success'] and below[0]['found_factors'] is None
+    assert below[1]['success']
+    assert below[0]['runtime'] <= run['runtime']
+    
+    print(f"  ✅ PASS: hit rank {rank} replayed across budgets")
+    print()
+
+
 def test_theoretical_sim():
     """Test theoretical simulation."""
     print("=" * 70)
@@ -291,7 +371,9 @@ def run_all_tests():
     
     try:
         test_signal_decay_analyzer()
+        test_snr_engine_matches_reference()
         test_parameter_sweep()
+        test_budget_replay_matches_direct_runs()
         test_theoretical_sim()
         test_unified_report()
         test_on_47bit_balanced()
@@ -34,6 +34,11 @@ from datetime import datetime
 import sys
 import os
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from tau_lattice import TauLattice
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
+
 # Try scipy for Sobol (requires scipy >= 1.7.0)
 try:
     from scipy.stats import qmc
@@ -64,43 +69,6 @@ def adaptive_precision(N: int) -> int:
     return max(50, N.bit_length() * 4 + 200)
 
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
-    """
-    Embed integer n into 7D torus using geodesic mapping.
-    
-    The 7D torus embedding uses golden ratio (φ) and its powers to create
-    a quasi-periodic embedding that reveals factorization structure through
-    Riemannian distance minimization.
-    """
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2  # Golden ratio
-    
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        
-        if k != 1.0:
-            coord = mp.power(abs(coord), k)
-            coord = mp.fmod(coord, 1)
-        
-        coords.append(coord)
-    
-    return coords
-
-
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """
-    Compute Riemannian geodesic distance on 7D torus with periodic boundaries.
-    """
-    dist_sq = mp.mpf(0)
-    for c1, c2 in zip(p1, p2):
-        diff = abs(c1 - c2)
-        wrap_diff = mp.mpf(1) - diff
-        min_diff = min(diff, wrap_diff)
-        dist_sq += min_diff * min_diff
-    return mp.sqrt(dist_sq)
-
-
 def compute_tau_triple_prime(N: int, b: mp.mpf, h: mp.mpf) -> Tuple[mp.mpf, mp.mpf]:
     """
     Compute τ'''(b) = third derivative of tau function at bit position b
@@ -124,30 +92,14 @@ def compute_tau_triple_prime(N: int, b: mp.mpf, h: mp.mpf) -> Tuple[mp.mpf, mp.m
         return N - two_b * quotient
     
     # Third derivative using central differences: f'''(x) ≈ (f(x+2h) - 2f(x+h) + 2f(x-h) - f(x-2h)) / (2h³)
-    # Richardson extrapolation: combine coarse (h) and fine (h/2) estimates
-    
-    # Coarse estimate with step h
-    tau_p2h = tau(b + 2*h)
-    tau_ph = tau(b + h)
-    tau_mh = tau(b - h)
-    tau_m2h = tau(b - 2*h)
-    
-    coarse = (tau_p2h - 2*tau_ph + 2*tau_mh - tau_m2h) / (2 * h**3)
-    
-    # Fine estimate with step h/2
-    h2 = h / 2
-    tau_p2h2 = tau(b + 2*h2)
-    tau_ph2 = tau(b + h2)
-    tau_mh2 = tau(b - h2)
-    tau_m2h2 = tau(b - 2*h2)
-    
-    fine = (tau_p2h2 - 2*tau_ph2 + 2*tau_mh2 - tau_m2h2) / (2 * h2**3)
-    
-    # Richardson extrapolation: (4*fine - coarse) / 3 for second-order improvement
-    richardson = (4 * fine - coarse) / 3
+    # Richardson extrapolation: combine coarse (h) and fine (h/2) estimates,
+    # (4*fine - coarse) / 3. The stencils share b±h, so the lattice
+    # evaluates τ at 6 points instead of 8.
+    lattice = TauLattice(tau, b, h)
+    richardson, error = lattice.richardson_third_derivative(0)
     
     # Error estimate
-    error = abs(richardson - fine) + mp.mpf('1e-50')
+    error = error + mp.mpf('1e-50')
     
     return richardson, error
 
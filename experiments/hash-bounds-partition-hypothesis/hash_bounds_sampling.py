@@ -14,9 +14,18 @@ Whitelist: 127-bit CHALLENGE_127 = 137524771864208156028430259349934309717
 """
 
 import mpmath as mp
-from typing import List, Tuple, Optional, Dict
+import numpy as np
+from bisect import bisect_left
+from typing import List, Tuple, Optional, Dict, Iterable, Union
+import os
+import sys
 import time
-from math import log, sqrt, isqrt
+from math import exp, log, sqrt, isqrt
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from table_cache import cached_table
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
 
 # Configure high precision for computations
 # Precision should be set explicitly in functions using mp.workdps()
@@ -33,6 +42,10 @@ RANGE_MAX = 10**18
 # Seed primes for fractional square root boundaries
 SEED_PRIMES = [2, 3, 5, 7, 11, 13]
 
+# Version of the cached frac_sqrt / boundaries tables (table_cache); bump it
+# when compute_fractional_sqrt or compute_boundary_centers changes
+TABLE_VERSION = 1
+
 
 def adaptive_precision(N: int) -> int:
     """
@@ -66,17 +79,23 @@ def get_all_fractional_roots(precision: int = 100) -> Dict[int, mp.mpf]:
     """
     Compute fractional parts of √p for all seed primes.
     
+    The table is disk-cached, keyed by (seed primes, precision).
+    
     Args:
         precision: Decimal precision
         
     Returns:
         Dict mapping prime p -> frac(√p)
     """
-    result = {}
-    with mp.workdps(precision):
-        for p in SEED_PRIMES:
-            result[p] = compute_fractional_sqrt(p, precision)
-    return result
+    def compute():
+        result = {}
+        with mp.workdps(precision):
+            for p in SEED_PRIMES:
+                result[p] = compute_fractional_sqrt(p, precision)
+        return result
+    
+    return cached_table('frac_sqrt', {'primes': SEED_PRIMES, 'dps': precision}, compute,
+                        version=TABLE_VERSION)
 
 
 def compute_boundary_centers(sqrt_N: int, frac_sqrt: mp.mpf, 
@@ -137,6 +156,10 @@ def compute_all_boundaries(sqrt_N: int, precision: int = 100,
     """
     Compute boundary centers for all seed primes.
     
+    Boundary offsets depend only on frac(√p) and the window, not on √N, so
+    the table is disk-cached keyed by (seed primes, precision, window) and
+    stored delta-encoded (sorted offsets have near-constant gaps).
+    
     Args:
         sqrt_N: Integer square root of N
         precision: Decimal precision
@@ -145,22 +168,28 @@ def compute_all_boundaries(sqrt_N: int, precision: int = 100,
     Returns:
         Dict mapping prime p -> list of boundary offsets
     """
-    frac_roots = get_all_fractional_roots(precision)
-    all_boundaries = {}
+    def compute():
+        frac_roots = get_all_fractional_roots(precision)
+        return {p: np.diff(compute_boundary_centers(sqrt_N, frac_sqrt, window),
+                           prepend=0).astype(np.int64)
+                for p, frac_sqrt in frac_roots.items()}
     
-    for p, frac_sqrt in frac_roots.items():
-        all_boundaries[p] = compute_boundary_centers(sqrt_N, frac_sqrt, window)
-    
-    return all_boundaries
+    deltas = cached_table('boundaries',
+                          {'primes': SEED_PRIMES, 'dps': precision, 'window': window},
+                          compute, version=TABLE_VERSION)
+    return {p: np.cumsum(d).tolist() for p, d in deltas.items()}
 
 
 def distance_to_nearest_boundary(offset: int, boundaries: List[int]) -> int:
     """
     Compute minimum distance from offset to any boundary.
     
+    Binary search, O(log b). compute_boundary_centers returns boundaries
+    sorted; other callers must pass them sorted ascending.
+    
     Args:
         offset: Offset from √N
-        boundaries: List of boundary positions
+        boundaries: Sorted list of boundary positions
         
     Returns:
         Minimum distance to any boundary
@@ -168,16 +197,63 @@ def distance_to_nearest_boundary(offset: int, boundaries: List[int]) -> int:
     if not boundaries:
         return abs(offset)
     
-    min_dist = float('inf')
-    for b in boundaries:
-        dist = abs(offset - b)
-        if dist < min_dist:
-            min_dist = dist
+    i = bisect_left(boundaries, offset)
+    if i == 0:
+        return boundaries[0] - offset
+    if i == len(boundaries):
+        return offset - boundaries[-1]
+    return min(boundaries[i] - offset, offset - boundaries[i - 1])
+
+
+class BoundaryIndex:
+    """
+    Sorted per-prime boundary arrays for batched nearest-boundary lookups.
+    
+    distances() does one searchsorted per seed prime over a whole batch of
+    offsets, so scoring n offsets against b boundaries is O(n log b).
+    """
+    
+    def __init__(self, all_boundaries: Dict[int, List[int]]):
+        """
+        Args:
+            all_boundaries: Dict mapping prime -> boundary offsets
+        """
+        self.primes = list(all_boundaries)
+        self.boundaries = {p: np.unique(np.asarray(b, dtype=np.int64))
+                           for p, b in all_boundaries.items()}
+    
+    def distances(self, offsets: Iterable[int]) -> np.ndarray:
+        """
+        Distance from every offset to the nearest boundary of every prime.
+        
+        Args:
+            offsets: Offsets from √N
+            
+        Returns:
+            int64 array of shape (len(primes), len(offsets))
+        """
+        offsets = np.asarray(offsets, dtype=np.int64)
+        result = np.empty((len(self.primes), offsets.size), dtype=np.int64)
+        for row, p in enumerate(self.primes):
+            bounds = self.boundaries[p]
+            if bounds.size == 0:
+                result[row] = np.abs(offsets)
+                continue
+            idx = np.searchsorted(bounds, offsets)
+            right = bounds[np.minimum(idx, bounds.size - 1)]
+            left = bounds[np.maximum(idx - 1, 0)]
+            result[row] = np.minimum(np.abs(right - offsets), np.abs(offsets - left))
+        return result
     
-    return int(min_dist)
+    def proximity_scores(self, offsets: Iterable[int],
+                         decay_scale: float = 100.0) -> np.ndarray:
+        """Batched boundary_proximity_score for many offsets."""
+        decay = np.exp(-self.distances(offsets) / decay_scale)
+        return decay.sum(axis=0) / len(SEED_PRIMES)
 
 
-def boundary_proximity_score(offset: int, all_boundaries: Dict[int, List[int]],
+def boundary_proximity_score(offset: int,
+                            all_boundaries: Union[Dict[int, List[int]], BoundaryIndex],
                             decay_scale: float = 100.0) -> float:
     """
     Compute boundary proximity score for a candidate offset.
@@ -187,19 +263,22 @@ def boundary_proximity_score(offset: int, all_boundaries: Dict[int, List[int]],
     
     Args:
         offset: Offset from √N
-        all_boundaries: Dict mapping prime -> boundary offsets
+        all_boundaries: Dict mapping prime -> sorted boundary offsets, or a
+            BoundaryIndex
         decay_scale: Distance scale for exponential decay
         
     Returns:
         Proximity score in [0, 1] range (higher = closer to boundaries)
     """
+    if isinstance(all_boundaries, BoundaryIndex):
+        return float(all_boundaries.proximity_scores([offset], decay_scale)[0])
+    
     total_score = 0.0
     
     for p, boundaries in all_boundaries.items():
         dist = distance_to_nearest_boundary(offset, boundaries)
         # Exponential decay from boundaries
-        score = mp.exp(-dist / decay_scale)
-        total_score += float(score)
+        total_score += exp(-dist / decay_scale)
     
     # Normalize by number of seed primes
     return total_score / len(SEED_PRIMES)
@@ -243,6 +322,9 @@ def generate_boundary_focused_samples(sqrt_N: int,
     n_boundary = int(n_samples * boundary_weight)
     n_uniform = n_samples - n_boundary
     
+    # Local offset width around each boundary, scaled with N
+    local_width = max(10, int(log(sqrt_N)))
+    
     # Generate boundary-focused samples using Sobol-like sequence
     # Samples clustered near boundary points with local QMC
     for i in range(n_boundary):
@@ -254,7 +336,6 @@ def generate_boundary_focused_samples(sqrt_N: int,
         boundary_center = all_boundary_points[idx % len(all_boundary_points)]
         
         # Local offset using golden ratio within boundary region
-        local_width = max(10, int(log(sqrt_N)))  # Scale with N
         alpha = ((i * phi_inv * phi_inv) % 1.0) * 2 - 1  # Range [-1, 1]
         local_offset = int(alpha * local_width)
         
@@ -263,48 +344,17 @@ def generate_boundary_focused_samples(sqrt_N: int,
             samples.append(sample)
     
     # Generate uniform samples using golden ratio QMC
+    seen = set(samples)
     for i in range(n_uniform):
         alpha = ((seed + i) * phi_inv) % 1.0
         offset = int(alpha * 2 * window - window)
-        if offset not in samples:  # Avoid duplicates
+        if offset not in seen:  # Avoid duplicates
+            seen.add(offset)
             samples.append(offset)
     
     return samples
 
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
-    """
-    Embed integer n into 7D torus using geodesic mapping.
-    
-    Uses golden ratio powers for quasi-periodic embedding.
-    """
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2
-    
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        coords.append(coord)
-    
-    return coords
-
-
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """
-    Compute Riemannian geodesic distance on 7D torus.
-    """
-    dist_sq = mp.mpf(0)
-    for c1, c2 in zip(p1, p2):
-        diff = abs(c1 - c2)
-        wrap_diff = mp.mpf(1) - diff
-        min_diff = min(diff, wrap_diff)
-        dist_sq += min_diff * min_diff
-    return mp.sqrt(dist_sq)
-
-
 def hash_bounds_factor_search(N: int,
                               k_value: float = 0.35,
                               max_candidates: int = 10000,
@@ -412,6 +462,9 @@ def hash_bounds_factor_search(N: int,
         # Embed N in 7D torus
         N_coords = embed_torus_geodesic(N, k_value)
         
+        # Boundary proximity for every sample in one batch
+        proximity = BoundaryIndex(all_boundaries).proximity_scores(sample_offsets)
+        
         start_time = time.time()
         
         # Score all candidates
@@ -420,7 +473,7 @@ def hash_bounds_factor_search(N: int,
         if verbose:
             print("Phase 1: Scoring candidates...")
         
-        for offset in sample_offsets:
+        for offset, prox in zip(sample_offsets, proximity.tolist()):
             candidate = sqrt_N + offset
             
             # Skip trivial cases
@@ -433,9 +486,6 @@ def hash_bounds_factor_search(N: int,
             cand_coords = embed_torus_geodesic(candidate, k_value)
             geo_dist = riemannian_distance(N_coords, cand_coords)
             
-            # Compute boundary proximity
-            prox = boundary_proximity_score(offset, all_boundaries)
-            
             # Combined score (lower is better for distance, higher for proximity)
             # Negate distance so higher score is better overall
             combined_score = (1.0 - boundary_proximity_weight) * (-float(geo_dist)) + \
@@ -31,6 +31,7 @@ from hash_bounds_sampling import (
     compute_all_boundaries,
     distance_to_nearest_boundary,
     boundary_proximity_score,
+    BoundaryIndex,
     generate_boundary_focused_samples,
     embed_torus_geodesic,
     riemannian_distance,
@@ -193,6 +194,26 @@ class TestBoundaryProximity:
                 at_midpoint = boundary_proximity_score(midpoint, all_bounds)
                 
                 assert at_boundary > at_midpoint, "Proximity should decrease with distance from boundary"
+    
+    def test_boundary_index_matches_linear_scan(self):
+        """Batched searchsorted lookups agree with a brute-force scan."""
+        all_boundaries = compute_all_boundaries(1000000, 50, 10000)
+        all_boundaries[99] = []  # empty boundary list falls back to |offset|
+        index = BoundaryIndex(all_boundaries)
+        offsets = list(range(-12000, 12001, 37))
+        
+        distances = index.distances(offsets)
+        for row, p in enumerate(index.primes):
+            bounds = all_boundaries[p]
+            for col, offset in enumerate(offsets):
+                expected = min((abs(offset - b) for b in bounds), default=abs(offset))
+                assert distances[row, col] == expected
+                assert distance_to_nearest_boundary(offset, bounds) == expected
+        
+        scores = index.proximity_scores(offsets)
+        for col, offset in enumerate(offsets[:50]):
+            assert abs(scores[col] - boundary_proximity_score(offset, all_boundaries)) < 1e-12
+            assert boundary_proximity_score(offset, index) == scores[col]
 
 
 class TestSampling:
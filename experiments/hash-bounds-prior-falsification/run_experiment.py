@@ -40,7 +40,9 @@ from mpmath import mpf
 
 # Add experiment directory to path
 sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from primality import next_prime
 from hash_bounds_predictor import (
     HashBoundsPredictor, 
     run_diagnostic, 
@@ -141,48 +143,6 @@ def generate_balanced_semiprime(bit_target: int, seed: int) -> Tuple[int, int, i
     lo = 2 ** (half_bits - 1)
     hi = 2 ** half_bits
     
-    def is_prime(n: int, k: int = 15) -> bool:
-        """Miller-Rabin primality test."""
-        if n < 2:
-            return False
-        if n == 2 or n == 3:
-            return True
-        if n % 2 == 0:
-            return False
-        
-        # Write n-1 as 2^r × d
-        r, d = 0, n - 1
-        while d % 2 == 0:
-            r += 1
-            d //= 2
-        
-        # Witness loop
-        for _ in range(k):
-            a = random.randrange(2, n - 1)
-            x = pow(a, d, n)
-            
-            if x == 1 or x == n - 1:
-                continue
-                
-            for _ in range(r - 1):
-                x = pow(x, 2, n)
-                if x == n - 1:
-                    break
-            else:
-                return False
-        
-        return True
-    
-    def next_prime(n: int) -> int:
-        """Find next prime >= n."""
-        if n <= 2:
-            return 2
-        if n % 2 == 0:
-            n += 1
-        while not is_prime(n):
-            n += 2
-        return n
-    
     # Generate two primes
     p_candidate = random.randint(lo, hi)
     p = next_prime(p_candidate)
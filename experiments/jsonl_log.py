@@ -0,0 +1,151 @@
+"""
+Buffered Background JSONL Writer
+================================
+
+Run logs for the scan harnesses, kept out of the hot loop.
+
+write() only enqueues the record. A background thread serialises records
+with json.dumps, batches the lines and writes them when either threshold is
+hit: flush_records lines pending, or flush_interval seconds since the last
+write. close() drains the queue; an atexit hook closes writers the caller
+forgot (or never reached because of an exception), so a crashed run still
+leaves a complete log up to the crash.
+
+Paths ending in .gz (or compress=True) are written through stdlib gzip.
+
+Records must not be mutated after write(): serialisation happens later, on
+the writer thread.
+"""
+
+import atexit
+import gzip
+import json
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+_FLUSH = object()
+_CLOSE = object()
+
+
+class BufferedJSONLWriter:
+    """Queue-backed JSONL writer with size/time flush thresholds."""
+
+    def __init__(self, filepath: str,
+                 header: Optional[Dict[str, Any]] = None,
+                 flush_records: int = 1000,
+                 flush_interval: float = 1.0,
+                 compress: Optional[bool] = None):
+        """
+        Args:
+            filepath: Output path (truncated on open)
+            header: Optional record written first (e.g. run parameters)
+            flush_records: Write once this many lines are pending
+            flush_interval: Write at least this often (seconds)
+            compress: gzip output; defaults to filepath.endswith('.gz')
+        """
+        if compress is None:
+            compress = filepath.endswith('.gz')
+        self.filepath = filepath
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self._file = gzip.open(filepath, 'wt') if compress else open(filepath, 'w')
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"jsonl:{filepath}",
+                                        daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        if header is not None:
+            self.write(header)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Enqueue one record (a dict; anything else raises TypeError)."""
+        if self._closed:
+            raise ValueError(f"write to closed log {self.filepath}")
+        if not isinstance(record, dict):
+            raise TypeError(f"JSONL records must be dicts, got {type(record).__name__}")
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        """Block until every record written so far is on disk (no-op once closed)."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        # A close() from another thread may stop the writer before it sees the request
+        while not done.wait(0.1):
+            if not self._thread.is_alive():
+                break
+        self._raise_pending()
+
+    def close(self) -> None:
+        """Drain the queue, write, and close the file. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self._raise_pending()
+
+    def __enter__(self) -> "BufferedJSONLWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self) -> None:
+        lines = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            stop = item is _CLOSE
+            flush_event = item[1] if isinstance(item, tuple) and item[0] is _FLUSH else None
+            if isinstance(item, dict):
+                try:
+                    lines.append(json.dumps(item))
+                except (TypeError, ValueError) as exc:
+                    self._error = exc
+
+            due = (len(lines) >= self.flush_records
+                   or time.monotonic() >= deadline
+                   or flush_event is not None or stop)
+            if due:
+                self._write_lines(lines)
+                lines = []
+                deadline = time.monotonic() + self.flush_interval
+            if flush_event is not None:
+                flush_event.set()
+            if stop:
+                self._file.close()
+                return
+
+    def _write_lines(self, lines) -> None:
+        if not lines:
+            return
+        try:
+            self._file.write('\n'.join(lines) + '\n')
+            self._file.flush()
+        except BaseException as exc:  # surfaced on the caller's next flush/close
+            self._error = exc
+
+
+def read_jsonl(filepath: str) -> Iterator[Dict[str, Any]]:
+    """Iterate records of a (optionally gzipped) JSONL file."""
+    opener = gzip.open if filepath.endswith('.gz') else open
+    with opener(filepath, 'rt') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -23,6 +23,11 @@ from typing import Tuple, Optional, List, Dict
 import time
 from math import log, sqrt, e
 from dataclasses import dataclass, field
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
 
 # Configure high precision
 mp.mp.dps = 50
@@ -95,47 +100,6 @@ def adaptive_precision(N: int) -> int:
     return max(50, bit_length * 4 + 200)
 
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
-    """
-    Embed integer n into a 7D torus using geodesic mapping.
-    
-    Uses golden ratio (φ) and its powers to create quasi-periodic embedding
-    that reveals factorization structure through Riemannian distance minimization.
-    """
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2  # Golden ratio
-    
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        
-        coords.append(coord)
-    
-    return coords
-
-
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """
-    Compute Riemannian geodesic distance on 7D torus.
-    Uses flat torus metric with periodic boundary conditions.
-    """
-    if len(p1) != len(p2):
-        raise ValueError("Points must have same dimension")
-    
-    dist_sq = mp.mpf(0)
-    for c1, c2 in zip(p1, p2):
-        diff = abs(c1 - c2)
-        wrap_diff = mp.mpf(1) - diff
-        min_diff = min(diff, wrap_diff)
-        dist_sq += min_diff * min_diff
-    
-    return mp.sqrt(dist_sq)
-
-
 def compute_score_objective(candidate: int, N: int, N_coords: List[mp.mpf], 
                              k: float) -> Tuple[float, float]:
     """
@@ -10,7 +10,8 @@ References:
 
 import numpy as np
 import mpmath as mp
-from typing import Tuple, Optional
+from mpmath.ctx_mp import MPContext
+from typing import Dict, Tuple, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,11 +31,32 @@ class GVAEmbedding:
         
         Args:
             precision: Decimal precision for mpmath (adaptive: max(precision, bitLength*4+200))
+        
+        Computations use private mpmath contexts (one per precision), never
+        the global mp.mp.dps, so embeddings can be used from several threads.
         """
         self.precision = precision
-        mp.mp.dps = precision
+        self._contexts: Dict[int, MPContext] = {}
         logger.info(f"Initialized GVA embedding with precision={precision}")
     
+    def context(self, n: int) -> MPContext:
+        """
+        mpmath context at the adaptive precision for n.
+        
+        Args:
+            n: Integer the computation is for
+        
+        Returns:
+            Context at max(precision, bitLength*4+200) dps (reused per precision)
+        """
+        precision = max(self.precision, n.bit_length() * 4 + 200)
+        ctx = self._contexts.get(precision)
+        if ctx is None:
+            ctx = mp.mp.clone()
+            ctx.dps = precision
+            ctx = self._contexts.setdefault(precision, ctx)
+        return ctx
+    
     def compute_divisor_count(self, n: int, p: Optional[int] = None, q: Optional[int] = None) -> int:
         """
         Compute the number of divisors d(n).
@@ -98,19 +120,14 @@ class GVAEmbedding:
             Curvature value as mpmath high-precision float
         """
         # Adaptive precision: max(configured, bitLength * 4 + 200)
-        bit_length = n.bit_length()
-        adaptive_precision = max(self.precision, bit_length * 4 + 200)
-        
-        if adaptive_precision != mp.mp.dps:
-            mp.mp.dps = adaptive_precision
-            logger.debug(f"Adjusted precision to {adaptive_precision} for {bit_length}-bit number")
+        ctx = self.context(n)
         
         d_n = self.compute_divisor_count(n, p, q)
         
         # κ(n) = d(n) * ln(n+1) / e²
-        n_mp = mp.mpf(n)
-        e_squared = mp.e ** 2
-        curvature = mp.mpf(d_n) * mp.log(n_mp + 1) / e_squared
+        n_mp = ctx.mpf(n)
+        e_squared = ctx.e ** 2
+        curvature = ctx.mpf(d_n) * ctx.log(n_mp + 1) / e_squared
         
         logger.debug(f"κ({n}) = {d_n} * ln({n}+1) / e² = {curvature}")
         
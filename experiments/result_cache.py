@@ -0,0 +1,185 @@
+"""
+Experiment Result Cache
+=======================
+
+Skip units of work an experiment has already computed.
+
+cached_unit wraps one unit of an experiment (one configuration of a
+sweep, one shell, one semiprime) so its result is stored in the table
+cache (table_cache.load_table / store_table) under a key built from:
+
+- the experiment name and the unit's function name,
+- the unit's arguments (bound to the signature, defaults applied), which
+  include N wherever the unit takes it,
+- a code hash over the sources the result depends on:
+    - functions (the unit itself always included): their source text, the
+      source of the same-module functions they call, and the values of the
+      plain module constants read (ints, floats, strings, lists, ...), so
+      editing the unit, a helper or a constant it uses gives a new key
+      while editing the sweep around it does not;
+    - modules and file paths (engines, data files): the whole file.
+- params: extra key values for state the code hash cannot see (e.g. a
+  working precision set at import).
+
+A rerun with one more k value or shell therefore computes one new unit and
+loads the rest, and a changed engine never returns stale results. Arguments
+that do not affect the result (verbosity, metric accumulators) are left out
+of the key with ignore=. A cache hit returns the stored result without
+running the unit, so its printed output is skipped.
+
+Results are pickled, so any value a unit returns can be cached. Location
+and switches are table_cache's: $GEOFAC_TABLE_CACHE (empty string disables
+caching), else $XDG_CACHE_HOME/geofac/tables or ~/.cache/geofac/tables.
+
+Usage from an experiment subdirectory:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from result_cache import cached_unit
+
+    @cached_unit('shell-geometry-scan-01', sources=[mandelbrot_scoring, kernels],
+                 ignore=('verbose',))
+    def scan_shell(N, shell_index, R_j, R_j_plus_1, budget, verbose=True):
+        ...
+"""
+
+import dataclasses
+import functools
+import hashlib
+import inspect
+import os
+import types
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+from table_cache import load_table, store_table
+
+CACHE_KIND = 'result'
+
+_MISSING = object()
+_CONSTANT_TYPES = (bool, int, float, complex, str, bytes, tuple, list, dict, frozenset, set)
+
+
+def _referenced_names(code: types.CodeType) -> set:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _referenced_names(const)
+    return names
+
+
+def _function_fingerprint(func: Callable) -> bytes:
+    """
+    Source text of a function and of the functions of its own module it
+    calls (transitively), plus the plain module constants they read.
+    """
+    func = inspect.unwrap(func)
+    namespace = func.__globals__
+    seen, pending, constants = {}, [func], {}
+    while pending:
+        current = pending.pop()
+        if current.__qualname__ in seen:
+            continue
+        seen[current.__qualname__] = inspect.getsource(current)
+        for name in _referenced_names(current.__code__):
+            value = namespace.get(name)
+            if isinstance(value, _CONSTANT_TYPES):
+                constants[name] = repr(value)
+            elif inspect.isfunction(value):
+                value = inspect.unwrap(value)
+                if value.__module__ == func.__module__:
+                    pending.append(value)
+    return repr((sorted(seen.items()), sorted(constants.items()))).encode('utf-8')
+
+
+def _source_bytes(source: Any) -> bytes:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    if inspect.ismodule(source):
+        with open(inspect.getsourcefile(source), 'rb') as f:
+            return f.read()
+    if callable(source) and hasattr(inspect.unwrap(source), '__code__'):
+        return _function_fingerprint(source)
+    raise ValueError(f"Cannot hash source {source!r}; expected a function, module or path")
+
+
+def source_hash(sources: Iterable[Any]) -> str:
+    """
+    SHA-256 over the given sources (order does not matter).
+
+    Args:
+        sources: Functions (source and constants read), modules or file
+            paths (whole file)
+
+    Returns:
+        Hex digest
+    """
+    digests = sorted(hashlib.sha256(_source_bytes(s)).digest() for s in sources)
+    return hashlib.sha256(b''.join(digests)).hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    """Argument as a JSON key value; dataclasses (e.g. parameter configs) become dicts."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {'__dataclass__': type(value).__qualname__,
+                **_canonical(dataclasses.asdict(value))}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def cached_unit(experiment: str, sources: Sequence[Any] = (),
+                ignore: Sequence[str] = (),
+                params: Optional[Dict[str, Any]] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator caching a unit of work by code hash and arguments.
+
+    The code hash is taken at the first call, when the module's constants
+    are all defined. The wrapped function gains hits / misses counters,
+    last_hit (whether the latest call was served from the cache, e.g. to
+    flag wall-clock timings measured by another run) and the undecorated
+    function as .compute.
+
+    Args:
+        experiment: Experiment name (part of the key)
+        sources: Further functions, modules or files the result depends on
+        ignore: Argument names left out of the key
+        params: Extra key values
+
+    Returns:
+        Decorator
+    """
+    def decorate(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if wrapper.code is None:
+                wrapper.code = source_hash([func, *sources])
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key: Dict[str, Any] = {
+                'experiment': experiment, 'unit': func.__qualname__, 'code': wrapper.code,
+                'params': _canonical(params or {}),
+                'args': {name: _canonical(value) for name, value in bound.arguments.items()
+                         if name not in ignore},
+            }
+            result = load_table(CACHE_KIND, key, _MISSING)
+            wrapper.last_hit = result is not _MISSING
+            if wrapper.last_hit:
+                wrapper.hits += 1
+                return result
+            wrapper.misses += 1
+            result = func(*args, **kwargs)
+            store_table(CACHE_KIND, key, result)
+            return result
+
+        wrapper.code = None
+        wrapper.hits = 0
+        wrapper.misses = 0
+        wrapper.last_hit = False
+        wrapper.compute = func
+        return wrapper
+
+    return decorate
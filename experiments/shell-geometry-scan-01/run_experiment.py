@@ -13,8 +13,15 @@ Key features:
 - Deterministic execution with comprehensive metrics
 
 Validation: 127-bit CHALLENGE_127 whitelist only
+
+Shell results are cached (experiments/result_cache.py) by shell parameters,
+the source of the scan functions and constants they use, the Mandelbrot
+scorer and the kernels, so raising J_MAX only scans the new shells. Set
+GEOFAC_TABLE_CACHE="" to rescan everything.
 """
 
+import os
+import sys
 import mpmath as mp
 from typing import Tuple, Optional, List, Dict
 import time
@@ -22,6 +29,14 @@ import json
 from math import log, e
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+import mandelbrot_scoring
+from mandelbrot_scoring import score_segments
+from geofac import kernels
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
+from result_cache import cached_unit
+
 # Configure high precision
 mp.mp.dps = 50
 
@@ -64,30 +79,6 @@ def adaptive_precision(N: int) -> int:
     return max(50, bit_length * 4 + 200)
 
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
-    """Embed integer n into 7D torus using golden ratio geodesic mapping."""
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        coords.append(coord)
-    return coords
-
-
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """Compute Riemannian geodesic distance on 7D torus with periodic boundaries."""
-    dist_sq = mp.mpf(0)
-    for x, y in zip(p1, p2):
-        diff = abs(x - y)
-        torus_diff = min(diff, 1 - diff)
-        dist_sq += torus_diff ** 2
-    return mp.sqrt(dist_sq)
-
-
 def score_segment_with_mandelbrot(segment_start: int, segment_end: int, 
                                    N: int, sqrt_N: int,
                                    max_iterations: int = 100,
@@ -299,6 +290,8 @@ def gva_sweep_segment(N: int, sqrt_N: int, segment_start: int, segment_end: int,
     return (None, None, max_amplitude, k_at_max) if max_amplitude > 0 else None
 
 
+@cached_unit('shell-geometry-scan-01', sources=[mandelbrot_scoring, kernels],
+             ignore=('metrics', 'verbose'), params={'dps': mp.mp.dps})
 def scan_shell(N: int, sqrt_N: int, shell_index: int, R_j: int, R_j_plus_1: int,
                budget: int, metrics: Dict, verbose: bool = True) -> Dict:
     """
@@ -331,12 +324,12 @@ def scan_shell(N: int, sqrt_N: int, shell_index: int, R_j: int, R_j_plus_1: int,
     if verbose:
         print(f"Created {len(segments)} segments")
     
-    # Score segments with Mandelbrot
-    segment_scores = []
-    for seg_start, seg_end in segments:
-        score = score_segment_with_mandelbrot(seg_start, seg_end, N, sqrt_N)
-        segment_scores.append((score, seg_start, seg_end))
-        shell_metrics['segments_scored'] += 1
+    # Score segments with Mandelbrot (same scores as score_segment_with_mandelbrot)
+    kappa = 2.0 * log(N + 1) / E_SQUARED
+    scores = score_segments(segments, N, sqrt_N, kappa).tolist()
+    segment_scores = [(score, seg_start, seg_end)
+                      for score, (seg_start, seg_end) in zip(scores, segments)]
+    shell_metrics['segments_scored'] += len(segments)
     
     if verbose:
         print(f"Scored {len(segment_scores)} segments")
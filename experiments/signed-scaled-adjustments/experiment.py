@@ -29,6 +29,8 @@ Reproducibility:
 - All parameters logged with timestamps
 """
 
+import os
+import sys
 import mpmath as mp
 from mpmath import mpf, sqrt, ceil, floor
 import random
@@ -36,6 +38,9 @@ from typing import List, Tuple, Dict, Any, Optional
 from datetime import datetime
 import json
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from primality import is_prime
+
 # Set precision
 mp.dps = 50
 
@@ -43,39 +48,6 @@ mp.dps = 50
 PHI = (1 + sqrt(5)) / 2
 
 
-def is_prime_miller_rabin(n: int, k: int = 10) -> bool:
-    """Miller-Rabin primality test for generating primes."""
-    if n < 2:
-        return False
-    if n == 2 or n == 3:
-        return True
-    if n % 2 == 0:
-        return False
-
-    # Write n-1 as 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-
-    # Witness loop
-    for _ in range(k):
-        a = random.randint(2, n - 2)
-        x = pow(a, d, n)
-
-        if x == 1 or x == n - 1:
-            continue
-
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-
-    return True
-
-
 def generate_close_prime_pair(
     base: int, min_gap: int, max_gap: int, seed: int
 ) -> Tuple[int, int]:
@@ -95,13 +67,13 @@ def generate_close_prime_pair(
 
     # Find first prime near base
     p = base + random.randint(0, max_gap)
-    while not is_prime_miller_rabin(p):
+    while not is_prime(p):
         p += 1
 
     # Find second prime with specified gap range from p
     gap = random.randint(min_gap, max_gap)
     q = p + gap
-    while not is_prime_miller_rabin(q):
+    while not is_prime(q):
         q += 2  # Skip evens
         if q - p > max_gap * 3:
             # Start over if we've gone too far
@@ -0,0 +1,167 @@
+"""
+Content-Addressed Table Cache
+=============================
+
+Disk cache for precomputed tables that depend only on a few parameters
+(seed primes, working precision, window), e.g. the frac(√p) roots and
+boundary centres of the hash-bounds experiments.
+
+A table is addressed by the SHA-256 of its canonical JSON key: the kind,
+its params, the file-format version and a version the caller passes for
+its compute code. Bump the caller's version whenever the code computing a
+table changes, so an edited compute function never returns a table built
+by the old one.
+
+Each table is one compact binary file: a magic header followed by
+zlib-compressed pickle of (key, value). mpf values round-trip exactly;
+NumPy arrays are stored as raw buffers. A file whose embedded key does not
+match, or that fails to decode, is treated as a miss and rewritten.
+
+Location: $GEOFAC_TABLE_CACHE, else $XDG_CACHE_HOME/geofac/tables, else
+~/.cache/geofac/tables. Set GEOFAC_TABLE_CACHE to an empty string to
+disable caching. Writes are atomic (temp file + os.replace); an unwritable
+cache directory only disables the write. Tables that grow between runs use
+load_table / store_table directly; store_table replaces the previous file.
+
+The cache is local: only load directories you (or your runs) wrote.
+
+Usage from an experiment subdirectory:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from table_cache import cached_table
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+CACHE_ENV = 'GEOFAC_TABLE_CACHE'
+# Part of every key and of the file header; bump when the file layout changes
+FORMAT_VERSION = 1
+
+_MAGIC = b'GEOFAC-TABLE-%d\n' % FORMAT_VERSION
+_MISSING = object()
+
+
+def cache_dir() -> Optional[str]:
+    """Cache directory, or None if caching is disabled."""
+    configured = os.environ.get(CACHE_ENV)
+    if configured is not None:
+        return configured or None
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'geofac', 'tables')
+
+
+def table_key(kind: str, params: Dict[str, Any], version: int = 1) -> str:
+    """SHA-256 hex digest of the canonical JSON of kind, params and versions."""
+    canonical = json.dumps({'kind': kind, 'format': FORMAT_VERSION, 'version': version,
+                            'params': params},
+                           sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def table_path(kind: str, params: Dict[str, Any],
+               directory: Optional[str] = None, version: int = 1) -> Optional[str]:
+    """File that holds the table for (kind, params, version), or None if disabled."""
+    directory = directory if directory is not None else cache_dir()
+    if directory is None:
+        return None
+    return os.path.join(directory, f"{kind}-{table_key(kind, params, version)[:32]}.bin")
+
+
+def _load(path: str, key: str) -> Any:
+    try:
+        with open(path, 'rb') as f:
+            blob = f.read()
+    except OSError:
+        return _MISSING
+    if not blob.startswith(_MAGIC):
+        return _MISSING
+    try:
+        stored_key, value = pickle.loads(zlib.decompress(blob[len(_MAGIC):]))
+    except Exception:  # truncated or corrupt file: recompute
+        return _MISSING
+    return value if stored_key == key else _MISSING
+
+
+def _store(path: str, key: str, value: Any) -> None:
+    blob = _MAGIC + zlib.compress(pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL))
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def load_table(kind: str, params: Dict[str, Any], default: Any = None,
+               version: int = 1) -> Any:
+    """
+    The stored table for (kind, params), or default on a miss.
+
+    Args:
+        kind: Table family
+        params: Every input the table depends on
+        default: Returned when the table is missing, corrupt or caching is off
+        version: Version of the code computing the table
+
+    Returns:
+        The cached table or default
+    """
+    path = table_path(kind, params, version=version)
+    if path is None:
+        return default
+    value = _load(path, table_key(kind, params, version))
+    return default if value is _MISSING else value
+
+
+def store_table(kind: str, params: Dict[str, Any], value: Any,
+                version: int = 1) -> None:
+    """
+    Store (or replace) the table for (kind, params); a no-op if caching is off.
+
+    Args:
+        kind: Table family
+        params: Every input the table depends on
+        value: Table to store
+        version: Version of the code computing the table
+    """
+    path = table_path(kind, params, version=version)
+    if path is not None:
+        _store(path, table_key(kind, params, version), value)
+
+
+def cached_table(kind: str, params: Dict[str, Any], compute: Callable[[], Any],
+                 version: int = 1) -> Any:
+    """
+    Load the table for (kind, params), computing and storing it on a miss.
+
+    Only cache tables that are reused across inputs (seed primes, precision,
+    window); a table per N is cheaper to recompute than to hash, pickle and
+    write, and fills the cache directory without bound.
+
+    Args:
+        kind: Table family (part of the key and the file name)
+        params: Every input the table depends on (JSON-serialisable)
+        compute: Zero-argument function producing the table
+        version: Version of compute; bump it when compute changes
+
+    Returns:
+        The cached or freshly computed table
+    """
+    value = load_table(kind, params, _MISSING, version)
+    if value is _MISSING:
+        value = compute()
+        store_table(kind, params, value, version)
+    return value
@@ -34,20 +34,30 @@ Constraints:
 
 import time
 import json
+import os
 import sys
 from datetime import datetime
 from math import log2
 from typing import List, Tuple, Optional, Dict, Any
 
+import numpy as np
+
 try:
     import mpmath as mp
 except ImportError:
     print("ERROR: mpmath required. Install with: pip install mpmath")
     sys.exit(1)
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tau_lattice import TauEvaluator, TauLattice, richardson_third_derivative_float
+
 # Constant to prevent division by zero in confidence calculation
 MIN_ERROR_THRESHOLD = 1e-30
 
+# Grid points whose float |τ'''| exceeds this fraction of the spike threshold
+# are re-evaluated at full precision (float and mp τ''' agree to ~1e-10)
+SPIKE_SCREEN_MARGIN = 0.5
+
 # Sobol sequence for QMC sampling
 try:
     from scipy.stats.qmc import Sobol
@@ -78,6 +88,9 @@ def compute_tau(N: int, b: mp.mpf, phi: mp.mpf) -> mp.mpf:
     
     See PR #131 for original design. τ measures geometric resonance
     at a given scale, combining modular resonance and phase alignment.
+    
+    Single-point reference; the profile sweeps below evaluate τ with
+    tau_lattice.TauEvaluator.
     """
     scale = mp.power(2, b)
     sqrt_N = mp.sqrt(N)
@@ -122,33 +135,8 @@ def richardson_extrapolation_third_derivative(
     Returns:
         (refined_derivative, estimated_error)
     """
-    h = h_base
-    h2 = h / 2
-    
-    # Coarse estimate with step h
-    tau_p2h = compute_tau(N, b + 2*h, phi)
-    tau_ph = compute_tau(N, b + h, phi)
-    tau_mh = compute_tau(N, b - h, phi)
-    tau_m2h = compute_tau(N, b - 2*h, phi)
-    
-    D_h = (tau_p2h - 2*tau_ph + 2*tau_mh - tau_m2h) / (2 * h**3)
-    
-    # Fine estimate with step h/2
-    tau_p2h2 = compute_tau(N, b + 2*h2, phi)
-    tau_ph2 = compute_tau(N, b + h2, phi)
-    tau_mh2 = compute_tau(N, b - h2, phi)
-    tau_m2h2 = compute_tau(N, b - 2*h2, phi)
-    
-    D_h2 = (tau_p2h2 - 2*tau_ph2 + 2*tau_mh2 - tau_m2h2) / (2 * h2**3)
-    
-    # Richardson extrapolation: eliminate O(h²) error
-    # Coefficient = (h/(h/2))² = 2² = 4 for third derivative with O(h²) error
-    D_refined = (4 * D_h2 - D_h) / 3
-    
-    # Error estimate from difference between estimates
-    error_estimate = abs(D_refined - D_h2)
-    
-    return D_refined, error_estimate
+    lattice = TauLattice(TauEvaluator(N, phi), b, h_base)
+    return lattice.richardson_third_derivative(0)
 
 
 def compute_tau_profile_richardson(
@@ -156,30 +144,50 @@ def compute_tau_profile_richardson(
     b_start: float,
     b_end: float,
     num_points: int,
-    phi: mp.mpf
+    phi: mp.mpf,
+    threshold_factor: float = 2.0
 ) -> Tuple[List[float], List[mp.mpf], List[mp.mpf], List[mp.mpf]]:
     """
     Compute τ and τ''' across [b_start, b_end] using Richardson extrapolation.
     
+    With h equal to the grid spacing, every Richardson stencil point lies
+    on the half-step lattice. The whole lattice is swept in float64 first
+    (TauEvaluator.evaluate_float); only grid points whose float |τ'''|
+    exceeds SPIKE_SCREEN_MARGIN × the spike threshold are re-evaluated at
+    the working precision, once per lattice node.
+    
+    Args:
+        threshold_factor: Spike threshold factor, as for find_refined_spike
+    
     Returns:
-        (b_values, tau_values, tau_triple_prime, error_estimates)
+        (b_values, tau_values, tau_triple_prime, error_estimates); points
+        below the screen keep the float sweep's values
     """
     h = mp.mpf(b_end - b_start) / (num_points - 1)
     
+    evaluator = TauEvaluator(N, phi)
+    lattice = TauLattice(evaluator, mp.mpf(b_start), h)
+    
+    # Float sweep of every node the stencils touch (-4 .. 2(n - 1) + 4)
+    tau_nodes = evaluator.evaluate_float(
+        [lattice.point(j) for j in range(-4, 2 * num_points + 3)])
+    d3_float, err_float = richardson_third_derivative_float(tau_nodes, float(h))
+    screen = SPIKE_SCREEN_MARGIN * threshold_factor * float(np.mean(np.abs(d3_float)))
+    
     b_values = []
     tau_values = []
     tau_triple_prime = []
     error_estimates = []
     
     for i in range(num_points):
-        b = mp.mpf(b_start) + i * h
-        b_values.append(float(b))
-        
-        tau = compute_tau(N, b, phi)
-        tau_values.append(tau)
-        
-        # Richardson extrapolation for third derivative
-        d3, err = richardson_extrapolation_third_derivative(N, b, phi, h)
+        b_values.append(float(lattice.point(2 * i)))
+        if abs(d3_float[i]) > screen:
+            # Candidate spike: Richardson extrapolation at full precision
+            tau_values.append(lattice(2 * i))
+            d3, err = lattice.richardson_third_derivative(2 * i)
+        else:
+            tau_values.append(mp.mpf(tau_nodes[2 * i + 4]))
+            d3, err = mp.mpf(d3_float[i]), mp.mpf(err_float[i])
         tau_triple_prime.append(d3)
         error_estimates.append(err)
     
@@ -391,7 +399,8 @@ def run_refinement_experiment(
     phi = (1 + mp.sqrt(5)) / 2
     
     b_values, tau_values, tau_triple_prime, error_estimates = \
-        compute_tau_profile_richardson(N, b_start, b_end, num_scan_points, phi)
+        compute_tau_profile_richardson(N, b_start, b_end, num_scan_points, phi,
+                                       spike_threshold_factor)
     
     if verbose:
         print(f"  Computed {len(b_values)} τ values")
@@ -0,0 +1,204 @@
+"""
+Memoised τ Lattice
+==================
+
+Shared finite-difference engine for the τ / τ''' scans
+(tau-spike-refinement-127bit, unbalanced-left-edge-127bit,
+gva-tau-hybrid-127bit).
+
+Every stencil those experiments use (central τ', τ'', the 5-point τ''' at
+step h and at step h/2, Richardson's (4·D_{h/2} − D_h)/3) only touches the
+points origin + j·h/2. TauLattice evaluates τ once per half-step node and
+assembles all stencils from that cache, so a profile of n grid points costs
+~2n + 5 evaluations instead of 9n (1 for τ(b) plus 8 for Richardson).
+
+Cached values are keyed by node index and the mpmath working precision, so a
+change of mp.dps never reuses a value computed at another precision.
+
+Node positions are origin + j·half_step computed in the type of origin: pass
+a Python float to reproduce a float grid bit for bit, or an mpf for a
+high-precision grid.
+
+TauEvaluator is the log-folded geometric τ(b) of those experiments with the
+per-N constants (√N, log √N, ln 2, φ, π) hoisted out of the call:
+
+    τ(b) = log(1 + cos²(π·frac(2^b·φ)) · exp(−|b·ln2 − log √N| / 2))
+
+evaluate_float is its float64 fast path for whole-profile sweeps; only the
+phase reduction frac(2^b·φ) needs more than 53 bits, and it is done at
+b + 64 bits instead of the full working precision.
+richardson_third_derivative_float applies the lattice's Richardson stencil
+to such a float profile, so a sweep can screen every grid point in float
+and re-evaluate only the candidate spikes on a TauLattice.
+
+Usage from an experiment subdirectory:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from tau_lattice import TauLattice
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import mpmath as mp
+import numpy as np
+
+
+class TauLattice:
+    """τ on the lattice origin + j·half_step, evaluated once per node."""
+
+    def __init__(self, tau: Callable[[Any], mp.mpf], origin, h):
+        """
+        Args:
+            tau: τ(b) for a single scale parameter
+            origin: Position of node 0 (float or mpf)
+            h: Grid spacing; nodes are h/2 apart
+        """
+        self.tau = tau
+        self.origin = origin
+        self.h = h
+        self.half_step = h / 2
+        self.evaluations = 0
+        self._cache: Dict[Tuple[int, int], mp.mpf] = {}
+
+    def point(self, j: int):
+        """Scale parameter b at half-step node j."""
+        return self.origin + j * self.half_step
+
+    def __call__(self, j: int) -> mp.mpf:
+        """τ at half-step node j (cached at the working precision)."""
+        key = (j, mp.mp.prec)
+        value = self._cache.get(key)
+        if value is None:
+            value = self.tau(self.point(j))
+            self._cache[key] = value
+            self.evaluations += 1
+        return value
+
+    def first_derivative(self, j: int) -> mp.mpf:
+        """τ'(b_j) ≈ (τ(b+h) − τ(b−h)) / 2h."""
+        return (self(j + 2) - self(j - 2)) / (2 * self.h)
+
+    def second_derivative(self, j: int) -> mp.mpf:
+        """τ''(b_j) ≈ (τ(b+h) − 2τ(b) + τ(b−h)) / h²."""
+        return (self(j + 2) - 2 * self(j) + self(j - 2)) / (self.h ** 2)
+
+    def third_derivative(self, j: int, half_steps: int = 2) -> mp.mpf:
+        """
+        τ'''(b_j) ≈ (τ(b+2s) − 2τ(b+s) + 2τ(b−s) − τ(b−2s)) / 2s³.
+
+        Args:
+            j: Node index
+            half_steps: Stencil step s in units of h/2 (2 → h, 1 → h/2)
+        """
+        s = half_steps
+        step = s * self.half_step
+        return (self(j + 2 * s) - 2 * self(j + s)
+                + 2 * self(j - s) - self(j - 2 * s)) / (2 * step ** 3)
+
+    def richardson_third_derivative(self, j: int) -> Tuple[mp.mpf, mp.mpf]:
+        """
+        Richardson-extrapolated τ'''(b_j) from steps h and h/2.
+
+        Returns:
+            (refined_derivative, |refined − D_{h/2}|)
+        """
+        coarse = self.third_derivative(j, 2)
+        fine = self.third_derivative(j, 1)
+        refined = (4 * fine - coarse) / 3
+        return refined, abs(refined - fine)
+
+
+class TauEvaluator:
+    """τ(b) for a fixed N with the per-N constants precomputed."""
+
+    def __init__(self, N: int, phi: Optional[mp.mpf] = None):
+        """
+        Constants are computed at the current mpmath working precision;
+        construct the evaluator inside the precision context it is used in.
+
+        Args:
+            N: Target semiprime
+            phi: Golden ratio (computed if omitted)
+        """
+        self.N = N
+        self.prec = mp.mp.prec
+        self.phi = phi if phi is not None else (1 + mp.sqrt(5)) / 2
+        self.sqrt_N = mp.sqrt(N)
+        self.log_sqrt_N = mp.log(self.sqrt_N)
+        self.ln2 = mp.log(2)
+        self.pi = +mp.pi
+        self._log_sqrt_N_float = float(self.log_sqrt_N)
+
+    def __call__(self, b) -> mp.mpf:
+        """τ(b) at the working precision."""
+        b = mp.mpf(b)
+        if b < 0:  # scale = 2^b < 1
+            return mp.mpf(0)
+        b_ln2 = b * self.ln2
+        phase = mp.frac(mp.exp(b_ln2) * self.phi)
+        phase_alignment = mp.cos(self.pi * phase) ** 2
+        decay = mp.exp(-abs(b_ln2 - self.log_sqrt_N) / 2)
+        return mp.log(1 + phase_alignment * decay)
+
+    def evaluate(self, b_values: Iterable) -> List[mp.mpf]:
+        """τ at every b, at the working precision."""
+        return [self(b) for b in b_values]
+
+    def evaluate_float(self, b_values: Iterable) -> np.ndarray:
+        """
+        float64 τ profile.
+
+        Accurate to float64 rounding: the phase frac(2^b·φ) is reduced at
+        max(b) + 64 bits, everything else is vectorised NumPy. The phase is
+        reduced from the values as given, so pass mpf points (e.g.
+        TauLattice.point) to evaluate a high-precision grid: near b = 64
+        one float ulp of b moves the phase by thousands of turns.
+
+        Args:
+            b_values: Scale parameters (floats or mpf)
+
+        Returns:
+            float64 array aligned with b_values
+        """
+        exact = b_values if isinstance(b_values, np.ndarray) else list(b_values)
+        b = np.array([float(x) for x in exact] if isinstance(exact, list) else exact,
+                     dtype=np.float64)
+        phase = np.zeros(b.shape)
+        positive = b >= 0
+        if positive.any():
+            with mp.workprec(int(np.ceil(b[positive].max())) + 64):
+                ln2 = mp.log(2)
+                phi = +self.phi if self.prec >= mp.mp.prec else (1 + mp.sqrt(5)) / 2
+                phase[positive] = [float(mp.frac(mp.exp(mp.mpf(exact[i]) * ln2) * phi))
+                                   for i in np.flatnonzero(positive)]
+
+        decay = np.exp(-np.abs(b * np.log(2.0) - self._log_sqrt_N_float) / 2)
+        tau = np.log1p(np.cos(np.pi * phase) ** 2 * decay)
+        return np.where(positive, tau, 0.0)
+
+
+def richardson_third_derivative_float(tau_nodes: np.ndarray,
+                                      h: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    TauLattice.richardson_third_derivative over a float τ profile.
+
+    tau_nodes[m] is τ at half-step node m − 4, so the stencils of the grid
+    points at nodes 0, 2, ..., 2(n − 1) need len(tau_nodes) = 2n + 7.
+
+    Args:
+        tau_nodes: float τ at consecutive half-step nodes
+        h: Grid spacing
+
+    Returns:
+        (refined_derivative, |refined − D_{h/2}|), one entry per grid point
+    """
+    t = np.asarray(tau_nodes, dtype=np.float64)
+    n = (len(t) - 7) // 2
+
+    def at(offset):
+        return t[4 + offset:4 + offset + 2 * n - 1:2]
+
+    coarse = (at(4) - 2 * at(2) + 2 * at(-2) - at(-4)) / (2 * h ** 3)
+    fine = (at(2) - 2 * at(1) + 2 * at(-1) - at(-2)) / (2 * (h / 2) ** 3)
+    refined = (4 * fine - coarse) / 3
+    return refined, np.abs(refined - fine)
@@ -11,7 +11,24 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from theil_sen_estimator import theil_sen, ols_regression, evaluate_fit
+from itertools import combinations
+
+import numpy as np
+
+import theil_sen_estimator
+from theil_sen_estimator import theil_sen, ols_regression, evaluate_fit, OnlineTheilSen
+
+
+def brute_force_theil_sen(x, y):
+    """Reference: sort every pairwise slope."""
+    slopes = sorted((y[j] - y[i]) / (x[j] - x[i])
+                    for i, j in combinations(range(len(x)), 2) if abs(x[j] - x[i]) > 1e-10)
+    n = len(slopes)
+    m = (slopes[n // 2 - 1] + slopes[n // 2]) / 2 if n % 2 == 0 else slopes[n // 2]
+    intercepts = sorted(y[i] - m * x[i] for i in range(len(x)))
+    n = len(intercepts)
+    b = (intercepts[n // 2 - 1] + intercepts[n // 2]) / 2 if n % 2 == 0 else intercepts[n // 2]
+    return m, b
 
 
 def test_perfect_line():
@@ -106,6 +123,89 @@ def test_insufficient_data():
     print("✓ Error handling test passed")
 
 
+def test_slope_selection_matches_brute_force():
+    """Selection path gives the brute-force result, with tied and repeated x"""
+    original = theil_sen_estimator.PAIRWISE_MAX_POINTS
+    theil_sen_estimator.PAIRWISE_MAX_POINTS = 4
+    try:
+        rng = np.random.default_rng(7)
+        for trial in range(60):
+            n = int(rng.integers(5, 150))
+            if trial % 2:
+                x = rng.integers(30, 60, n).astype(float)  # bit lengths, many ties
+            else:
+                x = rng.normal(size=n)
+            y = 0.005 * x + 0.3 + 0.01 * rng.standard_cauchy(n)
+            if trial % 3 == 0:
+                y = np.round(y, 2)  # repeated slopes
+            expected = brute_force_theil_sen(x.tolist(), y.tolist())
+            assert theil_sen(x.tolist(), y.tolist()) == expected, f"trial {trial}"
+    finally:
+        theil_sen_estimator.PAIRWISE_MAX_POINTS = original
+
+    print("✓ Slope selection test passed")
+
+
+def test_slope_selection_ties():
+    """Selection path handles near-tied x and blocks of equal slopes"""
+    original = theil_sen_estimator.PAIRWISE_MAX_POINTS
+    theil_sen_estimator.PAIRWISE_MAX_POINTS = 4
+    try:
+        rng = np.random.default_rng(5)
+        for trial in range(20):
+            n = int(rng.integers(5, 150))
+            x = rng.normal(size=n)
+            near = rng.integers(0, n, n // 3)
+            x[near] = x[rng.integers(0, n, n // 3)] + rng.uniform(-1e-10, 1e-10, n // 3)
+            y = x + rng.normal(size=n)
+            assert theil_sen(x, y) == brute_force_theil_sen(x.tolist(), y.tolist()), f"trial {trial}"
+    finally:
+        theil_sen_estimator.PAIRWISE_MAX_POINTS = original
+
+    # Integer data: most slopes are exactly 0, below one ulp of resolution
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 50, 3135).astype(float)
+    y = rng.integers(0, 5, 3135).astype(float)
+    assert len(x) > theil_sen_estimator.PAIRWISE_MAX_POINTS
+    expected = theil_sen_estimator._median(theil_sen_estimator._pairwise_slopes(x, y))
+    assert theil_sen(x, y)[0] == expected == 0.0
+
+    print("✓ Slope selection ties test passed")
+
+
+def test_online_matches_batch():
+    """OnlineTheilSen equals a batch refit after every observation, on both paths"""
+    original = theil_sen_estimator.PAIRWISE_MAX_POINTS
+    theil_sen_estimator.PAIRWISE_MAX_POINTS = 30
+    try:
+        rng = np.random.default_rng(11)
+        online = OnlineTheilSen([40.0, 41.0], [0.5, 0.51])
+        x, y = [40.0, 41.0], [0.5, 0.51]
+        for _ in range(60):
+            xi = float(rng.integers(30, 80))
+            yi = float(0.3 + 0.005 * xi + 0.01 * rng.standard_cauchy())
+            online.add(xi, yi)
+            x.append(xi)
+            y.append(yi)
+            assert online.fit() == brute_force_theil_sen(x, y)
+        assert len(online) == 62
+    finally:
+        theil_sen_estimator.PAIRWISE_MAX_POINTS = original
+
+    # NumPy arrays are accepted like lists, as by theil_sen
+    x_arr = np.arange(5.0)
+    y_arr = 2.0 * x_arr + 1.0
+    assert OnlineTheilSen(x_arr, y_arr).fit() == theil_sen(x_arr, y_arr) == (2.0, 1.0)
+    
+    try:
+        OnlineTheilSen([1.0, 1.0], [2.0, 3.0]).fit()
+        assert False, "Should raise ValueError for identical x"
+    except ValueError as e:
+        assert "identical" in str(e).lower()
+
+    print("✓ Online estimator test passed")
+
+
 def run_all_tests():
     """Run all unit tests"""
     print("\n=== Running Theil-Sen Unit Tests ===\n")
@@ -115,6 +215,9 @@ def run_all_tests():
     test_edge_cases()
     test_evaluate_fit()
     test_insufficient_data()
+    test_slope_selection_matches_brute_force()
+    test_slope_selection_ties()
+    test_online_matches_batch()
     
     print("\n=== All Tests Passed ===\n")
 
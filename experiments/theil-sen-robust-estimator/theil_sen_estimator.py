@@ -5,14 +5,267 @@ Theil-Sen Robust Estimator Implementation
 A non-parametric robust regression method that uses the median of pairwise slopes.
 Resistant to outliers and doesn't assume Gaussian errors.
 
+Computation:
+- n ≤ PAIRWISE_MAX_POINTS: all pairwise slopes in NumPy, median by partition.
+- Larger n: slope selection. The number of pairwise slopes ≤ t equals the
+  number of inversions of the points ordered by x, re-ranked by y − t·x,
+  so a rank query is a sort plus a merge count instead of O(n²) slopes. A
+  sampled bracket around the median rank is narrowed by bisection until it
+  holds O(n) slopes, which are then listed exactly by insertion-sorting
+  from the bracket's lower ranking to its upper. Pairs with near-tied x
+  are enumerated once and taken out of every count.
+- OnlineTheilSen absorbs points one at a time: it merges each new point's n
+  slopes into a sorted array while that fits, and beyond that re-selects the
+  median warm-started from the previous slope.
+
 References:
 - Theil, H. (1950). A rank-invariant method of linear and polynomial regression analysis.
 - Sen, P. K. (1968). Estimates of the regression coefficient based on Kendall's tau.
+- Dillencourt, M. B., Mount, D. M., Netanyahu, N. S. (1992). A randomized
+  algorithm for slope selection.
 """
 
-from itertools import combinations
 from typing import List, Tuple, Optional
 
+import numpy as np
+
+# Pairs whose x values differ by no more than this are skipped (vertical).
+X_TIE_TOLERANCE = 1e-10
+
+# Up to this many points every pairwise slope is materialised.
+PAIRWISE_MAX_POINTS = 2000
+
+# Slopes sampled to bracket the median rank before selection.
+_BRACKET_SAMPLES = 4096
+
+
+def _median(values: np.ndarray) -> float:
+    """Median (mean of the middle two for even length) of a float array."""
+    n = len(values)
+    upper = n // 2
+    if n % 2 == 0:
+        part = np.partition(values, [upper - 1, upper])
+        return float((part[upper - 1] + part[upper]) / 2)
+    return float(np.partition(values, upper)[upper])
+
+
+def _pairwise_slopes(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Every slope (y_j − y_i)/(x_j − x_i), i < j, with |x_j − x_i| > X_TIE_TOLERANCE."""
+    rows = []
+    for i in range(len(x) - 1):
+        dx = x[i + 1:] - x[i]
+        keep = np.abs(dx) > X_TIE_TOLERANCE
+        rows.append((y[i + 1:][keep] - y[i]) / dx[keep])
+    return np.concatenate(rows) if rows else np.empty(0)
+
+
+def _count_inversions(ranks: np.ndarray) -> int:
+    """
+    Number of pairs i < j with ranks[i] > ranks[j].
+
+    Bottom-up merge count: at each level every right half-block looks up, by
+    one global searchsorted, how many elements of its sorted left half-block
+    exceed each of its values.
+
+    Args:
+        ranks: Permutation of 0..n-1
+
+    Returns:
+        Inversion count
+    """
+    n = len(ranks)
+    values = ranks.astype(np.int64)
+    positions = np.arange(n, dtype=np.int64)
+    total = 0
+    width = 1
+    while width < n:
+        block = positions // (2 * width)
+        keys = block * n + values
+        is_right = (positions // width) % 2 == 1
+        left_keys = keys[~is_right]
+        right_keys = keys[is_right]
+        left_end = np.searchsorted(left_keys, (block[is_right] + 1) * n)
+        total += int((left_end - np.searchsorted(left_keys, right_keys, side='right')).sum())
+        values = np.sort(keys, kind='stable') % n
+        width *= 2
+    return total
+
+
+class _SlopeSelector:
+    """Rank queries over the pairwise slopes of a point set, without listing them."""
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, seed: int = 0):
+        order = np.lexsort((y, x))
+        self.x = x[order]
+        self.y = y[order]
+        self.n = len(self.x)
+        self._position = np.arange(self.n)
+        self._rng = np.random.default_rng(seed)
+        _, tie_sizes = np.unique(self.x, return_counts=True)
+        self.total = self.n * (self.n - 1) // 2 - int((tie_sizes * (tie_sizes - 1) // 2).sum())
+        # Pairs with 0 < dx ≤ X_TIE_TOLERANCE: the ranking still orders them,
+        # so count_le subtracts those it counted.
+        first = np.searchsorted(self.x, self.x, side='right')
+        last = np.searchsorted(self.x, self.x + 2 * X_TIE_TOLERANCE, side='right')
+        counts = last - first
+        near_i = np.repeat(np.arange(self.n), counts)
+        offsets = np.arange(len(near_i)) - np.repeat(np.cumsum(counts) - counts, counts)
+        near_j = np.repeat(first, counts) + offsets
+        keep = self.x[near_j] - self.x[near_i] <= X_TIE_TOLERANCE
+        self._near_i = near_i[keep]
+        self._near_j = near_j[keep]
+        self.total -= len(self._near_i)
+        # Insertion-sort work allowed when listing the slopes of a bracket.
+        self.budget = 8 * self.n
+
+    def _order(self, t: float) -> np.ndarray:
+        # By y − t·x; ties in that go to the larger x first (slope exactly t
+        # counts as ≤ t) and keep x-order within equal x (vertical pairs never
+        # count).
+        return np.lexsort((self._position, -self.x, self.y - t * self.x))
+
+    def count_le(self, t: float) -> int:
+        """Number of pairwise slopes ≤ t."""
+        ranks = np.empty(self.n, dtype=np.int64)
+        ranks[self._order(t)] = self._position
+        # A near pair is inverted iff its keys compare as in _order.
+        key_i = self.y[self._near_i] - t * self.x[self._near_i]
+        key_j = self.y[self._near_j] - t * self.x[self._near_j]
+        return _count_inversions(ranks) - int(np.count_nonzero(key_j <= key_i))
+
+    def _slopes_between(self, lo: float, hi: float, exact: bool = True) -> Optional[np.ndarray]:
+        """
+        Sorted slopes of the pairs ranked in (lo, hi].
+
+        Args:
+            lo, hi: Bracket
+            exact: List every such slope, or return None when that exceeds the
+                budget or rounding noise shows up. Otherwise stop at the budget
+                (after at least one slope) and skip noisy pairs.
+
+        Returns:
+            Sorted slopes, or None
+        """
+        ranks_hi = np.empty(self.n, dtype=np.int64)
+        ranks_hi[self._order(hi)] = self._position
+        key = ranks_hi.tolist()
+        xs = self.x.tolist()
+        sequence = self._order(lo).tolist()
+        first, second = [], []
+        work = 0
+        for a in range(1, self.n):
+            p = sequence[a]
+            kp = key[p]
+            b = a
+            while b > 0 and key[sequence[b - 1]] > kp:
+                q = sequence[b - 1]
+                sequence[b] = q
+                b -= 1
+                work += 1
+                if xs[max(p, q)] - xs[min(p, q)] <= X_TIE_TOLERANCE:
+                    pass  # near pair: not counted
+                elif q > p:  # pair was below lo, now above hi: rounding noise
+                    if exact:
+                        return None
+                else:
+                    first.append(q)
+                    second.append(p)
+                if work > self.budget:
+                    if exact:
+                        return None
+                    if first:
+                        return self._slopes(first, second)
+            sequence[b] = p
+        return self._slopes(first, second)
+
+    def _slopes(self, first: List[int], second: List[int]) -> np.ndarray:
+        i = np.array(first, dtype=np.int64)
+        j = np.array(second, dtype=np.int64)
+        return np.sort((self.y[j] - self.y[i]) / (self.x[j] - self.x[i]))
+
+    def _bracket(self, k: int, hint: Optional[float]) -> Tuple[float, int, float, int]:
+        if hint is not None:
+            lo = hi = float(hint)
+            width = max(abs(lo) * 1e-6, 1e-12)
+        else:
+            i = self._rng.integers(0, self.n, _BRACKET_SAMPLES)
+            j = self._rng.integers(0, self.n, _BRACKET_SAMPLES)
+            dx = self.x[j] - self.x[i]
+            keep = np.abs(dx) > X_TIE_TOLERANCE
+            sample = (self.y[j][keep] - self.y[i][keep]) / dx[keep]
+            if sample.size == 0:
+                sample = np.zeros(1)
+            q = (k + 0.5) / self.total
+            spread = 4.0 / np.sqrt(sample.size)
+            lo = float(np.quantile(sample, max(0.0, q - spread)))
+            hi = float(np.quantile(sample, min(1.0, q + spread)))
+            width = max(hi - lo, abs(lo) * 1e-6, 1e-12)
+
+        c_lo = self.count_le(lo)
+        step = width
+        while c_lo > k:
+            lo -= step
+            step *= 2
+            c_lo = self.count_le(lo)
+        c_hi = self.count_le(hi)
+        step = width
+        while c_hi <= k:
+            hi += step
+            step *= 2
+            c_hi = self.count_le(hi)
+        return lo, c_lo, hi, c_hi
+
+    def select(self, k: int, hint: Optional[float] = None) -> float:
+        """
+        k-th smallest pairwise slope (0-based).
+
+        Args:
+            k: Rank, 0 ≤ k < total
+            hint: Expected value (e.g. the previous fit) to bracket around
+
+        Returns:
+            The slope, as computed by (y_j − y_i)/(x_j − x_i)
+        """
+        lo, c_lo, hi, c_hi = self._bracket(k, hint)
+        while c_hi - c_lo > self.budget:
+            mid = lo + (hi - lo) / 2
+            if not lo < mid < hi:
+                break
+            c_mid = self.count_le(mid)
+            if c_mid <= k:
+                lo, c_lo = mid, c_mid
+            else:
+                hi, c_hi = mid, c_mid
+        if c_hi - c_lo <= self.budget:
+            slopes = self._slopes_between(lo, hi)
+            if slopes is not None and len(slopes) == c_hi - c_lo:
+                return float(slopes[k - c_lo])
+        # Rank block narrower than one ulp, or not listable exactly: its slopes
+        # are equal up to the rounding of y − t·x (typically many tied slopes).
+        # Take the slope at the same relative rank among those listed within
+        # the budget.
+        slopes = self._slopes_between(lo, hi, exact=False)
+        return float(slopes[(k - c_lo) * len(slopes) // (c_hi - c_lo)])
+
+
+def _median_slope(x: np.ndarray, y: np.ndarray, hint: Optional[float] = None) -> float:
+    """Median pairwise slope, by the pairwise or the selection path."""
+    if len(x) <= PAIRWISE_MAX_POINTS:
+        slopes = _pairwise_slopes(x, y)
+        if slopes.size == 0:
+            raise ValueError("All x values are identical, cannot compute slope")
+        return _median(slopes)
+
+    selector = _SlopeSelector(x, y)
+    if selector.total == 0:
+        raise ValueError("All x values are identical, cannot compute slope")
+    upper = selector.total // 2
+    lower = (selector.total - 1) // 2
+    m_upper = selector.select(upper, hint)
+    if lower == upper:
+        return m_upper
+    return (selector.select(lower, m_upper) + m_upper) / 2
+
 
 def theil_sen(x: List[float], y: List[float]) -> Tuple[float, float]:
     """
@@ -23,6 +276,10 @@ def theil_sen(x: List[float], y: List[float]) -> Tuple[float, float]:
     2. Slope = median of all pairwise slopes
     3. Intercept = median of (y_i - m * x_i)
     
+    Pairs with |x_j - x_i| ≤ 1e-10 are skipped. Above PAIRWISE_MAX_POINTS
+    points the median slope is found by slope selection (see module
+    docstring) instead of sorting all n(n−1)/2 slopes; the result is the same.
+    
     Args:
         x: List of x values
         y: List of y values
@@ -39,36 +296,82 @@ def theil_sen(x: List[float], y: List[float]) -> Tuple[float, float]:
     if len(x) < 2:
         raise ValueError(f"Need at least 2 points for regression, got {len(x)}")
     
-    # Compute all pairwise slopes, skipping identical x values
-    slopes = []
-    for i, j in combinations(range(len(x)), 2):
-        if abs(x[j] - x[i]) > 1e-10:  # Avoid division by near-zero
-            slope = (y[j] - y[i]) / (x[j] - x[i])
-            slopes.append(slope)
-    
-    if not slopes:
-        raise ValueError("All x values are identical, cannot compute slope")
-    
-    # Slope is median of all pairwise slopes
-    slopes_sorted = sorted(slopes)
-    n = len(slopes_sorted)
-    if n % 2 == 0:
-        m = (slopes_sorted[n // 2 - 1] + slopes_sorted[n // 2]) / 2
-    else:
-        m = slopes_sorted[n // 2]
-    
-    # Intercept is median of (y_i - m * x_i)
-    intercepts = [y[i] - m * x[i] for i in range(len(x))]
-    intercepts_sorted = sorted(intercepts)
-    n = len(intercepts_sorted)
-    if n % 2 == 0:
-        b = (intercepts_sorted[n // 2 - 1] + intercepts_sorted[n // 2]) / 2
-    else:
-        b = intercepts_sorted[n // 2]
-    
+    x_arr = np.asarray(x, dtype=np.float64)
+    y_arr = np.asarray(y, dtype=np.float64)
+    m = _median_slope(x_arr, y_arr)
+    b = _median(y_arr - m * x_arr)
     return m, b
 
 
+class OnlineTheilSen:
+    """Theil-Sen fit that absorbs (x, y) observations incrementally."""
+
+    def __init__(self, x: Optional[List[float]] = None, y: Optional[List[float]] = None):
+        """
+        Args:
+            x: Initial x values (optional)
+            y: Initial y values (optional)
+        """
+        self._x: List[float] = []
+        self._y: List[float] = []
+        # Sorted pairwise slopes, kept while len ≤ PAIRWISE_MAX_POINTS.
+        self._slopes: Optional[np.ndarray] = np.empty(0)
+        self._slope: Optional[float] = None
+        self._fit: Optional[Tuple[float, float]] = None
+        if x is not None or y is not None:
+            self.extend(x if x is not None else [], y if y is not None else [])
+
+    def __len__(self) -> int:
+        return len(self._x)
+
+    def add(self, x: float, y: float) -> None:
+        """Absorb one observation."""
+        if self._slopes is not None:
+            if len(self._x) + 1 > PAIRWISE_MAX_POINTS:
+                self._slopes = None
+            else:
+                xs = np.asarray(self._x, dtype=np.float64)
+                ys = np.asarray(self._y, dtype=np.float64)
+                dx = x - xs
+                keep = np.abs(dx) > X_TIE_TOLERANCE
+                new = np.sort((y - ys[keep]) / dx[keep])
+                self._slopes = np.insert(self._slopes, np.searchsorted(self._slopes, new), new)
+        self._x.append(float(x))
+        self._y.append(float(y))
+        self._fit = None
+
+    def extend(self, x: List[float], y: List[float]) -> None:
+        """Absorb several observations."""
+        if len(x) != len(y):
+            raise ValueError(f"x and y must have same length: {len(x)} vs {len(y)}")
+        for xi, yi in zip(x, y):
+            self.add(xi, yi)
+
+    def fit(self) -> Tuple[float, float]:
+        """
+        Current (slope, intercept); identical to theil_sen on all points so far.
+
+        Raises:
+            ValueError: Fewer than 2 points, or all x values identical
+        """
+        if self._fit is not None:
+            return self._fit
+        if len(self._x) < 2:
+            raise ValueError(f"Need at least 2 points for regression, got {len(self._x)}")
+
+        x_arr = np.asarray(self._x, dtype=np.float64)
+        y_arr = np.asarray(self._y, dtype=np.float64)
+        if self._slopes is not None:
+            if self._slopes.size == 0:
+                raise ValueError("All x values are identical, cannot compute slope")
+            m = _median(self._slopes)
+        else:
+            m = _median_slope(x_arr, y_arr, hint=self._slope)
+        self._slope = m
+        self._fit = (m, _median(y_arr - m * x_arr))
+        return self._fit
+
+
 def ols_regression(x: List[float], y: List[float]) -> Tuple[float, float]:
     """
     Ordinary least squares linear regression for comparison.
@@ -23,6 +23,7 @@ Only the final divisibility check N % candidate == 0 is used for validation.
 
 import time
 import json
+import os
 import sys
 from datetime import datetime
 from math import log, exp, sqrt, floor, ceil
@@ -35,6 +36,9 @@ except ImportError:
     print("ERROR: mpmath required. Install with: pip install mpmath")
     sys.exit(1)
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from tau_lattice import TauEvaluator, TauLattice
+
 # Challenge constant - NO factors stored in the algorithm
 CHALLENGE_127 = 137524771864208156028430259349934309717
 
@@ -70,6 +74,9 @@ def compute_tau(N: int, b: float, phi: mp.mpf) -> mp.mpf:
     - Modular relationship between N and the scale
     - Golden ratio phase alignment
     
+    Single-point reference; compute_tau_derivative_profile evaluates τ
+    with tau_lattice.TauEvaluator.
+    
     Args:
         N: The semiprime to factor
         b: Scale parameter (bit index, typically 1 to N.bit_length())
@@ -142,13 +149,9 @@ def compute_tau_derivative_profile(
     extended_points = num_points + 4
     extended_h = (b_extended_end - b_extended_start) / (extended_points - 1)
     
-    tau_extended = []
-    b_extended = []
-    
-    for i in range(extended_points):
-        b = b_extended_start + i * extended_h
-        b_extended.append(b)
-        tau_extended.append(compute_tau(N, b, phi))
+    # τ on the padded grid, evaluated once per point (node 2i of the
+    # half-step lattice is b_extended_start + i * extended_h)
+    lattice = TauLattice(TauEvaluator(N, phi), b_extended_start, extended_h)
     
     # Extract the main range values
     b_values = []
@@ -158,24 +161,16 @@ def compute_tau_derivative_profile(
     tau_triple_prime = []
     
     for i in range(2, extended_points - 2):
-        b = b_extended[i]
-        b_values.append(float(b))
-        
-        tau_curr = tau_extended[i]
-        tau_values.append(tau_curr)
-        
-        # First derivative: (τ[i+1] - τ[i-1]) / (2h)
-        d1 = (tau_extended[i + 1] - tau_extended[i - 1]) / (2 * extended_h)
-        tau_prime.append(d1)
-        
-        # Second derivative: (τ[i+1] - 2τ[i] + τ[i-1]) / h²
-        d2 = (tau_extended[i + 1] - 2 * tau_curr + tau_extended[i - 1]) / (extended_h ** 2)
-        tau_double_prime.append(d2)
+        j = 2 * i
+        b_values.append(float(lattice.point(j)))
+        tau_values.append(lattice(j))
         
-        # Third derivative: (τ[i+2] - 2τ[i+1] + 2τ[i-1] - τ[i-2]) / (2h³)
-        d3 = (tau_extended[i + 2] - 2 * tau_extended[i + 1] + 
-              2 * tau_extended[i - 1] - tau_extended[i - 2]) / (2 * extended_h ** 3)
-        tau_triple_prime.append(d3)
+        # τ'  = (τ[i+1] - τ[i-1]) / (2h)
+        # τ'' = (τ[i+1] - 2τ[i] + τ[i-1]) / h²
+        # τ''' = (τ[i+2] - 2τ[i+1] + 2τ[i-1] - τ[i-2]) / (2h³)
+        tau_prime.append(lattice.first_derivative(j))
+        tau_double_prime.append(lattice.second_derivative(j))
+        tau_triple_prime.append(lattice.third_derivative(j))
     
     return b_values, tau_values, tau_prime, tau_double_prime, tau_triple_prime
 
@@ -15,10 +15,14 @@ Exports: calibration_results.json
 
 import json
 import os
+import sys
 from math import log, sqrt
 from typing import List, Dict, Tuple
 from z5d_api import predict_prime_band, estimate_prime_index, z5d_error_estimate
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from primality import is_prime, next_prime
+
 
 def isqrt(n: int) -> int:
     """Integer square root."""
@@ -34,53 +38,6 @@ def isqrt(n: int) -> int:
     return x
 
 
-def miller_rabin(n: int, k: int = 10) -> bool:
-    """Miller-Rabin primality test."""
-    if n < 2:
-        return False
-    if n == 2 or n == 3:
-        return True
-    if n % 2 == 0:
-        return False
-    
-    # Write n-1 as 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-    
-    # Witness loop
-    def check_witness(a):
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
-            return True
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                return True
-        return False
-    
-    # Test with first k primes as witnesses
-    witnesses = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
-    for a in witnesses[:k]:
-        if a >= n:
-            continue
-        if not check_witness(a):
-            return False
-    return True
-
-
-def next_prime(n: int) -> int:
-    """Find next prime >= n."""
-    if n <= 2:
-        return 2
-    if n % 2 == 0:
-        n += 1
-    while not miller_rabin(n, k=15):
-        n += 2
-    return n
-
-
 def generate_balanced_semiprime(bit_length: int) -> Tuple[int, int, int]:
     """
     Generate balanced semiprime N = p × q at target bit-length.
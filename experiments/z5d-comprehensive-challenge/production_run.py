@@ -20,11 +20,15 @@ Run format:
 
 import json
 import os
+import sys
 import time
 from math import log, isqrt
 from typing import Optional, Tuple, Dict
 from z5d_pipeline import generate_z5d_candidates
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from jsonl_log import BufferedJSONLWriter
+
 
 # 127-bit challenge
 CHALLENGE_127 = 137524771864208156028430259349934309717
@@ -94,16 +98,14 @@ def production_run(N: int,
         'run_log.jsonl'
     )
     
-    with open(log_path, 'w') as log_file:
-        # Write header
-        log_file.write(json.dumps({
-            'type': 'header',
-            'N': str(N),
-            'sqrt_N': str(sqrt_N),
-            'params': params,
-            'start_time': time.time()
-        }) + '\n')
-        log_file.flush()
+    header = {
+        'type': 'header',
+        'N': str(N),
+        'sqrt_N': str(sqrt_N),
+        'params': params,
+        'start_time': time.time()
+    }
+    with BufferedJSONLWriter(log_path, header=header) as log_file:
         
         print("Starting search...")
         print()
@@ -135,8 +137,7 @@ def production_run(N: int,
                     'elapsed_seconds': elapsed,
                     'metadata': cand_data
                 }
-                log_file.write(json.dumps(success_record) + '\n')
-                log_file.flush()
+                log_file.write(success_record)
                 
                 print(f"\n{'*' * 70}")
                 print("FACTOR FOUND!")
@@ -174,8 +175,7 @@ def production_run(N: int,
                     'band_id': cand_data['band_id'],
                     'step': cand_data['step']
                 }
-                log_file.write(json.dumps(log_record) + '\n')
-                log_file.flush()
+                log_file.write(log_record)
                 
                 # Console progress every 10k
                 if tested % (log_interval * 10) == 0:
@@ -202,8 +202,7 @@ def production_run(N: int,
             'elapsed_seconds': elapsed,
             'success': False
         }
-        log_file.write(json.dumps(completion_record) + '\n')
-        log_file.flush()
+        log_file.write(completion_record)
     
     print(f"\nSearch completed without finding factors")
     print(f"Tested: {tested:,} candidates in {elapsed:.2f}s")
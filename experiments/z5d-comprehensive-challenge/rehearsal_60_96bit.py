@@ -26,7 +26,7 @@ from z5d_pipeline import (
     generate_z5d_candidates, adaptive_precision, WHEEL_SIZE, WHEEL_MODULUS
 )
 from calibrate_bands import (
-    generate_balanced_semiprime, miller_rabin, next_prime
+    generate_balanced_semiprime, is_prime, next_prime
 )
 import mpmath as mp
 
@@ -19,10 +19,11 @@ from z5d_api import (
     local_prime_density, prioritize_delta_bands, adaptive_step_size
 )
 from calibrate_bands import (
-    generate_balanced_semiprime, next_prime, miller_rabin
+    generate_balanced_semiprime, next_prime, is_prime
 )
 from z5d_pipeline import (
-    generate_z5d_candidates, z5d_pipeline_search, is_admissible
+    generate_z5d_candidates, z5d_pipeline_search, is_admissible,
+    generate_z5d_candidate_batches, fill_amplitudes, divisible_rows
 )
 
 
@@ -96,14 +97,14 @@ class TestZ5DAPI:
 class TestCalibration:
     """Test calibration components."""
     
-    def test_miller_rabin(self):
+    def test_is_prime(self):
         """Test primality testing."""
-        assert miller_rabin(2)
-        assert miller_rabin(3)
-        assert miller_rabin(17)
-        assert miller_rabin(97)
-        assert not miller_rabin(4)
-        assert not miller_rabin(100)
+        assert is_prime(2)
+        assert is_prime(3)
+        assert is_prime(17)
+        assert is_prime(97)
+        assert not is_prime(4)
+        assert not is_prime(100)
     
     def test_next_prime(self):
         """Test next prime finder."""
@@ -122,8 +123,8 @@ class TestCalibration:
         assert p < q
         
         # Verify both prime
-        assert miller_rabin(p, k=15)
-        assert miller_rabin(q, k=15)
+        assert is_prime(p)
+        assert is_prime(q)
         
         # Verify bit-length approximately 60
         assert 58 <= N.bit_length() <= 62
@@ -173,6 +174,42 @@ class TestPipeline:
             assert 'amplitude' in c
             assert 'band_id' in c
     
+    def test_candidate_batches_match_stream(self):
+        """Batch mode yields the dict stream's candidates in the same order."""
+        N = 1073217479
+        sqrt_N = isqrt(N)
+
+        stream = list(generate_z5d_candidates(
+            N, sqrt_N, delta_max=1000, num_bands=3, verbose=False
+        ))
+        batches = list(generate_z5d_candidate_batches(
+            N, sqrt_N, delta_max=1000, num_bands=3, batch_size=64
+        ))
+
+        assert all(len(b) == 64 for b in batches[:-1])
+        rows = [row for b in batches for row in b]
+        assert [int(r['candidate']) for r in rows] == [c['candidate'] for c in stream]
+        assert [int(r['delta']) for r in rows] == [c['delta'] for c in stream]
+        assert [int(r['band_id']) for r in rows] == [c['band_id'] for c in stream]
+
+        # Amplitudes are lazy and match the scalar stream once requested
+        first = batches[0]
+        assert all(a != a for a in first['amplitude'][:3])
+        fill_amplitudes(first, N, sqrt_N, rows=[0, 1, 2])
+        for i in range(3):
+            assert first['amplitude'][i] == pytest.approx(stream[i]['amplitude'])
+
+    def test_divisible_rows(self):
+        """Batch divisibility on a 60-bit N with uint64 candidates."""
+        N = 1152921470247108503  # 1,073,741,789 × 1,073,741,827
+        batch = next(generate_z5d_candidate_batches(
+            N, isqrt(N), delta_max=100, num_bands=1
+        ))
+        hits = divisible_rows(N, batch['candidate'])
+        assert len(hits) > 0
+        for i in hits:
+            assert int(batch['candidate'][i]) in (1073741789, 1073741827)
+
     def test_small_semiprime_search(self):
         """Test pipeline on small semiprime."""
         # 30-bit Gate 1: 1,073,217,479 = 32,749 × 32,771
@@ -14,47 +14,47 @@ This pipeline uses Z5D as a STEPPING oracle, not just a score term.
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'z5d-informed-gva'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
 from wheel_residues import (
-    is_admissible, next_admissible, WHEEL_MODULUS, WHEEL_SIZE
+    is_admissible, next_admissible, WHEEL_MODULUS, WHEEL_SIZE,
+    WHEEL_210_RESIDUES
 )
 from z5d_api import (
     prioritize_delta_bands, adaptive_step_size, density_in_range,
     local_prime_density
 )
+from primality import next_prime
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
 import mpmath as mp
+import numpy as np
 from typing import List, Tuple, Optional, Dict, Iterator
 from math import log, isqrt
 
 
-def adaptive_precision(N: int) -> int:
-    """Compute adaptive precision: max(100, N.bitLength() × 4 + 200)"""
-    return max(100, N.bit_length() * 4 + 200)
-
+# Wheel lookup tables indexed by residue mod 210:
+# admissible mask and distance to the next admissible residue (>= 0).
+_WHEEL_MASK = np.zeros(WHEEL_MODULUS, dtype=bool)
+_WHEEL_MASK[WHEEL_210_RESIDUES] = True
+_WHEEL_JUMP = np.array(
+    [next_admissible(r) - r for r in range(WHEEL_MODULUS)], dtype=np.int64
+)
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
-    """Embed integer n into 7D torus using geodesic mapping."""
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        coords.append(coord)
-    return coords
+# Columnar candidate record used by the batch pipeline.
+CANDIDATE_BATCH_DTYPE = np.dtype([
+    ('candidate', np.uint64),
+    ('delta', np.int64),
+    ('residue', np.int16),
+    ('band_id', np.int32),
+    ('step', np.int32),
+    ('amplitude', np.float64),
+])
 
 
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """Compute Riemannian geodesic distance on 7D torus."""
-    dist_sq = mp.mpf(0)
-    for c1, c2 in zip(p1, p2):
-        diff = abs(c1 - c2)
-        wrap_diff = mp.mpf(1) - diff
-        min_diff = min(diff, wrap_diff)
-        dist_sq += min_diff * min_diff
-    return mp.sqrt(dist_sq)
+def adaptive_precision(N: int) -> int:
+    """Compute adaptive precision: max(100, N.bitLength() × 4 + 200)"""
+    return max(100, N.bit_length() * 4 + 200)
 
 
 def compute_gva_amplitude(candidate: int, 
@@ -184,6 +184,163 @@ def generate_z5d_candidates(N: int,
                         }
 
 
+def _band_positive_deltas(sqrt_N: int, delta_start: int, delta_end: int,
+                          step: int) -> np.ndarray:
+    """
+    Positive δ walk of one band, identical to the scalar generator.
+
+    The walk (advance by step, then jump to the next admissible residue)
+    depends only on the residue mod 210, so its increments are eventually
+    periodic with period <= 48; one cycle is traced and tiled.
+    """
+    base = sqrt_N % WHEEL_MODULUS
+    first = delta_start + int(_WHEEL_JUMP[(base + delta_start) % WHEEL_MODULUS])
+    if first > delta_end:
+        return np.empty(0, dtype=np.int64)
+
+    increments = []
+    seen = {}
+    residue = (base + first) % WHEEL_MODULUS
+    while residue not in seen:
+        seen[residue] = len(increments)
+        moved = (residue + step) % WHEEL_MODULUS
+        inc = step + int(_WHEEL_JUMP[moved])
+        increments.append(inc)
+        residue = (residue + inc) % WHEEL_MODULUS
+    prefix = increments[:seen[residue]]
+    cycle = increments[seen[residue]:]
+
+    # Each increment is >= 1, so this many covers the band.
+    count = delta_end - first + 1
+    reps = -(-max(count - len(prefix), 0) // len(cycle))
+    steps = np.concatenate([
+        np.array(prefix, dtype=np.int64),
+        np.tile(np.array(cycle, dtype=np.int64), reps),
+    ])[:max(count - 1, 0)]
+    deltas = first + np.concatenate([[0], np.cumsum(steps)])
+    return deltas[deltas <= delta_end]
+
+
+def _band_deltas(sqrt_N: int, delta_start: int, delta_end: int,
+                 delta_max: int, step: int) -> np.ndarray:
+    """
+    Signed δ sequence of one band in scalar-generator order.
+
+    Every positive δ is followed by -(δ + step) when that mirror candidate
+    is within δ_max, greater than 1 and wheel-admissible.
+    """
+    positive = _band_positive_deltas(sqrt_N, delta_start, delta_end, step)
+    mirror = positive + step
+    base = sqrt_N % WHEEL_MODULUS
+    keep_mirror = (
+        (mirror <= delta_max)
+        & (mirror < sqrt_N - 1)
+        & _WHEEL_MASK[(base - mirror) % WHEEL_MODULUS]
+    )
+    interleaved = np.column_stack([positive, -mirror]).ravel()
+    keep = np.column_stack([np.ones(len(positive), dtype=bool), keep_mirror]).ravel()
+    return interleaved[keep]
+
+
+def fill_amplitudes(batch: np.ndarray,
+                    N: int,
+                    sqrt_N: int,
+                    k_value: float = 0.35,
+                    rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute FR-GVA amplitudes in place for a candidate batch.
+
+    Amplitudes are ranking metadata only; batches leave them NaN until a
+    logger or analyser asks for them.
+
+    Args:
+        batch: Structured array with CANDIDATE_BATCH_DTYPE
+        N: Semiprime (sets the working precision)
+        sqrt_N: Floor of square root
+        k_value: GVA exponent
+        rows: Optional indices to fill (default: all rows)
+
+    Returns:
+        The same batch, for chaining
+    """
+    indices = np.arange(len(batch)) if rows is None else np.atleast_1d(rows)
+    with mp.workdps(adaptive_precision(N)):
+        sqrt_N_embedding = embed_torus_geodesic(sqrt_N, k_value)
+        for i in indices:
+            batch['amplitude'][i] = compute_gva_amplitude(
+                int(batch['candidate'][i]), sqrt_N_embedding, k_value
+            )
+    return batch
+
+
+def generate_z5d_candidate_batches(N: int,
+                                   sqrt_N: int,
+                                   delta_max: int,
+                                   num_bands: int,
+                                   batch_size: int = 4096,
+                                   k_value: float = 0.35,
+                                   with_amplitude: bool = False) -> Iterator[np.ndarray]:
+    """
+    Columnar variant of generate_z5d_candidates.
+
+    Yields the same candidates in the same order, packed into structured
+    arrays of batch_size rows (the last batch may be shorter). Amplitudes
+    stay NaN unless with_amplitude is set; see fill_amplitudes.
+
+    Args:
+        N: Semiprime to factor
+        sqrt_N: Floor of square root (must fit in uint64)
+        delta_max: Maximum δ-offset
+        num_bands: Number of δ-bands
+        batch_size: Rows per yielded batch
+        k_value: GVA exponent (used only for amplitudes)
+        with_amplitude: Compute amplitudes eagerly
+
+    Yields:
+        Structured arrays with CANDIDATE_BATCH_DTYPE
+    """
+    if sqrt_N + delta_max >= 2**64:
+        raise ValueError("Batch mode requires sqrt_N + delta_max < 2**64")
+
+    bands = prioritize_delta_bands(sqrt_N, delta_max, num_bands)
+    pending = []
+    pending_rows = 0
+    for band_idx, band in enumerate(bands):
+        step = adaptive_step_size(band['density'], base_step=1)
+        deltas = _band_deltas(sqrt_N, band['delta_start'], band['delta_end'],
+                              delta_max, step)
+        chunk = np.empty(len(deltas), dtype=CANDIDATE_BATCH_DTYPE)
+        chunk['candidate'] = np.uint64(sqrt_N) + deltas.astype(np.uint64)
+        chunk['delta'] = deltas
+        chunk['residue'] = (sqrt_N % WHEEL_MODULUS + deltas) % WHEEL_MODULUS
+        chunk['band_id'] = band_idx
+        chunk['step'] = step
+        chunk['amplitude'] = np.nan
+        pending.append(chunk)
+        pending_rows += len(chunk)
+
+        while pending_rows >= batch_size:
+            joined = np.concatenate(pending)
+            batch, rest = joined[:batch_size], joined[batch_size:]
+            pending, pending_rows = [rest], len(rest)
+            yield fill_amplitudes(batch, N, sqrt_N, k_value) if with_amplitude else batch
+
+    if pending_rows:
+        batch = np.concatenate(pending)
+        yield fill_amplitudes(batch, N, sqrt_N, k_value) if with_amplitude else batch
+
+
+def divisible_rows(N: int, candidates: np.ndarray) -> np.ndarray:
+    """
+    Indices of candidates dividing N, tested across the whole batch.
+
+    N exceeds 64 bits in general, so the remainder runs on Python ints via
+    an object array: one vectorised call instead of a loop per candidate.
+    """
+    remainders = N % candidates.astype(object)
+    return np.flatnonzero(remainders == 0)
+
+
 def z5d_pipeline_search(N: int,
                        max_candidates: int = 100000,
                        delta_max: int = 100000,
@@ -218,15 +375,15 @@ def z5d_pipeline_search(N: int,
         print()
     
     tested = 0
-    for cand_data in generate_z5d_candidates(
-        N, sqrt_N, delta_max, num_bands, k_value, verbose
+    for batch in generate_z5d_candidate_batches(
+        N, sqrt_N, delta_max, num_bands, k_value=k_value
     ):
-        candidate = cand_data['candidate']
-        
-        # Test divisibility
-        if N % candidate == 0:
-            p = candidate
+        batch = batch[:max_candidates - tested]
+        hits = divisible_rows(N, batch['candidate'])
+        if len(hits):
+            p = int(batch['candidate'][hits[0]])
             q = N // p
+            tested += int(hits[0])
             if verbose:
                 print(f"\n*** FACTOR FOUND ***")
                 print(f"p = {p}")
@@ -235,16 +392,21 @@ def z5d_pipeline_search(N: int,
                 print(f"Verified: {p * q == N}")
                 print(f"Candidates tested: {tested + 1}")
             return (p, q)
-        
-        tested += 1
+
+        previous = tested
+        tested += len(batch)
+
+        # Progress logging: amplitude computed only for the logged row
+        if verbose and tested // 10000 > previous // 10000:
+            row = (tested // 10000) * 10000 - previous - 1
+            fill_amplitudes(batch, N, sqrt_N, k_value, rows=row)
+            print(f"  Tested {previous + row + 1} candidates, "
+                  f"δ={batch['delta'][row]}, band={batch['band_id'][row]}, "
+                  f"amp={batch['amplitude'][row]:.4f}")
+
         if tested >= max_candidates:
             break
-        
-        # Progress logging
-        if verbose and tested % 10000 == 0:
-            print(f"  Tested {tested} candidates, δ={cand_data['delta']}, "
-                  f"band={cand_data['band_id']}, amp={cand_data['amplitude']:.4f}")
-    
+
     if verbose:
         print(f"\nSearch exhausted after {tested} candidates")
     
@@ -276,44 +438,3 @@ if __name__ == "__main__":
         print("\nSUCCESS!")
     else:
         print("\nFailed to find factors")
-
-
-def next_prime(n: int) -> int:
-    """Find next prime >= n (for testing)."""
-    if n <= 2:
-        return 2
-    if n % 2 == 0:
-        n += 1
-    while not miller_rabin(n):
-        n += 2
-    return n
-
-
-def miller_rabin(n: int, k: int = 10) -> bool:
-    """Miller-Rabin primality test."""
-    if n < 2:
-        return False
-    if n == 2 or n == 3:
-        return True
-    if n % 2 == 0:
-        return False
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-    def check_witness(a):
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
-            return True
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                return True
-        return False
-    witnesses = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31]
-    for a in witnesses[:k]:
-        if a >= n:
-            continue
-        if not check_witness(a):
-            return False
-    return True
@@ -24,6 +24,10 @@ import json
 from math import log, sqrt, isqrt, floor
 from datetime import datetime, timezone
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
 
 # 127-bit challenge
 CHALLENGE_127 = 137524771864208156028430259349934309717
@@ -44,31 +48,6 @@ def adaptive_precision(N: int) -> int:
     return max(100, N.bit_length() * 4 + 200)
 
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
-    """Embed integer n into 7D torus using geodesic mapping."""
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        coords.append(coord)
-    return coords
-
-
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """Compute Riemannian geodesic distance on 7D torus."""
-    dist_sq = mp.mpf(0)
-    for c1, c2 in zip(p1, p2):
-        diff = abs(c1 - c2)
-        wrap_diff = mp.mpf(1) - diff
-        min_diff = min(diff, wrap_diff)
-        dist_sq += min_diff * min_diff
-    return mp.sqrt(dist_sq)
-
-
 def quantize_km_grid(k_values: List[float], 
                      m_range: Tuple[int, int],
                      k_bins: int = 20,
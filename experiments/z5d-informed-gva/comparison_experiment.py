@@ -14,16 +14,34 @@ Falsification criteria:
 4. All improvements attributable to wheel filter alone (Z5D prior redundant)
 
 This experiment runs controlled comparisons and ablation studies.
+
+Each experiment's metrics are cached (experiments/result_cache.py) by its
+parameters, its own source and that of the engines and the density
+histogram, so a rerun only recomputes experiments whose inputs changed
+(changing the budgets in main() recomputes, adding an experiment does not
+touch the others). Set GEOFAC_TABLE_CACHE="" to force a full rerun.
+
+Wall-clock times are stamped with when and by which process they were
+measured. A cached experiment is flagged 'cached' with its original
+timestamp, and speedups are only computed between experiments timed by
+the same process, never between a cached and a fresh timing.
 """
 
 import sys
 import os
+import inspect
+import platform
 sys.path.append(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from baseline_fr_gva import baseline_fr_gva
 from z5d_enhanced_fr_gva import z5d_enhanced_fr_gva
+import wheel_residues
 from wheel_residues import WHEEL_SIZE, WHEEL_MODULUS
+from geofac import kernels
+from result_cache import cached_unit
 from math import log, isqrt
+from datetime import datetime, timezone
 import time
 
 # 127-bit challenge
@@ -31,7 +49,33 @@ CHALLENGE_127 = 137524771864208156028430259349934309717
 EXPECTED_P = 10508623501177419659
 EXPECTED_Q = 13086849276577416863
 
+DENSITY_FILE = os.path.join(os.path.dirname(__file__), "z5d_density_histogram.csv")
+ENGINE_SOURCES = [inspect.getmodule(baseline_fr_gva), inspect.getmodule(z5d_enhanced_fr_gva),
+                  wheel_residues, kernels, DENSITY_FILE]
+
+
+def timing(start_time: float) -> dict:
+    """Elapsed wall-clock time since start_time, stamped with when and where it was taken."""
+    return {
+        'elapsed': time.time() - start_time,
+        'timed_at': datetime.fromtimestamp(start_time, timezone.utc).isoformat(timespec='seconds'),
+        'timed_by': f"{platform.node()}:{os.getpid()}",
+    }
+
+
+def run_unit(experiment, **kwargs) -> dict:
+    """Run one cached experiment; 'cached' flags metrics loaded from an earlier run."""
+    metrics = dict(experiment(**kwargs))
+    metrics['cached'] = experiment.last_hit
+    return metrics
+
+
+def comparable(a: dict, b: dict) -> bool:
+    """Wall-clock times are only compared when one process measured both."""
+    return a['timed_by'] == b['timed_by']
+
 
+@cached_unit('z5d-informed-gva', sources=ENGINE_SOURCES, ignore=('verbose',))
 def run_baseline_experiment(max_candidates: int = 50000, 
                            delta_window: int = 500000,
                            verbose: bool = True):
@@ -56,7 +100,7 @@ def run_baseline_experiment(max_candidates: int = 50000,
         verbose=verbose
     )
     
-    elapsed = time.time() - start_time
+    measured = timing(start_time)
     
     success = result is not None
     if success:
@@ -70,7 +114,7 @@ def run_baseline_experiment(max_candidates: int = 50000,
         'name': 'Baseline FR-GVA',
         'success': success,
         'verified': verified,
-        'elapsed': elapsed,
+        **measured,
         'p': p,
         'q': q,
         'max_candidates': max_candidates,
@@ -85,6 +129,7 @@ def run_baseline_experiment(max_candidates: int = 50000,
     return metrics
 
 
+@cached_unit('z5d-informed-gva', sources=ENGINE_SOURCES, ignore=('verbose',))
 def run_wheel_only_experiment(max_candidates: int = 50000,
                               delta_window: int = 500000,
                               verbose: bool = True):
@@ -101,8 +146,6 @@ def run_wheel_only_experiment(max_candidates: int = 50000,
     print("=" * 70)
     print()
     
-    density_file = os.path.join(os.path.dirname(__file__), "z5d_density_histogram.csv")
-    
     start_time = time.time()
     
     result = z5d_enhanced_fr_gva(
@@ -117,7 +160,7 @@ def run_wheel_only_experiment(max_candidates: int = 50000,
         verbose=verbose
     )
     
-    elapsed = time.time() - start_time
+    measured = timing(start_time)
     
     success = result is not None
     if success:
@@ -131,7 +174,7 @@ def run_wheel_only_experiment(max_candidates: int = 50000,
         'name': 'Wheel Filter Only',
         'success': success,
         'verified': verified,
-        'elapsed': elapsed,
+        **measured,
         'p': p,
         'q': q,
         'max_candidates': max_candidates,
@@ -146,6 +189,7 @@ def run_wheel_only_experiment(max_candidates: int = 50000,
     return metrics
 
 
+@cached_unit('z5d-informed-gva', sources=ENGINE_SOURCES, ignore=('verbose',))
 def run_z5d_prior_only_experiment(max_candidates: int = 50000,
                                   delta_window: int = 500000,
                                   z5d_weight_beta: float = 0.1,
@@ -163,13 +207,11 @@ def run_z5d_prior_only_experiment(max_candidates: int = 50000,
     print("=" * 70)
     print()
     
-    density_file = os.path.join(os.path.dirname(__file__), "z5d_density_histogram.csv")
-    
     start_time = time.time()
     
     result = z5d_enhanced_fr_gva(
         CHALLENGE_127,
-        z5d_density_file=density_file,  # Z5D density ON
+        z5d_density_file=DENSITY_FILE,  # Z5D density ON
         k_value=0.35,
         max_candidates=max_candidates,
         delta_window=delta_window,
@@ -179,7 +221,7 @@ def run_z5d_prior_only_experiment(max_candidates: int = 50000,
         verbose=verbose
     )
     
-    elapsed = time.time() - start_time
+    measured = timing(start_time)
     
     success = result is not None
     if success:
@@ -193,7 +235,7 @@ def run_z5d_prior_only_experiment(max_candidates: int = 50000,
         'name': f'Z5D Prior Only (β={z5d_weight_beta})',
         'success': success,
         'verified': verified,
-        'elapsed': elapsed,
+        **measured,
         'p': p,
         'q': q,
         'max_candidates': max_candidates,
@@ -209,6 +251,7 @@ def run_z5d_prior_only_experiment(max_candidates: int = 50000,
     return metrics
 
 
+@cached_unit('z5d-informed-gva', sources=ENGINE_SOURCES, ignore=('verbose',))
 def run_full_z5d_experiment(max_candidates: int = 50000,
                             delta_window: int = 500000,
                             z5d_weight_beta: float = 0.1,
@@ -226,13 +269,11 @@ def run_full_z5d_experiment(max_candidates: int = 50000,
     print("=" * 70)
     print()
     
-    density_file = os.path.join(os.path.dirname(__file__), "z5d_density_histogram.csv")
-    
     start_time = time.time()
     
     result = z5d_enhanced_fr_gva(
         CHALLENGE_127,
-        z5d_density_file=density_file,
+        z5d_density_file=DENSITY_FILE,
         k_value=0.35,
         max_candidates=max_candidates,
         delta_window=delta_window,
@@ -242,7 +283,7 @@ def run_full_z5d_experiment(max_candidates: int = 50000,
         verbose=verbose
     )
     
-    elapsed = time.time() - start_time
+    measured = timing(start_time)
     
     success = result is not None
     if success:
@@ -256,7 +297,7 @@ def run_full_z5d_experiment(max_candidates: int = 50000,
         'name': f'Full Z5D (β={z5d_weight_beta})',
         'success': success,
         'verified': verified,
-        'elapsed': elapsed,
+        **measured,
         'p': p,
         'q': q,
         'max_candidates': max_candidates,
@@ -283,7 +324,7 @@ def print_summary(metrics: dict):
         print(f"  p = {metrics['p']}")
         print(f"  q = {metrics['q']}")
         print(f"  Verified: {metrics['verified']}")
-    print(f"Elapsed: {metrics['elapsed']:.3f}s")
+    print(f"Elapsed: {metrics['elapsed']:.3f}s (timed {metrics['timed_at']})")
     print(f"Max candidates: {metrics['max_candidates']}")
     print(f"Delta window: ±{metrics['delta_window']}")
     print(f"Wheel filter: {metrics['wheel_filter']}")
@@ -308,13 +349,18 @@ def print_comparison_table(all_metrics: list):
     # Table rows
     for m in all_metrics:
         success_str = "✓" if m['success'] else "✗"
-        time_str = f"{m['elapsed']:.2f}"
+        time_str = f"{m['elapsed']:.2f}" + ("*" if m.get('cached') else "")
         wheel_str = "Yes" if m['wheel_filter'] else "No"
         z5d_str = "Yes" if m['z5d_prior'] else "No"
         
         print(f"{m['name']:<30} {success_str:<10} {time_str:<12} {wheel_str:<8} {z5d_str:<8}")
     
     print("-" * 70)
+    cached = [m for m in all_metrics if m.get('cached')]
+    for m in cached:
+        print(f"* cached: {m['name']} timed {m['timed_at']}")
+    if cached:
+        print("  Speedups are only reported between experiments timed in the same run.")
     print()
     
     # Analysis
@@ -329,8 +375,11 @@ def print_comparison_table(all_metrics: list):
     
     if baseline and full_z5d:
         if baseline['success'] and full_z5d['success']:
-            speedup = baseline['elapsed'] / full_z5d['elapsed']
-            print(f"Baseline vs Full Z5D speedup: {speedup:.2f}x")
+            if not comparable(baseline, full_z5d):
+                print("Baseline vs Full Z5D speedup: n/a (timed in different runs)")
+            else:
+                speedup = baseline['elapsed'] / full_z5d['elapsed']
+                print(f"Baseline vs Full Z5D speedup: {speedup:.2f}x")
         elif not baseline['success'] and full_z5d['success']:
             print("Full Z5D succeeded where baseline failed ✓")
         elif baseline['success'] and not full_z5d['success']:
@@ -340,7 +389,7 @@ def print_comparison_table(all_metrics: list):
     if baseline and wheel_only:
         if wheel_only['success'] and not baseline['success']:
             print("Wheel filter alone enables success ✓")
-        elif baseline['success'] and wheel_only['success']:
+        elif baseline['success'] and wheel_only['success'] and comparable(baseline, wheel_only):
             if wheel_only['elapsed'] < baseline['elapsed']:
                 wheel_speedup = baseline['elapsed'] / wheel_only['elapsed']
                 print(f"Wheel filter speedup: {wheel_speedup:.2f}x")
@@ -349,7 +398,7 @@ def print_comparison_table(all_metrics: list):
     if baseline and z5d_only:
         if z5d_only['success'] and not baseline['success']:
             print("Z5D prior alone enables success ✓")
-        elif baseline['success'] and z5d_only['success']:
+        elif baseline['success'] and z5d_only['success'] and comparable(baseline, z5d_only):
             if z5d_only['elapsed'] < baseline['elapsed']:
                 z5d_speedup = baseline['elapsed'] / z5d_only['elapsed']
                 print(f"Z5D prior speedup: {z5d_speedup:.2f}x")
@@ -392,7 +441,8 @@ def main():
     all_metrics = []
     
     # Experiment 1: Baseline
-    m1 = run_baseline_experiment(
+    m1 = run_unit(
+        run_baseline_experiment,
         max_candidates=MAX_CANDIDATES,
         delta_window=DELTA_WINDOW,
         verbose=False  # Reduced verbosity for comparison
@@ -400,7 +450,8 @@ def main():
     all_metrics.append(m1)
     
     # Experiment 2: Wheel only
-    m2 = run_wheel_only_experiment(
+    m2 = run_unit(
+        run_wheel_only_experiment,
         max_candidates=MAX_CANDIDATES,
         delta_window=DELTA_WINDOW,
         verbose=False
@@ -408,7 +459,8 @@ def main():
     all_metrics.append(m2)
     
     # Experiment 3: Z5D prior only
-    m3 = run_z5d_prior_only_experiment(
+    m3 = run_unit(
+        run_z5d_prior_only_experiment,
         max_candidates=MAX_CANDIDATES,
         delta_window=DELTA_WINDOW,
         z5d_weight_beta=Z5D_BETA,
@@ -417,7 +469,8 @@ def main():
     all_metrics.append(m3)
     
     # Experiment 4: Full Z5D
-    m4 = run_full_z5d_experiment(
+    m4 = run_unit(
+        run_full_z5d_experiment,
         max_candidates=MAX_CANDIDATES,
         delta_window=DELTA_WINDOW,
         z5d_weight_beta=Z5D_BETA,
@@ -32,6 +32,7 @@ from wheel_residues import (
     count_admissible_in_range, effective_coverage, meets_gap_rule
 )
 from z5d_density_simulator import simulate_z5d_density, isqrt as z5d_isqrt
+from z5d_density_generator import segmented_sieve, iter_density_bins
 from baseline_fr_gva import baseline_fr_gva, adaptive_precision
 from z5d_enhanced_fr_gva import z5d_enhanced_fr_gva
 from comparison_experiment import (
@@ -170,6 +171,35 @@ class TestZ5DDensitySimulation:
             assert 0.5 * base_density <= density <= 1.5 * base_density
 
 
+class TestZ5DDensityGenerator:
+    """Test the segmented sieve behind the density histogram."""
+
+    def test_sieve_small_range(self):
+        """Exact primes below 100, including the base primes themselves."""
+        assert segmented_sieve(0, 100) == [
+            2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47,
+            53, 59, 61, 67, 71, 73, 79, 83, 89, 97
+        ]
+
+    def test_sieve_near_sqrt_challenge(self):
+        """Near √N₁₂₇ the ⁴√-sieve + Miller-Rabin must reject composites."""
+        sqrt_N = isqrt(CHALLENGE_127)
+        primes = segmented_sieve(sqrt_N - 2000, sqrt_N + 2000)
+        assert len(primes) > 0
+        for p in primes[:20]:
+            assert pow(2, p - 1, p) == 1
+            assert all(p % q for q in range(3, 2000, 2))
+
+    def test_density_bins_stream_in_order(self):
+        """Bins arrive ascending and cover every prime exactly once."""
+        sqrt_N = 10**12
+        bins = list(iter_density_bins(sqrt_N, 5000, 1000))
+        centers = [c for c, _ in bins]
+        assert centers == list(range(-5000, 6000, 1000))
+        streamed = [p for _, members in bins for p, _ in members]
+        assert streamed == segmented_sieve(sqrt_N - 5000, sqrt_N + 5000)
+
+
 class TestBaselineFRGVA:
     """Test baseline FR-GVA functionality."""
     
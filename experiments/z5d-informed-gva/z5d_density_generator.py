@@ -19,11 +19,16 @@ Validation range: [10^14, 10^18] per VALIDATION_GATES.md
 Whitelist: 127-bit CHALLENGE_127
 """
 
+import os
+import sys
 import mpmath as mp
+import numpy as np
 from math import log, sqrt, isqrt
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterator
 import csv
-import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from primality import is_prime, primes_up_to
 
 # Configure precision
 mp.mp.dps = 100
@@ -34,6 +39,11 @@ CHALLENGE_127 = 137524771864208156028430259349934309717
 # Analysis window parameters
 DELTA_WINDOW = 10**6  # ±1 million around √N
 BIN_WIDTH = 1000      # Histogram bin width in δ-space
+SEGMENT_SIZE = 1 << 18  # Sieve segment length (256 KiB bitmap, L2-sized)
+
+# Base primes are sieved exactly when √end is at most this; beyond it the
+# sieve stops at ⁴√end and survivors are certified by Miller-Rabin.
+FULL_SIEVE_LIMIT = 1 << 20
 
 
 def compute_sqrt_n(N: int) -> int:
@@ -49,127 +59,102 @@ def compute_sqrt_n(N: int) -> int:
     return isqrt(N)
 
 
+def iter_sieved_segments(start: int, end: int,
+                         segment_size: int = SEGMENT_SIZE) -> Iterator[Tuple[int, List[int]]]:
+    """
+    Segmented Sieve of Eratosthenes over [start, end], one segment at a time.
+
+    Composites are struck from a boolean bitmap with base primes up to
+    √end, or up to ⁴√end when √end is too large to sieve (≈3.4×10^9 near
+    √N₁₂₇). In the latter case survivors above (base limit)² are certified
+    with deterministic Miller-Rabin, so the output is exact either way.
+
+    Args:
+        start: Start of range (inclusive)
+        end: End of range (inclusive)
+        segment_size: Integers per segment
+
+    Yields:
+        (segment_end, primes) with segment_end exclusive and primes ascending
+    """
+    start = max(start, 2)
+    if start > end:
+        return
+
+    root = isqrt(end)
+    base_limit = root if root <= FULL_SIEVE_LIMIT else isqrt(root)
+    base_primes = primes_up_to(base_limit)
+    certified_below = base_limit * base_limit
+
+    for lo in range(start, end + 1, segment_size):
+        hi = min(lo + segment_size, end + 1)
+        is_candidate = np.ones(hi - lo, dtype=bool)
+        for p in base_primes.tolist():
+            first = max(p * p, lo + (-lo) % p)
+            if first >= hi:
+                continue
+            is_candidate[first - lo::p] = False
+
+        primes = [lo + int(i) for i in np.flatnonzero(is_candidate)]
+        if hi - 1 > certified_below:
+            primes = [q for q in primes if q <= certified_below or is_prime(q)]
+        yield hi, primes
+
+
 def segmented_sieve(start: int, end: int) -> List[int]:
     """
-    Generate all primes in [start, end] using segmented sieve.
-    
-    For the 127-bit challenge scale (~10^19), we need to:
-    1. Handle very large numbers
-    2. Work in segments to manage memory
-    3. Use wheel factorization for efficiency
-    
+    Generate all primes in [start, end] using a segmented sieve.
+
     Args:
         start: Start of range (inclusive)
         end: End of range (inclusive)
-        
+
     Returns:
         List of primes in [start, end]
     """
-    # For a window this large (~2×10^6), we use trial division
-    # with wheel mod 30 for first pass, then primality test
-    
-    # Wheel mod 30: skip multiples of 2, 3, 5
-    # Residues: 1, 7, 11, 13, 17, 19, 23, 29
-    wheel_30 = [1, 7, 11, 13, 17, 19, 23, 29]
-    
     primes = []
-    
-    # Adjust start to first valid residue
-    start_val = start
-    if start_val % 2 == 0:
-        start_val += 1
-    
-    for n in range(start_val, end + 1, 2):
-        if is_prime_trial(n):
-            primes.append(n)
-    
+    for _, segment_primes in iter_sieved_segments(start, end):
+        primes.extend(segment_primes)
     return primes
 
 
-def is_prime_trial(n: int, limit: int = 10000) -> bool:
-    """
-    Primality test using trial division up to sqrt(n) or limit.
-    
-    For numbers near √N₁₂₇ ≈ 1.17×10^19, we only need to check divisors
-    up to √(√N₁₂₇) ≈ 3.4×10^9. However, for practical purposes and since
-    we're in the [10^14, 10^18] operational range, we use a reasonable limit.
-    
-    Args:
-        n: Number to test
-        limit: Maximum trial divisor
-        
-    Returns:
-        True if n is probably prime (no divisors found up to limit)
+def iter_density_bins(sqrt_N: int, window: int,
+                      bin_width: int) -> Iterator[Tuple[int, List[Tuple[int, int]]]]:
     """
-    if n < 2:
-        return False
-    if n == 2:
-        return True
-    if n % 2 == 0:
-        return False
-    if n == 3:
-        return True
-    if n % 3 == 0:
-        return False
-    
-    # Check 6k±1 up to min(sqrt(n), limit)
-    i = 5
-    sqrt_n = isqrt(n)
-    max_check = min(sqrt_n, limit)
-    
-    while i <= max_check:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    
-    return True
+    Stream histogram bins of δ = p - √N over [√N - window, √N + window].
 
+    A bin is emitted as soon as the sieve has passed its upper edge, so
+    consumers see results while later segments are still being sieved.
 
-def miller_rabin(n: int, k: int = 20) -> bool:
-    """
-    Miller-Rabin primality test.
-    
-    For very large numbers, use probabilistic test.
-    k rounds gives error probability ≤ 4^(-k).
-    
     Args:
-        n: Number to test
-        k: Number of test rounds
-        
-    Returns:
-        True if n is probably prime
+        sqrt_N: Floor of √N
+        window: Half-width of the window
+        bin_width: Histogram bin width
+
+    Yields:
+        (bin_center, [(p, delta)]) in ascending bin order, empty bins included
     """
-    if n < 2:
-        return False
-    if n == 2 or n == 3:
-        return True
-    if n % 2 == 0:
-        return False
-    
-    # Write n-1 as 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-    
-    # Witness loop
-    random.seed(42)  # Deterministic for reproducibility
-    
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = pow(a, d, n)
-        
-        if x == 1 or x == n - 1:
-            continue
-        
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    
-    return True
+    start = sqrt_N - window
+    end = sqrt_N + window
+    current_bin = ((start - sqrt_N) // bin_width) * bin_width
+    members: List[Tuple[int, int]] = []
+
+    for segment_end, primes in iter_sieved_segments(start, end):
+        for p in primes:
+            delta = p - sqrt_N
+            while delta >= current_bin + bin_width:
+                yield current_bin, members
+                current_bin += bin_width
+                members = []
+            members.append((p, delta))
+        # Bins entirely below the sieved frontier are complete.
+        while sqrt_N + current_bin + bin_width <= segment_end:
+            yield current_bin, members
+            current_bin += bin_width
+            members = []
+
+    if sqrt_N + current_bin <= end:
+        yield current_bin, members
 
 
 def generate_prime_density_data(N: int, window: int, bin_width: int) -> Tuple[int, List[Tuple[int, int]], Dict[int, int]]:
@@ -199,63 +184,25 @@ def generate_prime_density_data(N: int, window: int, bin_width: int) -> Tuple[in
     print(f"Window span: {2 * window:,}")
     print()
     
-    # For very large numbers near 10^19, we need a more sophisticated approach
-    # Since we're in simulation mode, we'll use a simplified model:
-    # Generate representative primes using primality testing
-    
     print("Generating prime density profile...")
-    print("(Using Miller-Rabin primality testing for large numbers)")
+    print("(Segmented sieve to ⁴√end + deterministic Miller-Rabin)")
     print()
     
     primes_and_deltas = []
+    histogram = {}
     
-    # Sample candidates from the range
-    # Use wheel mod 210 (residues coprime to 2,3,5,7) for efficiency
-    wheel_210 = [
-        1, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47,
-        53, 59, 61, 67, 71, 73, 79, 83, 89, 97, 101, 103,
-        107, 109, 113, 121, 127, 131, 137, 139, 143, 149, 151,
-        157, 163, 167, 169, 173, 179, 181, 187, 191, 193, 197,
-        199, 209
-    ]
-    
-    # Scan the range using wheel
-    candidate_count = 0
-    prime_count = 0
-    
-    # Find starting point aligned to wheel
-    base = (start // 210) * 210
-    
-    for offset in range(base - 210, end + 210, 210):
-        for residue in wheel_210:
-            candidate = offset + residue
-            
-            if candidate < start:
-                continue
-            if candidate > end:
-                break
-            
-            candidate_count += 1
-            
-            # Test primality
-            if miller_rabin(candidate, k=20):
-                delta = candidate - sqrt_N
-                primes_and_deltas.append((candidate, delta))
-                prime_count += 1
-            
-            if candidate_count % 10000 == 0:
-                print(f"  Tested {candidate_count:,} candidates, found {prime_count:,} primes")
+    for bin_center, members in iter_density_bins(sqrt_N, window, bin_width):
+        primes_and_deltas.extend(members)
+        if members:
+            histogram[bin_center] = len(members)
+        if len(histogram) % 100 == 0 and members:
+            print(f"  Binned δ < {bin_center + bin_width:,}, found {len(primes_and_deltas):,} primes")
     
+    prime_count = len(primes_and_deltas)
     print(f"\nTotal: {prime_count:,} primes found in window")
     print(f"Prime density: {prime_count / (2 * window):.2e} primes per unit")
     print()
     
-    # Build histogram
-    histogram = {}
-    for p, delta in primes_and_deltas:
-        bin_center = (delta // bin_width) * bin_width
-        histogram[bin_center] = histogram.get(bin_center, 0) + 1
-    
     print(f"Histogram bins: {len(histogram)}")
     
     return sqrt_N, primes_and_deltas, histogram
@@ -0,0 +1,324 @@
+"""
+Geodesic Embedding Kernels
+==========================
+
+The 7D torus embedding and Riemannian distance of the GVA engines, shared by
+gva_factorization, verify_solution and the experiments that used to carry
+their own copies.
+
+    c_d(n) = frac(frac(n·φ^(d+1))^k),  d = 0 .. dimensions−1
+    dist(a, b) = √Σ min(|a_d − b_d|, 1 − |a_d − b_d|)²
+
+Three paths compute the same geometry:
+
+- mpmath (embed_torus_geodesic, riemannian_distance): the reference
+  arithmetic at the working precision of a context (default: the global
+  mp.mp). φ^(d+1) is computed once per precision and reused, so each call
+  costs only the fmod/power per coordinate. Values are identical to the
+  former per-module copies.
+- float (embed_float, torus_distances_float): NumPy batch for many
+  integers. The phase frac(n·φ^j) is reduced exactly in integer arithmetic
+  against a fixed-point φ^j with n.bit_length() + 64 fractional bits;
+  everything after that is float64, accurate to float64 rounding.
+- fixed (embed_fixed, torus_distance_fixed): coordinates as integers
+  ⌊c_d·2^bits⌋ (within one unit), distances as exact integer arithmetic on
+  them (⌊dist·2^bits⌋). Only the power x^k runs in mpmath, at bits + 32
+  bits instead of the adaptive precision.
+
+geodesic_distances(N, candidates, k, method=...) runs any of them for one N
+against a batch of candidates, distance_matrix for several k at once. Float
+and fixed paths take non-negative integers.
+
+Usage (repo root on sys.path):
+
+    from geofac.kernels import embed_torus_geodesic, riemannian_distance
+"""
+
+from functools import lru_cache
+from math import isqrt
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import mpmath as mp
+import numpy as np
+from mpmath.ctx_mp import MPContext
+
+DEFAULT_DIMENSIONS = 7
+FIXED_BITS = 64
+METHODS = ('mp', 'float', 'fixed')
+
+# Fractional bits of the fixed-point φ^j beyond n.bit_length()
+FLOAT_GUARD_BITS = 64
+FIXED_GUARD_BITS = 32
+
+_FLOAT_MANTISSA_BITS = 53
+_PHI_POWERS: Dict[Tuple[int, int], Tuple[tuple, ...]] = {}
+
+
+def phi_powers(dimensions: int = DEFAULT_DIMENSIONS,
+               ctx: Optional[MPContext] = None) -> List[mp.mpf]:
+    """
+    φ^1 .. φ^dimensions at the context's working precision (cached per precision).
+
+    Args:
+        dimensions: Number of powers
+        ctx: mpmath context (default: the global mp.mp)
+
+    Returns:
+        Powers as mpf values of ctx
+    """
+    ctx = ctx if ctx is not None else mp.mp
+    key = (ctx.prec, dimensions)
+    powers = _PHI_POWERS.get(key)
+    if powers is None:
+        phi = ctx.mpf(1 + ctx.sqrt(5)) / 2
+        powers = tuple((phi ** (d + 1))._mpf_ for d in range(dimensions))
+        _PHI_POWERS[key] = powers
+    return [ctx.make_mpf(power) for power in powers]
+
+
+def embed_torus_geodesic(n: int, k: float, dimensions: int = DEFAULT_DIMENSIONS,
+                         ctx: Optional[MPContext] = None) -> List[mp.mpf]:
+    """
+    Embed integer n into a 7D torus using geodesic mapping.
+
+    Args:
+        n: Integer to embed
+        k: Geodesic exponent (typically in [0.25, 0.45])
+        dimensions: Torus dimensions (default 7)
+        ctx: mpmath context to compute in (default: the global mp.mp)
+
+    Returns:
+        List of coordinates in the torus [0,1)^dimensions
+    """
+    ctx = ctx if ctx is not None else mp.mp
+    coords = []
+    for phi_power in phi_powers(dimensions, ctx):
+        coord = ctx.fmod(n * phi_power, 1)
+        if k != 1.0:
+            coord = ctx.fmod(ctx.power(coord, k), 1)
+        coords.append(coord)
+    return coords
+
+
+def riemannian_distance(p1: Sequence[mp.mpf], p2: Sequence[mp.mpf],
+                        ctx: Optional[MPContext] = None) -> mp.mpf:
+    """
+    Flat torus distance with periodic boundaries.
+
+    Args:
+        p1: First point coordinates
+        p2: Second point coordinates
+        ctx: mpmath context to compute in (default: the global mp.mp)
+
+    Returns:
+        Riemannian distance
+    """
+    if len(p1) != len(p2):
+        raise ValueError("Points must have same dimension")
+
+    ctx = ctx if ctx is not None else mp.mp
+    dist_sq = ctx.mpf(0)
+    for c1, c2 in zip(p1, p2):
+        diff = abs(c1 - c2)
+        min_diff = min(diff, ctx.mpf(1) - diff)
+        dist_sq += min_diff * min_diff
+    return ctx.sqrt(dist_sq)
+
+
+@lru_cache(maxsize=None)
+def _phi_fixed(frac_bits: int, dimensions: int) -> Tuple[int, ...]:
+    """⌊φ^j·2^frac_bits⌋ for j = 1 .. dimensions."""
+    ctx = mp.mp.clone()
+    ctx.prec = frac_bits + 64
+    phi = (1 + ctx.sqrt(5)) / 2
+    return tuple(int(ctx.floor(ctx.ldexp(phi ** j, frac_bits)))
+                 for j in range(1, dimensions + 1))
+
+
+def _phase_bits(bit_length: int, guard_bits: int) -> int:
+    # Rounded up to whole 64-bit words so the φ table cache stays small
+    return -(-(bit_length + guard_bits) // 64) * 64
+
+
+def _phases(n: int, frac_bits: int, dimensions: int) -> List[int]:
+    """frac(n·φ^j)·2^frac_bits for each j, truncated (error below 2^-guard)."""
+    mask = (1 << frac_bits) - 1
+    return [(n * power) & mask for power in _phi_fixed(frac_bits, dimensions)]
+
+
+def _phases_float(values: List[int], dimensions: int) -> np.ndarray:
+    """frac(n·φ^j) as float64 (truncated to 53 bits), shape (len(values), dimensions)."""
+    frac_bits = _phase_bits(max((n.bit_length() for n in values), default=0),
+                            FLOAT_GUARD_BITS)
+    shift = frac_bits - _FLOAT_MANTISSA_BITS
+    phases = np.array([[phase >> shift for phase in _phases(n, frac_bits, dimensions)]
+                       for n in values], dtype=np.float64).reshape(len(values), dimensions)
+    return np.ldexp(phases, -_FLOAT_MANTISSA_BITS)
+
+
+def _warp(phases: np.ndarray, k: float) -> np.ndarray:
+    return np.fmod(np.power(phases, k), 1.0) if k != 1.0 else phases
+
+
+def embed_float(values: Iterable[int], k: float,
+                dimensions: int = DEFAULT_DIMENSIONS) -> np.ndarray:
+    """
+    float64 embeddings of many non-negative integers.
+
+    Args:
+        values: Integers to embed
+        k: Geodesic exponent
+        dimensions: Torus dimensions
+
+    Returns:
+        Array of shape (len(values), dimensions)
+    """
+    return _warp(_phases_float([int(n) for n in values], dimensions), k)
+
+
+def torus_distances_float(point: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    float64 torus distances from one embedding to each row of points.
+
+    Args:
+        point: Embedding of shape (dimensions,)
+        points: Embeddings of shape (m, dimensions)
+
+    Returns:
+        Distances of shape (m,)
+    """
+    diff = np.abs(np.asarray(points) - np.asarray(point))
+    diff = np.minimum(diff, 1.0 - diff)
+    return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+
+@lru_cache(maxsize=None)
+def _fixed_context(bits: int) -> MPContext:
+    ctx = mp.mp.clone()
+    ctx.prec = bits + FIXED_GUARD_BITS
+    return ctx
+
+
+def embed_fixed(n: int, k: float, dimensions: int = DEFAULT_DIMENSIONS,
+                bits: int = FIXED_BITS) -> Tuple[int, ...]:
+    """
+    Fixed-point embedding: coordinates as integers ⌊c_d·2^bits⌋.
+
+    Args:
+        n: Non-negative integer to embed
+        k: Geodesic exponent
+        dimensions: Torus dimensions
+        bits: Fractional bits of the coordinates
+
+    Returns:
+        Coordinates in [0, 2^bits)
+    """
+    frac_bits = _phase_bits(n.bit_length() + bits, FIXED_GUARD_BITS)
+    phases = _phases(n, frac_bits, dimensions)
+    if k == 1.0:
+        return tuple(phase >> (frac_bits - bits) for phase in phases)
+
+    ctx = _fixed_context(bits)
+    mask = (1 << bits) - 1
+    # x ** k rounds at the context's precision without changing it (thread-safe)
+    return tuple(int(ctx.floor(ctx.ldexp(ctx.ldexp(phase, -frac_bits) ** k, bits))) & mask
+                 for phase in phases)
+
+
+def torus_distance_fixed(p1: Sequence[int], p2: Sequence[int], bits: int = FIXED_BITS) -> int:
+    """
+    Exact torus distance between fixed-point embeddings.
+
+    Args:
+        p1: First point (from embed_fixed)
+        p2: Second point (from embed_fixed)
+        bits: Fractional bits of the coordinates
+
+    Returns:
+        ⌊dist·2^bits⌋
+    """
+    if len(p1) != len(p2):
+        raise ValueError("Points must have same dimension")
+
+    one = 1 << bits
+    dist_sq = 0
+    for c1, c2 in zip(p1, p2):
+        diff = abs(c1 - c2)
+        diff = min(diff, one - diff)
+        dist_sq += diff * diff
+    return isqrt(dist_sq)
+
+
+def geodesic_distances(N: int, candidates: Iterable[int], k: float,
+                       dimensions: int = DEFAULT_DIMENSIONS, method: str = 'float',
+                       ctx: Optional[MPContext] = None,
+                       bits: int = FIXED_BITS) -> np.ndarray:
+    """
+    Distances from N's embedding to each candidate's.
+
+    Args:
+        N: Target integer
+        candidates: Integers to compare against N
+        k: Geodesic exponent
+        dimensions: Torus dimensions
+        method: 'mp' (reference, at ctx precision), 'float' (NumPy batch) or
+            'fixed' (integer fixed point)
+        ctx: mpmath context for method='mp' (default: the global mp.mp)
+        bits: Fractional bits for method='fixed'
+
+    Returns:
+        float64 distances aligned with candidates
+    """
+    candidates = list(candidates)
+    if method == 'mp':
+        reference = embed_torus_geodesic(N, k, dimensions, ctx)
+        return np.array([float(riemannian_distance(reference,
+                                                   embed_torus_geodesic(c, k, dimensions, ctx),
+                                                   ctx))
+                         for c in candidates], dtype=np.float64)
+    if method == 'float':
+        coords = embed_float([N] + candidates, k, dimensions)
+        return torus_distances_float(coords[0], coords[1:])
+    if method == 'fixed':
+        reference = embed_fixed(N, k, dimensions, bits)
+        return np.ldexp(np.array([torus_distance_fixed(reference, embed_fixed(c, k, dimensions, bits),
+                                                       bits)
+                                  for c in candidates], dtype=np.float64), -bits)
+    raise ValueError(f"Unknown method {method!r}; expected one of {METHODS}")
+
+
+def distance_matrix(N: int, candidates: Iterable[int], k_values: Sequence[float],
+                    dimensions: int = DEFAULT_DIMENSIONS, method: str = 'float',
+                    ctx: Optional[MPContext] = None,
+                    bits: int = FIXED_BITS) -> np.ndarray:
+    """
+    Distances from N to each candidate for several geodesic exponents.
+
+    N is embedded once per k; on the float path the phases frac(n·φ^j) are
+    reduced once for all k.
+
+    Args:
+        N: Target integer
+        candidates: Integers to compare against N
+        k_values: Geodesic exponents (one column each)
+        dimensions: Torus dimensions
+        method: 'mp', 'float' or 'fixed' (see geodesic_distances)
+        ctx: mpmath context for method='mp'
+        bits: Fractional bits for method='fixed'
+
+    Returns:
+        float64 array of shape (len(candidates), len(k_values))
+    """
+    candidates = list(candidates)
+    if method == 'float':
+        phases = _phases_float([int(N)] + [int(c) for c in candidates], dimensions)
+        columns = []
+        for k in k_values:
+            coords = _warp(phases, k)
+            columns.append(torus_distances_float(coords[0], coords[1:]))
+    else:
+        columns = [geodesic_distances(N, candidates, k, dimensions, method, ctx, bits)
+                   for k in k_values]
+    if not columns:
+        return np.empty((len(candidates), 0))
+    return np.stack(columns, axis=1)
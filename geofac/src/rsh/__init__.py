@@ -4,15 +4,26 @@ Resonant Slope Hunter (RSH) package.
 Exports the main factorization entry point and helper utilities.
 """
 
-from .core import factorize_rsh  # noqa: F401
+from .core import factorize_rsh, scan_window  # noqa: F401
 from .signal import generate_error_signal  # noqa: F401
 from .frequency import detect_local_frequency, estimate_chirp  # noqa: F401
 from .slope import derive_candidates  # noqa: F401
+from .multistart import (  # noqa: F401
+    RSHConfig,
+    build_config_grid,
+    factorize_rsh_multistart,
+    iter_rsh_multistart,
+)
 
 __all__ = [
     "factorize_rsh",
+    "scan_window",
     "generate_error_signal",
     "detect_local_frequency",
     "estimate_chirp",
     "derive_candidates",
+    "RSHConfig",
+    "build_config_grid",
+    "factorize_rsh_multistart",
+    "iter_rsh_multistart",
 ]
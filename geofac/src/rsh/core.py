@@ -22,6 +22,50 @@ def _ceil_sqrt(n: int) -> int:
     return root if root * root == n else root + 1
 
 
+def scan_window(
+    n: int,
+    a0: int,
+    window_size: int,
+    target_phases: Iterable[float] | None = None,
+    max_period_multiples: int = 10,
+    detector: DetectorFn = detect_local_frequency,
+    chirp_extrapolate: bool = False,
+) -> List[Tuple[int, int]]:
+    """
+    Run one RSH window starting at a0 and return every verified pair.
+
+    Args:
+        n: Target integer.
+        a0: First x of the error-signal window.
+        window_size: Number of samples in the window.
+        target_phases: Phase alignments to try.
+        max_period_multiples: How many period jumps (m/freq) to attempt.
+        detector: Function that returns (freq, phase) from the signal window.
+        chirp_extrapolate: If True, add chirp-extrapolated candidates.
+
+    Returns:
+        Unique (p, q) pairs (p <= q) with p * q == n, in discovery order.
+    """
+    signal = generate_error_signal(n, a0, window_size)
+    freq, phase = detector(signal)
+
+    # Optional chirp fit for highly unbalanced cases.
+    chirp_params = None
+    if chirp_extrapolate:
+        chirp_params = estimate_chirp(signal, k_offset=0.0)
+
+    return derive_candidates(
+        n=n,
+        a0=a0,
+        window_size=window_size,
+        freq=freq,
+        phase=phase,
+        target_phases=target_phases,
+        max_period_multiples=max_period_multiples,
+        chirp_params=chirp_params,
+    )
+
+
 def factorize_rsh(
     n: int,
     window_size: int = 256,
@@ -60,23 +104,14 @@ def factorize_rsh(
 
     a0 = x_start if x_start is not None else _ceil_sqrt(n)
 
-    signal = generate_error_signal(n, a0, window_size)
-    freq, phase = detector(signal)
-
-    # Optional chirp fit for highly unbalanced cases.
-    chirp_params = None
-    if chirp_extrapolate:
-        chirp_params = estimate_chirp(signal, k_offset=0.0)
-
-    candidates = derive_candidates(
+    candidates = scan_window(
         n=n,
         a0=a0,
         window_size=window_size,
-        freq=freq,
-        phase=phase,
         target_phases=target_phases,
         max_period_multiples=max_period_multiples,
-        chirp_params=chirp_params,
+        detector=detector,
+        chirp_extrapolate=chirp_extrapolate,
     )
 
     if not candidates:
@@ -62,16 +62,96 @@ def detect_local_frequency(signal: np.ndarray) -> Tuple[float, float]:
     return dominant_freq, dominant_phase
 
 
-def estimate_chirp(signal: np.ndarray, k_offset: float = 0.0) -> Tuple[float, float] | None:
+# Cap on points entering the pairwise-slope median (O(n^2) pairs).
+_MAX_THEIL_SEN_POINTS = 512
+# Fraction of the window dropped at each end of the phase fit (Hilbert edge effects)
+_PHASE_FIT_TRIM = 0.05
+
+
+def _fit_inverse_square_line(
+    t: np.ndarray, inst_freq: np.ndarray
+) -> Tuple[float, float] | None:
+    """
+    Closed-form chirp fit via the linearisation 1/f^2 = (t + k0) / c^2.
+
+    A Theil-Sen line y = alpha*t + beta through y = 1/f^2 recovers
+    c = 1/sqrt(alpha) and k0 = beta/alpha. The median of pairwise slopes
+    shrugs off the Hilbert edge artefacts that wreck an ordinary
+    least-squares line after the 1/f^2 transform.
+
+    Returns:
+        (c, k0) or None when the line is degenerate.
+    """
+    y = 1.0 / (inst_freq * inst_freq)
+    step = max(1, -(-len(t) // _MAX_THEIL_SEN_POINTS))
+    t_sub, y_sub = t[::step], y[::step]
+    i, j = np.triu_indices(len(t_sub), k=1)
+    alpha = float(np.median((y_sub[j] - y_sub[i]) / (t_sub[j] - t_sub[i])))
+    if not np.isfinite(alpha) or alpha <= 0:
+        return None
+    beta = float(np.median(y - alpha * t))
+    return float(1.0 / np.sqrt(alpha)), beta / alpha
+
+
+def _refine_on_phase(
+    phase: np.ndarray, k_offset: float, c_est: float, k0_est: float
+) -> Tuple[float, float] | None:
+    """
+    Least-squares fit of the integrated chirp to the unwrapped phase.
+
+    Phase(k) = 4*pi*c*sqrt(k + k0) + phi0 integrates the noise that
+    differentiation into an instantaneous frequency amplifies, so it is a
+    better-conditioned polish of the Theil-Sen estimate.
+
+    Returns:
+        (c, k0), or None if the fit fails or leaves the valid region.
+    """
+    trim = int(len(phase) * _PHASE_FIT_TRIM)
+    t = np.arange(len(phase), dtype=float)[trim:len(phase) - trim] + k_offset
+    y = phase[trim:len(phase) - trim]
+    if len(t) < 4:
+        return None
+
+    def model(t_val, c, k0, phi0):
+        return 4.0 * np.pi * c * np.sqrt(t_val + k0) + phi0
+
+    phi0 = float(y[0] - 4.0 * np.pi * c_est * np.sqrt(t[0] + k0_est))
+    try:
+        popt, _ = curve_fit(
+            model,
+            t,
+            y,
+            p0=(c_est, k0_est, phi0),
+            bounds=([0.0, 1e-6, -np.inf], [np.inf, np.inf, np.inf]),
+            maxfev=400,
+        )
+    except (RuntimeError, ValueError):
+        return None
+    c_fit, k0_fit = float(popt[0]), float(popt[1])
+    if not (np.isfinite(c_fit) and np.isfinite(k0_fit) and c_fit > 0 and k0_fit > 0):
+        return None
+    return c_fit, k0_fit
+
+
+def estimate_chirp(
+    signal: np.ndarray, k_offset: float = 0.0, refine: bool = False
+) -> Tuple[float, float] | None:
     """
     Estimate reciprocal-sqrt chirp parameters from instantaneous frequency.
 
     Model: f_inst(k) = c / sqrt(k + k0)
 
+    The estimate comes from one Theil-Sen solve on the linearised model
+    1/f^2 = (k + k0)/c^2, so no iterative optimiser runs by default.
+
     Args:
         signal: Real 1-D error signal window.
         k_offset: Offset to add to the sample index (useful when the window
             is not starting at k=0 in the global search).
+        refine: If True, polish the closed-form estimate with a short
+            nonlinear least-squares fit of the integrated model to the
+            unwrapped phase; if that fit fails, the closed-form estimate
+            is returned.
 
     Returns:
         (c, k0) if a fit succeeds, else None.
@@ -95,26 +175,16 @@ def estimate_chirp(signal: np.ndarray, k_offset: float = 0.0) -> Tuple[float, fl
     inst_freq = inst_freq[valid]
     t = t[valid]
 
-    def model(t_val, c, k0):
-        return c / np.sqrt(t_val + k0)
-
-    f0 = float(inst_freq[0])
-    c_init = f0 * np.sqrt(t[0] + 1.0)
-    k0_init = max(1e-3, (c_init / max(f0, 1e-6)) ** 2 - t[0])
-
-    try:
-        popt, _ = curve_fit(
-            model,
-            t,
-            inst_freq,
-            p0=(c_init, k0_init),
-            bounds=([0.0, 1e-6], [np.inf, np.inf]),
-            maxfev=20000,
-        )
-    except Exception:
+    estimate = _fit_inverse_square_line(t, inst_freq)
+    if estimate is None:
         return None
+    c_est, k0_est = estimate
+
+    if refine:
+        polished = _refine_on_phase(phase, float(k_offset), c_est, max(k0_est, 1e-3))
+        if polished is not None:
+            c_est, k0_est = polished
 
-    c_est, k0_est = float(popt[0]), float(popt[1])
     if not np.isfinite(c_est) or not np.isfinite(k0_est) or k0_est <= 0:
         return None
     return c_est, k0_est
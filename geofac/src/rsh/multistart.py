@@ -0,0 +1,196 @@
+"""
+Multi-start driver for Resonant Slope Hunter.
+
+Shards a grid of (x_start, window_size, target_phases) configurations across
+a process pool, streams candidate pairs back as windows finish, and stops on
+the first verified (p, q). Per-configuration timing and hit counts are kept
+so the grid can be tuned for throughput.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+from .core import _ceil_sqrt, scan_window
+
+
+@dataclass(frozen=True)
+class RSHConfig:
+    """One RSH window: where it starts, how long it is, which phases it tries."""
+
+    x_start: int
+    window_size: int
+    target_phases: Tuple[float, ...] | None = None
+
+
+@dataclass
+class ConfigResult:
+    """Outcome of running one configuration."""
+
+    config: RSHConfig
+    candidates: List[Tuple[int, int]]
+    elapsed_s: float
+
+    @property
+    def hit(self) -> bool:
+        return bool(self.candidates)
+
+
+@dataclass
+class MultiStartReport:
+    """Summary of a multi-start run."""
+
+    factors: Tuple[int, int] | None
+    results: List[ConfigResult] = field(default_factory=list)
+    configs_total: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def configs_run(self) -> int:
+        return len(self.results)
+
+    @property
+    def hit_rate(self) -> float:
+        if not self.results:
+            return 0.0
+        return sum(r.hit for r in self.results) / len(self.results)
+
+
+def build_config_grid(
+    n: int,
+    x_offsets: Iterable[int],
+    window_sizes: Iterable[int],
+    phase_sets: Iterable[Sequence[float] | None] = (None,),
+) -> List[RSHConfig]:
+    """
+    Cartesian grid of configurations anchored at ceil(sqrt(n)).
+
+    Args:
+        n: Target integer.
+        x_offsets: Offsets added to ceil(sqrt(n)) for each window start.
+        window_sizes: Window lengths to try.
+        phase_sets: Target-phase tuples (None means the RSH default set).
+
+    Returns:
+        Configurations ordered offset-major, then window size, then phases.
+    """
+    a0 = _ceil_sqrt(n)
+    phases = [tuple(p) if p is not None else None for p in phase_sets]
+    return [
+        RSHConfig(x_start=a0 + off, window_size=w, target_phases=ph)
+        for off, w, ph in itertools.product(x_offsets, window_sizes, phases)
+    ]
+
+
+def _run_config(
+    n: int,
+    config: RSHConfig,
+    max_period_multiples: int,
+    chirp_extrapolate: bool,
+) -> ConfigResult:
+    start = time.perf_counter()
+    candidates = scan_window(
+        n=n,
+        a0=config.x_start,
+        window_size=config.window_size,
+        target_phases=config.target_phases,
+        max_period_multiples=max_period_multiples,
+        chirp_extrapolate=chirp_extrapolate,
+    )
+    verified = [(p, q) for p, q in candidates if p * q == n]
+    return ConfigResult(config, verified, time.perf_counter() - start)
+
+
+def iter_rsh_multistart(
+    n: int,
+    configs: Sequence[RSHConfig],
+    max_workers: int | None = None,
+    max_period_multiples: int = 10,
+    chirp_extrapolate: bool = False,
+) -> Iterator[ConfigResult]:
+    """
+    Run configurations on a process pool and yield results as they finish.
+
+    At most 2 * max_workers configurations are in flight, so closing the
+    generator (e.g. after the first hit) leaves little queued work behind;
+    pending configurations are cancelled when the generator exits.
+
+    Args:
+        n: Target integer (>= 4).
+        configs: Configurations to run, in submission priority order.
+        max_workers: Pool size (defaults to os.cpu_count()).
+        max_period_multiples: Passed to every window.
+        chirp_extrapolate: Passed to every window.
+
+    Yields:
+        ConfigResult per configuration, in completion order.
+    """
+    if n < 4:
+        raise ValueError("n must be composite (>= 4).")
+
+    workers = max_workers or os.cpu_count() or 1
+    in_flight_cap = 2 * workers
+    queue = iter(configs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        try:
+            while True:
+                for config in itertools.islice(queue, in_flight_cap - len(pending)):
+                    pending.add(
+                        pool.submit(
+                            _run_config, n, config, max_period_multiples, chirp_extrapolate
+                        )
+                    )
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def factorize_rsh_multistart(
+    n: int,
+    configs: Sequence[RSHConfig],
+    max_workers: int | None = None,
+    max_period_multiples: int = 10,
+    chirp_extrapolate: bool = False,
+) -> MultiStartReport:
+    """
+    Multi-start RSH: stop at the first configuration yielding a verified pair.
+
+    Args:
+        n: Target integer (>= 4).
+        configs: Configurations to run, in priority order.
+        max_workers: Pool size.
+        max_period_multiples: Passed to every window.
+        chirp_extrapolate: Passed to every window.
+
+    Returns:
+        MultiStartReport with the smallest verified pair of the first hit
+        (or None) and per-configuration results for every window that ran.
+    """
+    start = time.perf_counter()
+    report = MultiStartReport(factors=None, configs_total=len(configs))
+    stream = iter_rsh_multistart(
+        n,
+        configs,
+        max_workers=max_workers,
+        max_period_multiples=max_period_multiples,
+        chirp_extrapolate=chirp_extrapolate,
+    )
+    for result in stream:
+        report.results.append(result)
+        if result.hit:
+            report.factors = min(result.candidates)
+            stream.close()
+            break
+    report.elapsed_s = time.perf_counter() - start
+    return report
@@ -10,25 +10,37 @@ from typing import Iterable, List, Tuple
 import numpy as np
 
 
-def _candidate_from_k(n: int, a0: int, k_estimate: float) -> Tuple[int, int] | None:
+# Quadratic-residue tables: delta = a^2 - n is rejected as a non-square as soon
+# as its residue modulo any of these moduli is a non-residue. Together they
+# pass only ~1% of non-squares on to the exact isqrt check.
+_QR_MODULI = (64, 63, 65, 11)
+_QR_TABLES = {}
+for _m in _QR_MODULI:
+    _table = np.zeros(_m, dtype=bool)
+    _table[(np.arange(_m, dtype=np.int64) ** 2) % _m] = True
+    _QR_TABLES[_m] = _table
+
+# Offsets beyond this magnitude skip the residue filter (int64 headroom).
+_MAX_FILTER_OFFSET = 2**53
+
+
+def _candidate_from_a(n: int, a: int) -> Tuple[int, int] | None:
     """
-    Convert a k-position estimate into a factor candidate using Fermat form.
+    Test a single Fermat x-coordinate exactly.
 
     Args:
         n: Target integer.
-        a0: ceil(sqrt(n)) reference.
-        k_estimate: Estimated position offset (1-indexed within the window).
+        a: Candidate x with a^2 - n hopefully a perfect square.
 
     Returns:
-        (p, q) if a perfect square is found, else None.
+        (p, q) if a^2 - n is a perfect square yielding a divisor, else None.
     """
-    a = a0 + int(round(k_estimate)) - 1
     if a <= 1:
         return None
     delta = a * a - n
     if delta < 0:
         return None
-    b = int(round(math.isqrt(delta)))
+    b = math.isqrt(delta)
     if b * b != delta:
         return None
     p = a - b
@@ -40,6 +52,86 @@ def _candidate_from_k(n: int, a0: int, k_estimate: float) -> Tuple[int, int] | N
     return (p, q) if p <= q else (q, p)
 
 
+def _candidate_from_k(n: int, a0: int, k_estimate: float) -> Tuple[int, int] | None:
+    """
+    Convert a k-position estimate into a factor candidate using Fermat form.
+
+    Args:
+        n: Target integer.
+        a0: ceil(sqrt(n)) reference.
+        k_estimate: Estimated position offset (1-indexed within the window).
+
+    Returns:
+        (p, q) if a perfect square is found, else None.
+    """
+    return _candidate_from_a(n, a0 + int(round(k_estimate)) - 1)
+
+
+def _square_residue_mask(n: int, a0: int, offsets: np.ndarray) -> np.ndarray:
+    """
+    Residue prefilter for a^2 - n over a = a0 + offsets.
+
+    Works on residues only, so it is exact for arbitrarily large n and a0.
+
+    Args:
+        n: Target integer.
+        a0: Reference x-coordinate.
+        offsets: int64 array of offsets from a0.
+
+    Returns:
+        Boolean mask; False entries are certainly not perfect squares.
+    """
+    mask = np.ones(len(offsets), dtype=bool)
+    for m in _QR_MODULI:
+        r = (offsets % m + a0 % m) % m
+        mask &= _QR_TABLES[m][(r * r - n % m) % m]
+    return mask
+
+
+def _candidates_from_k_batch(
+    n: int, a0: int, k_estimates: Iterable[float]
+) -> List[Tuple[int, int]]:
+    """
+    Batch version of `_candidate_from_k` with deduplication and residue filtering.
+
+    Each k is rounded to its x-coordinate exactly as in `_candidate_from_k`;
+    duplicate x values are collapsed (first occurrence wins), non-squares are
+    rejected with quadratic-residue lookups, and only survivors reach isqrt.
+
+    Args:
+        n: Target integer.
+        a0: ceil(sqrt(n)) reference.
+        k_estimates: k-position estimates in priority order.
+
+    Returns:
+        Unique (p, q) pairs (p <= q) in order of first discovery.
+    """
+    k = np.asarray(list(k_estimates), dtype=np.float64)
+    k = k[np.isfinite(k)]
+    if len(k) == 0:
+        return []
+
+    offsets = np.rint(k) - 1.0
+    _, first = np.unique(offsets, return_index=True)
+    offsets = offsets[np.sort(first)]
+
+    in_range = np.abs(offsets) < _MAX_FILTER_OFFSET
+    survivors = ~in_range
+    survivors[in_range] = _square_residue_mask(
+        n, a0, offsets[in_range].astype(np.int64)
+    )
+
+    found: List[Tuple[int, int]] = []
+    seen = set()
+    for offset in offsets[survivors]:
+        candidate = _candidate_from_a(n, a0 + int(offset))
+        if candidate is None or candidate in seen:
+            continue
+        seen.add(candidate)
+        found.append(candidate)
+    return found
+
+
 def derive_candidates(
     n: int,
     a0: int,
@@ -61,6 +153,10 @@ def derive_candidates(
         if delta is square: p = a - b
         Additionally explore dk + m*(1/freq) for m=1..max_period_multiples
 
+    All k estimates are collected first and tested as one batch: duplicate
+    a values are collapsed and non-squares are rejected by residue tables
+    before any exact isqrt.
+
     Args:
         n: Target integer to factor.
         a0: ceil(sqrt(n)).
@@ -77,15 +173,13 @@ def derive_candidates(
     Returns:
         List of unique (p, q) pairs (p <= q) that divide n.
     """
-    found: List[Tuple[int, int]] = []
-    seen = set()
-
     targets = (
         list(target_phases)
         if target_phases is not None
         else [0.0, math.pi / 2, math.pi, 3 * math.pi / 2]
     )
     current_k = float(window_size)
+    k_estimates: List[float] = []
 
     if freq > 0:
         period = 1.0 / freq
@@ -93,15 +187,7 @@ def derive_candidates(
         for tgt in targets:
             dk_base = (tgt - phase) / (2.0 * math.pi * freq)
             for m in range(max_period_multiples + 1):
-                dk = dk_base + m * period
-                k_est = current_k + dk
-                candidate = _candidate_from_k(n, a0, k_est)
-                if candidate is None:
-                    continue
-                if candidate in seen:
-                    continue
-                seen.add(candidate)
-                found.append(candidate)
+                k_estimates.append(current_k + dk_base + m * period)
 
     if chirp_params is not None:
         c, k0 = chirp_params
@@ -114,10 +200,6 @@ def derive_candidates(
                     sqrt_target = sqrt_current + step
                     if sqrt_target <= 0:
                         continue
-                    k_est = (sqrt_target * sqrt_target) - k0
-                    candidate = _candidate_from_k(n, a0, k_est)
-                    if candidate is None or candidate in seen:
-                        continue
-                    seen.add(candidate)
-                    found.append(candidate)
-    return found
+                    k_estimates.append((sqrt_target * sqrt_target) - k0)
+
+    return _candidates_from_k_batch(n, a0, k_estimates)
@@ -13,6 +13,7 @@ from rsh.signal import generate_error_signal  # noqa: E402
 from rsh.frequency import detect_local_frequency, estimate_chirp  # noqa: E402
 from rsh.slope import derive_candidates  # noqa: E402
 from rsh.core import factorize_rsh  # noqa: E402
+from rsh.multistart import build_config_grid, factorize_rsh_multistart  # noqa: E402
 
 
 def test_generate_error_signal_simple():
@@ -103,6 +104,55 @@ def test_estimate_chirp_recovers_model_parameters():
     assert 1.0 < k0_est < 50.0
 
 
+def test_estimate_chirp_closed_form_and_refined_agree_on_long_window():
+    c_true = 0.1
+    k0_true = 50.0
+    length = 2048
+    k = np.arange(length)
+    freq = c_true / np.sqrt(k + k0_true)
+    signal = np.sin(np.cumsum(2 * np.pi * freq))
+
+    closed = estimate_chirp(signal)
+    refined = estimate_chirp(signal, refine=True)
+    assert closed is not None and refined is not None
+    assert abs(closed[0] - c_true) / c_true < 0.05
+    assert abs(refined[0] - c_true) <= abs(closed[0] - c_true)
+    assert abs(refined[1] - k0_true) / k0_true < 0.05
+
+
+def test_estimate_chirp_refinement_helps_on_noisy_signal():
+    c_true = 0.2
+    k0_true = 20.0
+    length = 1024
+    k = np.arange(length)
+    freq = c_true / np.sqrt(k + k0_true)
+    noise = np.random.default_rng(0).normal(0.0, 0.05, length)
+    signal = np.sin(np.cumsum(2 * np.pi * freq)) + noise
+
+    closed = estimate_chirp(signal)
+    refined = estimate_chirp(signal, refine=True)
+    assert closed is not None and refined is not None
+    assert abs(refined[0] - c_true) <= abs(closed[0] - c_true)
+    assert abs(refined[0] - c_true) / c_true < 0.01
+
+
+def test_estimate_chirp_keeps_closed_form_when_refinement_fails(monkeypatch):
+    import rsh.frequency as frequency
+
+    def failing_fit(*_args, **_kwargs):
+        raise RuntimeError("Optimal parameters not found")
+
+    c_true = 0.3
+    k0_true = 5.0
+    k = np.arange(256)
+    signal = np.sin(np.cumsum(2 * np.pi * c_true / np.sqrt(k + k0_true)))
+
+    closed = estimate_chirp(signal)
+    monkeypatch.setattr(frequency, "curve_fit", failing_fit)
+    assert closed is not None
+    assert estimate_chirp(signal, refine=True) == closed
+
+
 def test_chirp_candidates_with_empty_targets():
     n = 77
     a0 = math.isqrt(n)
@@ -120,3 +170,67 @@ def test_chirp_candidates_with_empty_targets():
         chirp_params=(0.5, 1.0),
     )
     assert (7, 11) in candidates or (11, 7) in candidates
+
+
+def test_square_residue_mask_keeps_true_squares():
+    from rsh.slope import _square_residue_mask
+
+    n = 1_152_921_470_247_108_503  # 1073741789 * 1073741827
+    a_true = (1_073_741_789 + 1_073_741_827) // 2
+    a0 = math.isqrt(n) + 1
+    offsets = np.arange(-5000, 5000, dtype=np.int64) + (a_true - a0)
+    mask = _square_residue_mask(n, a0, offsets)
+
+    def is_square(a):
+        delta = a * a - n
+        return delta >= 0 and math.isqrt(delta) ** 2 == delta
+
+    exact = np.array([is_square(a0 + int(o)) for o in offsets])
+    assert np.all(mask[exact])
+    assert mask[offsets == a_true - a0].all()
+    assert np.count_nonzero(mask) < 0.05 * len(offsets)
+
+
+def test_derive_candidates_deduplicates_repeated_positions():
+    n = 77
+    a0 = 9
+    window_size = 256
+    freq = 0.25
+    dk_needed = 1.0 - window_size
+    phase = -dk_needed * 2 * np.pi * freq
+
+    # Identical targets map to the same a; the pair must be reported once.
+    candidates = derive_candidates(
+        n=n,
+        a0=a0,
+        window_size=window_size,
+        freq=freq,
+        phase=phase,
+        target_phases=[0.0, 0.0, 2 * np.pi],
+        max_period_multiples=0,
+    )
+    assert candidates == [(7, 11)]
+
+
+def test_multistart_stops_on_first_verified_pair():
+    n = 10007 * 10037
+    configs = build_config_grid(n, x_offsets=range(-200, -180), window_sizes=[64])
+
+    report = factorize_rsh_multistart(n, configs, max_workers=2)
+    assert report.factors == (10007, 10037)
+    assert report.configs_total == len(configs)
+    assert all(r.elapsed_s >= 0 for r in report.results)
+    # The run stops at the first hit: nothing is collected after it, and the
+    # configurations beyond the in-flight window are never run.
+    assert [r.hit for r in report.results].index(True) == report.configs_run - 1
+    assert report.configs_run < report.configs_total
+
+
+def test_multistart_reports_every_config_without_hit():
+    n = 10007 * 10037
+    configs = build_config_grid(n, x_offsets=[0, 50], window_sizes=[32, 64])
+
+    report = factorize_rsh_multistart(n, configs, max_workers=2)
+    assert report.factors is None
+    assert report.configs_run == 4
+    assert report.hit_rate == 0.0
@@ -0,0 +1,250 @@
+"""
+Candidate Traces
+================
+
+Columnar, memory-mappable record of the candidates an engine scored and
+submitted to IsFactor_N (N mod d == 0), so a run can be re-certified and
+analysed without rerunning the geometry.
+
+File layout:
+
+    b'GFTRACE1'                 8-byte magic
+    uint64 (little endian)      length H of the JSON header
+    JSON header                 N (string), engine, k_values, phases, ...,
+                                padded with spaces to a 64-byte boundary
+    records                     fixed-width RECORD_DTYPE, appended
+
+Each record is 32 bytes:
+
+    cand_lo, cand_hi   uint64   candidate = cand_lo + 2^64·cand_hi (< 2^128)
+    score              float64  engine score (geodesic distance for GVA)
+    rank               uint32   1-based position in the phase's order
+    phase              uint8    index into header['phases']
+    k_id               uint8    index into header['k_values']
+    predicate          uint8    1 if N mod candidate == 0 was observed
+    reserved           uint8
+
+The record count is not stored: it is the data size divided by 32, so a
+file cut short by a crash stays readable up to the last whole record.
+
+TraceWriter buffers records as tuples and converts and appends them in
+bulk, so an engine loop pays one list append per candidate. open_trace maps the
+records with np.memmap (zero copy); Trace.candidates() reassembles the
+limbs into integers.
+
+Phases used by gva_factor_search:
+
+- 'sample': phase-1 geodesic sample; score is the candidate's own
+  distance, rank its position in distance order, predicate not evaluated.
+- 'search': divisibility tests; rank is the test index (the trace's
+  hit_rank for the factor), score the distance of the region's centre.
+- 'linear': divisibility tests of the linear fallback (score NaN).
+
+Usage (repo root on sys.path):
+
+    from geofac.trace import TraceWriter, open_trace
+"""
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b'GFTRACE1'
+FORMAT_VERSION = 1
+HEADER_ALIGN = 64
+PHASES = ('sample', 'search', 'linear')
+TESTED_PHASES = ('search', 'linear')
+
+RECORD_DTYPE = np.dtype([
+    ('cand_lo', '<u8'),
+    ('cand_hi', '<u8'),
+    ('score', '<f8'),
+    ('rank', '<u4'),
+    ('phase', 'u1'),
+    ('k_id', 'u1'),
+    ('predicate', 'u1'),
+    ('reserved', 'u1'),
+])
+RECORD_SIZE = RECORD_DTYPE.itemsize
+
+_LIMB_MASK = (1 << 64) - 1
+# Layout of the buffered tuples; NumPy converts a list of them in one call
+_ROW_DTYPE = np.dtype([('candidate', '<u8'), ('score', '<f8'), ('rank', '<u4'),
+                       ('phase', 'u1'), ('k_id', 'u1'), ('predicate', 'u1')])
+_LENGTH = struct.Struct('<Q')
+
+
+def _encode_header(header: Dict[str, Any]) -> bytes:
+    body = json.dumps(header, sort_keys=True).encode('utf-8')
+    prefix = len(MAGIC) + _LENGTH.size
+    body += b' ' * (-(prefix + len(body)) % HEADER_ALIGN)
+    return MAGIC + _LENGTH.pack(len(body)) + body
+
+
+class TraceWriter:
+    """Appends candidate records to a trace file."""
+
+    def __init__(self, path: str, N: int, k_values: Sequence[float] = (),
+                 engine: str = 'gva', phases: Sequence[str] = PHASES,
+                 tested_phases: Sequence[str] = TESTED_PHASES,
+                 meta: Optional[Dict[str, Any]] = None, buffer_records: int = 1 << 16):
+        """
+        Args:
+            path: Trace file (created or truncated)
+            N: Integer being factored
+            k_values: Geodesic exponents; records refer to them by k_id
+            engine: Engine name stored in the header
+            phases: Phase names; records refer to them by index
+            tested_phases: Phases whose records were submitted to IsFactor_N
+            meta: Extra JSON-serialisable header fields (parameters, precision, ...)
+            buffer_records: Records buffered before each write
+        """
+        self.path = path
+        self.N = N
+        self.buffer_records = buffer_records
+        self.header = {
+            'format': 'geofac-trace', 'version': FORMAT_VERSION,
+            'N': str(N), 'engine': engine, 'k_values': list(k_values),
+            'phases': list(phases), 'tested_phases': [p for p in phases if p in tested_phases],
+            'record_dtype': RECORD_DTYPE.descr, **(meta or {}),
+        }
+        self.records_written = 0
+        self._file = open(path, 'wb')
+        self._file.write(_encode_header(self.header))
+        self._rows: List[tuple] = []
+
+    def phase_id(self, phase: str) -> int:
+        """Index of a phase name in the header."""
+        return self.header['phases'].index(phase)
+
+    def k_id(self, k: float) -> int:
+        """Index of a geodesic exponent in the header."""
+        if k not in self.header['k_values']:
+            raise ValueError(f"k={k} is not among the trace's k_values {self.header['k_values']}")
+        return self.header['k_values'].index(k)
+
+    def record(self, candidate: int, score: float, rank: int, phase: int,
+               k_id: int = 0, predicate: bool = False) -> None:
+        """
+        Buffer one record.
+
+        Args:
+            candidate: Candidate divisor (0 ≤ candidate < 2^128)
+            score: Engine score
+            rank: 1-based position in the phase's order
+            phase: Phase index (see phase_id)
+            k_id: Index into k_values
+            predicate: Observed N mod candidate == 0
+        """
+        rows = self._rows
+        rows.append((candidate, score, rank, phase, k_id, predicate))
+        if len(rows) >= self.buffer_records:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to the file."""
+        count = len(self._rows)
+        if not count:
+            return
+        block = np.zeros(count, dtype=RECORD_DTYPE)
+        try:
+            rows = np.array(self._rows, dtype=_ROW_DTYPE)
+        except OverflowError:
+            # A candidate of 64 bits or more: split the limbs in Python
+            rows = np.array([(c & _LIMB_MASK, *rest) for c, *rest in self._rows], dtype=_ROW_DTYPE)
+            try:
+                block['cand_hi'] = np.fromiter((row[0] >> 64 for row in self._rows),
+                                               dtype=np.uint64, count=count)
+            except OverflowError:
+                raise ValueError("Trace candidates must be in [0, 2^128)") from None
+        block['cand_lo'] = rows['candidate']
+        for field in ('score', 'rank', 'phase', 'k_id', 'predicate'):
+            block[field] = rows[field]
+        self._file.write(block.tobytes())
+        self._file.flush()
+        self.records_written += count
+        self._rows.clear()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        if not self._file.closed:
+            try:
+                self.flush()
+            finally:
+                self._file.close()
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass
+class Trace:
+    """A trace file opened for reading; records is a read-only np.memmap."""
+    path: str
+    header: Dict[str, Any]
+    records: np.ndarray
+
+    @property
+    def N(self) -> int:
+        return int(self.header['N'])
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def candidates(self, records: Optional[np.ndarray] = None) -> List[int]:
+        """Candidates as Python ints (of all records, or of a slice/selection)."""
+        records = self.records if records is None else records
+        lo = records['cand_lo'].tolist()
+        if not records['cand_hi'].any():
+            return lo
+        return [(hi << 64) | l for l, hi in zip(lo, records['cand_hi'].tolist())]
+
+    def phase_mask(self, phase: str) -> np.ndarray:
+        """Boolean mask of the records of one phase."""
+        if phase not in self.header['phases']:
+            return np.zeros(len(self.records), dtype=bool)
+        return self.records['phase'] == self.header['phases'].index(phase)
+
+
+def read_header(path: str) -> Tuple[Dict[str, Any], int]:
+    """
+    Header of a trace file.
+
+    Returns:
+        (header dict, byte offset of the first record)
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(len(MAGIC) + _LENGTH.size)
+        if len(prefix) < len(MAGIC) + _LENGTH.size or not prefix.startswith(MAGIC):
+            raise ValueError(f"{path} is not a geofac trace file")
+        (length,) = _LENGTH.unpack(prefix[len(MAGIC):])
+        header = json.loads(f.read(length).decode('utf-8'))
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported trace version {header.get('version')!r}")
+    return header, len(prefix) + length
+
+
+def open_trace(path: str) -> Trace:
+    """
+    Map a trace file for reading without copying the records.
+
+    Args:
+        path: Trace file written by TraceWriter
+
+    Returns:
+        Trace with header and memory-mapped records
+    """
+    header, offset = read_header(path)
+    count = (os.path.getsize(path) - offset) // RECORD_SIZE
+    if count == 0:
+        records = np.zeros(0, dtype=RECORD_DTYPE)
+    else:
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=offset, shape=(count,))
+    return Trace(path=path, header=header, records=records)
@@ -0,0 +1,283 @@
+"""
+Trace Verification
+==================
+
+Re-certifies a candidate trace (geofac/trace.py) without rerunning the
+geometry: every record of a tested phase is checked again with
+IsFactor_N (N mod d == 0) and compared with the predicate the engine logged.
+
+Checks:
+
+- predicates: the logged predicate of each tested record equals N mod d == 0
+  (records are split into chunks of the memory-mapped file and checked in a
+  process pool; each worker maps the file itself, so nothing is pickled but
+  the chunk bounds).
+- ranks: within each (phase, k) the ranks run 1, 2, 3, ... in file order
+  (a restart at 1 begins a new run on the same writer).
+- factor: the reported factor is the first tested record whose predicate is
+  true (the engines stop at the first divisor); its rank is the run's
+  hit_rank. Expected values from a results file can be passed in.
+- drift (optional): a random sample of GVA 'sample'-phase records is
+  re-scored with geofac.kernels at the header's precision_dps (default
+  adaptive_precision(N)), and the relative deviation from the logged
+  distance is reported.
+
+Usage:
+
+    python3 geofac.py verify-trace run.gft --rescore 200
+    python3 -m geofac.verify run.gft --factor 32749 --hit-rank 12
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from geofac.kernels import geodesic_distances
+from geofac.trace import Trace, open_trace
+
+CHUNK_RECORDS = 1 << 18
+DRIFT_RTOL = 1e-9
+
+
+@dataclass
+class VerifyReport:
+    """Outcome of verify_trace; ok is True when every check passed."""
+    path: str
+    N: int
+    engine: str
+    records: int
+    tested: int
+    predicate_mismatches: List[int] = field(default_factory=list)
+    rank_errors: List[int] = field(default_factory=list)
+    factor: Optional[int] = None
+    factor_rank: Optional[int] = None
+    factor_phase: Optional[str] = None
+    factor_k: Optional[float] = None
+    factor_errors: List[str] = field(default_factory=list)
+    rescored: int = 0
+    max_drift: float = 0.0
+    drifted: List[int] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.predicate_mismatches or self.rank_errors
+                    or self.factor_errors or self.drifted)
+
+    def to_dict(self) -> Dict[str, Any]:
+        report = asdict(self)
+        report['N'] = str(self.N)
+        report['factor'] = str(self.factor) if self.factor is not None else None
+        report['ok'] = self.ok
+        return report
+
+
+def _tested_phase_ids(trace: Trace) -> List[int]:
+    phases = trace.header['phases']
+    return [phases.index(p) for p in trace.header['tested_phases']]
+
+
+def _check_chunk(args: Tuple[str, int, int]) -> Tuple[List[int], List[int], int]:
+    """
+    Predicate check of records [start, stop).
+
+    Returns:
+        (indices with a wrong predicate, indices of divisors, records tested)
+    """
+    path, start, stop = args
+    trace = open_trace(path)
+    records = trace.records[start:stop]
+    tested = np.flatnonzero(np.isin(records['phase'], _tested_phase_ids(trace)))
+    N = trace.N
+    candidates = trace.candidates(records[tested])
+    observed = np.fromiter((N % c == 0 for c in candidates), dtype=bool, count=len(candidates))
+    logged = records['predicate'][tested] != 0
+    return ((tested[observed != logged] + start).tolist(),
+            (tested[observed] + start).tolist(),
+            len(tested))
+
+
+def check_predicates(path: str, workers: Optional[int] = None,
+                     chunk_records: int = CHUNK_RECORDS) -> Tuple[List[int], List[int], int]:
+    """
+    Recompute N mod d == 0 for every tested record.
+
+    Args:
+        path: Trace file
+        workers: Worker processes (default: os.cpu_count(); 1: serial)
+        chunk_records: Records per chunk
+
+    Returns:
+        (indices with a wrong predicate, indices of divisors, records tested)
+    """
+    count = len(open_trace(path))
+    jobs = [(path, start, min(start + chunk_records, count))
+            for start in range(0, count, chunk_records)]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        results = [_check_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = list(pool.map(_check_chunk, jobs))
+
+    mismatches, divisors, tested = [], [], 0
+    for chunk_mismatches, chunk_divisors, chunk_tested in results:
+        mismatches += chunk_mismatches
+        divisors += chunk_divisors
+        tested += chunk_tested
+    return mismatches, divisors, tested
+
+
+def check_ranks(trace: Trace) -> List[int]:
+    """
+    Indices of records whose rank is neither 1 nor one more than the previous
+    record of the same (phase, k).
+    """
+    records = trace.records
+    errors: List[int] = []
+    groups = records['phase'].astype(np.uint16) << 8 | records['k_id']
+    for group in np.unique(groups):
+        positions = np.flatnonzero(groups == group)
+        ranks = records['rank'][positions].astype(np.int64)
+        previous = np.concatenate(([0], ranks[:-1]))
+        bad = (ranks != previous + 1) & (ranks != 1)
+        errors += positions[bad].tolist()
+    return sorted(errors)
+
+
+def rescore_sample(trace: Trace, sample_size: int, seed: int = 0,
+                   rtol: float = DRIFT_RTOL) -> Tuple[int, float, List[int]]:
+    """
+    Re-score random 'sample'-phase records of a GVA trace.
+
+    Distances are recomputed with geofac.kernels (method='mp') at the
+    header's precision_dps, or adaptive_precision(N) when absent.
+
+    Args:
+        trace: Opened trace
+        sample_size: Records to re-score
+        seed: Seed of the record sample
+        rtol: Relative deviation above which a record counts as drifted
+
+    Returns:
+        (records re-scored, max relative deviation, indices of drifted records)
+    """
+    if trace.header['engine'] != 'gva' or 'sample' not in trace.header['phases']:
+        return 0, 0.0, []
+    from gva_factorization import engine_context
+
+    positions = np.flatnonzero(trace.phase_mask('sample'))
+    if len(positions) > sample_size:
+        positions = np.sort(np.random.default_rng(seed).choice(positions, sample_size,
+                                                                replace=False))
+    N = trace.N
+    ctx = engine_context(N, trace.header.get('precision_dps'))
+    k_values = trace.header['k_values']
+    records = trace.records[positions]
+
+    max_drift, drifted = 0.0, []
+    for k_id in np.unique(records['k_id']).tolist():
+        selected = records['k_id'] == k_id
+        logged = records['score'][selected]
+        scores = geodesic_distances(N, trace.candidates(records[selected]), k_values[k_id],
+                                    method='mp', ctx=ctx)
+        drift = np.abs(scores - logged) / np.maximum(np.abs(logged), np.finfo(float).tiny)
+        if len(drift):
+            max_drift = max(max_drift, float(drift.max()))
+        drifted += positions[selected][drift > rtol].tolist()
+    return len(positions), max_drift, sorted(drifted)
+
+
+def verify_trace(path: str, workers: Optional[int] = None, rescore: int = 0,
+                 seed: int = 0, expected_factor: Optional[int] = None,
+                 expected_rank: Optional[int] = None) -> VerifyReport:
+    """
+    Re-certify a trace file.
+
+    Args:
+        path: Trace file
+        workers: Worker processes for the predicate check
+        rescore: Number of 'sample' records to re-score (0: skip)
+        seed: Seed of the re-scored sample
+        expected_factor: Factor reported by the run (either p or q)
+        expected_rank: hit_rank reported by the run
+
+    Returns:
+        VerifyReport
+    """
+    trace = open_trace(path)
+    N = trace.N
+    mismatches, divisors, tested = check_predicates(path, workers)
+    report = VerifyReport(path=path, N=N, engine=trace.header['engine'],
+                          records=len(trace), tested=tested,
+                          predicate_mismatches=mismatches, rank_errors=check_ranks(trace))
+
+    if divisors:
+        record = trace.records[divisors[0]]
+        report.factor = trace.candidates(trace.records[divisors[:1]])[0]
+        report.factor_rank = int(record['rank'])
+        report.factor_phase = trace.header['phases'][record['phase']]
+        if record['k_id'] < len(trace.header['k_values']):
+            report.factor_k = trace.header['k_values'][record['k_id']]
+        if not 1 < report.factor < N:
+            report.factor_errors.append(f"trivial divisor {report.factor}")
+    if expected_factor is not None and report.factor not in (expected_factor, N // expected_factor):
+        report.factor_errors.append(
+            f"reported factor {expected_factor} is not the first logged divisor {report.factor}")
+    if expected_rank is not None and report.factor_rank != expected_rank:
+        report.factor_errors.append(
+            f"reported hit_rank {expected_rank} != logged rank {report.factor_rank}")
+
+    if rescore:
+        report.rescored, report.max_drift, report.drifted = rescore_sample(trace, rescore, seed)
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='geofac.py verify-trace',
+        description='Re-certify a candidate trace without rerunning the geometry')
+    parser.add_argument('trace', help='Trace file written with --trace')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--rescore', type=int, default=0,
+                        help='Re-score this many sample-phase records to detect drift')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the re-scored sample')
+    parser.add_argument('--factor', type=int, default=None,
+                        help='Factor reported by the run')
+    parser.add_argument('--hit-rank', type=int, default=None,
+                        help='hit_rank reported by the run')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    report = verify_trace(args.trace, args.workers, args.rescore, args.seed,
+                          args.factor, args.hit_rank)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return 0 if report.ok else 1
+
+    print(f"Trace: {report.path} ({report.engine}, {report.N.bit_length()}-bit N)")
+    print(f"Records: {report.records}, tested: {report.tested}")
+    print(f"Predicate mismatches: {len(report.predicate_mismatches)}")
+    print(f"Rank errors: {len(report.rank_errors)}")
+    if report.factor is not None:
+        print(f"Factor: {report.factor} (phase {report.factor_phase}, k={report.factor_k}, "
+              f"rank {report.factor_rank})")
+    else:
+        print("Factor: none logged")
+    for error in report.factor_errors:
+        print(f"  ✗ {error}")
+    if report.rescored:
+        print(f"Re-scored: {report.rescored}, max relative drift {report.max_drift:.3e}, "
+              f"drifted: {len(report.drifted)}")
+    print("✓ VERIFIED" if report.ok else "✗ VERIFICATION FAILED")
+    return 0 if report.ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
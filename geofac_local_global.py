@@ -15,7 +15,7 @@ import math
 import random
 import hashlib
 import json
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 
 # Validation gates
 CHALLENGE_127 = 137524771864208156028430259349934309717  # Gate 3: 127-bit challenge
@@ -142,6 +142,7 @@ def geofac_local_global(
     samples: int = 50_000,
     j: int = 25,
     top_k: int = 500,
+    trace_path: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Run local-global resonance factorization.
@@ -152,6 +153,8 @@ def geofac_local_global(
         samples: Number of candidates to generate
         j: Dirichlet kernel order
         top_k: Number of top-ranked candidates to certify
+        trace_path: Also write the certified candidates to this candidate
+            trace (geofac/trace.py), phase 'certify'
 
     Returns:
         Dictionary with N, parameters, candidates, and any factors found.
@@ -182,12 +185,23 @@ def geofac_local_global(
     tail = ranked[: min(top_k, len(ranked))]
     candidate_logs = []
     factors = []
+    writer = None
+    if trace_path is not None:
+        from geofac.trace import TraceWriter
+        writer = TraceWriter(trace_path, N, engine="local_global", phases=("certify",),
+                             tested_phases=("certify",),
+                             meta={"window": window, "samples": samples,
+                                   "dirichlet_order_j": j, "top_k": top_k, "seed": seed})
     for rank, (d, score) in enumerate(tail, start=1):
         flag = is_factor(N, d)
         entry = {"d": int(d), "score": float(score), "rank": rank, "is_factor": flag}
         candidate_logs.append(entry)
+        if writer is not None:
+            writer.record(d, score, rank, 0, 0, flag)
         if flag:
             factors.append(entry)
+    if writer is not None:
+        writer.close()
     log: Dict[str, Any] = {
         "N": str(N),
         "bit_length": int(N.bit_length()),
@@ -216,6 +230,8 @@ def main() -> None:
     ap.add_argument("--samples", type=int, default=50_000)
     ap.add_argument("--j", type=int, default=25, help="Dirichlet kernel order.")
     ap.add_argument("--top-k", type=int, default=500)
+    ap.add_argument("--trace", type=str, default=None,
+                    help="Write certified candidates to this binary candidate trace.")
     args = ap.parse_args()
     log = geofac_local_global(
         N=args.N,
@@ -223,6 +239,7 @@ def main() -> None:
         samples=args.samples,
         j=args.j,
         top_k=args.top_k,
+        trace_path=args.trace,
     )
     print(json.dumps(log, indent=2))
 
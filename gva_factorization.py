@@ -16,12 +16,13 @@ References:
 """
 
 import mpmath as mp
+from mpmath.ctx_mp import MPContext
 from typing import Tuple, Optional, List
 import time
-from math import log, sqrt, e
+from math import log, sqrt, e, nan
 
-# Configure high precision for GVA computations
-mp.mp.dps = 50
+from geofac.kernels import embed_torus_geodesic, riemannian_distance
+from geofac.trace import TraceWriter
 
 # Validation gates
 GATE_1_30BIT = 1073217479  # 32749 × 32771
@@ -51,74 +52,34 @@ def adaptive_precision(N: int) -> int:
     return max(50, bit_length * 4 + 200)
 
 
-def embed_torus_geodesic(n: int, k: float, dimensions: int = 7) -> List[mp.mpf]:
+def engine_context(N: int, precision: Optional[int] = None) -> MPContext:
     """
-    Embed integer n into a 7D torus using geodesic mapping.
+    Private mpmath context for one engine run on N.
     
-    The 7D torus embedding uses golden ratio (φ) and its powers to create
-    a quasi-periodic embedding that reveals factorization structure through
-    Riemannian distance minimization.
+    Engines compute in this context instead of setting the global mp.mp.dps,
+    so runs at different precisions can share a process (thread pools,
+    asyncio) without changing each other's precision.
     
     Args:
-        n: Integer to embed
-        k: Geodesic exponent (typically in [0.25, 0.45])
-        dimensions: Torus dimensions (default 7)
-        
-    Returns:
-        List of coordinates in 7D torus [0,1)^7
-    """
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2  # Golden ratio
-    
-    coords = []
-    for d in range(dimensions):
-        # Use powers of φ for quasi-periodic structure
-        # Fractional part gives torus coordinate
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        
-        # Apply geodesic exponent for density warping
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        
-        coords.append(coord)
-    
-    return coords
-
-
-def riemannian_distance(p1: List[mp.mpf], p2: List[mp.mpf]) -> mp.mpf:
-    """
-    Compute Riemannian geodesic distance on 7D torus.
-    
-    Uses the flat torus metric with periodic boundary conditions.
-    Distance accounts for wrapping: d(x,y) = min(|x-y|, 1-|x-y|) per dimension.
-    
-    Args:
-        p1: First point coordinates
-        p2: Second point coordinates
+        N: Integer to factor
+        precision: Minimum precision in dps (default: adaptive_precision(N) only)
         
     Returns:
-        Riemannian distance
+        New MPContext at max(precision, adaptive_precision(N)) dps
     """
-    if len(p1) != len(p2):
-        raise ValueError("Points must have same dimension")
-    
-    dist_sq = mp.mpf(0)
-    for c1, c2 in zip(p1, p2):
-        # Torus distance: min distance considering wrapping
-        diff = abs(c1 - c2)
-        wrap_diff = mp.mpf(1) - diff
-        min_diff = min(diff, wrap_diff)
-        dist_sq += min_diff * min_diff
-    
-    return mp.sqrt(dist_sq)
+    ctx = mp.mp.clone()
+    ctx.dps = max(precision or 0, adaptive_precision(N))
+    return ctx
 
 
 def gva_factor_search(N: int, k_values: Optional[List[float]] = None,
                       max_candidates: int = 10000,
                       verbose: bool = False,
                       allow_any_range: bool = False,
-                      use_geodesic_guidance: bool = True) -> Optional[Tuple[int, int]]:
+                      use_geodesic_guidance: bool = True,
+                      trace: Optional[dict] = None,
+                      ctx: Optional[MPContext] = None,
+                      trace_writer: Optional[TraceWriter] = None) -> Optional[Tuple[int, int]]:
     """
     Factor semiprime N using GVA (Geodesic Validation Assault).
     
@@ -139,6 +100,17 @@ def gva_factor_search(N: int, k_values: Optional[List[float]] = None,
         verbose: Enable detailed logging
         allow_any_range: Allow N outside operational range (for testing/validation gates)
         use_geodesic_guidance: Use Riemannian distance to guide search (more efficient)
+        trace: Optional dict filled with the search's certification record for
+            the last k searched: 'hit_rank' (1-based index among divisibility
+            tests of the factor, or None), 'candidates_tested',
+            'sample_seconds' and 'search_seconds'. A run with a smaller
+            max_candidates and the same phase1_sample_size would succeed iff
+            hit_rank ≤ max_candidates.
+        ctx: mpmath context for the embeddings and distances (default:
+            engine_context(N)); the global mpmath precision is not touched
+        trace_writer: Optional geofac.trace.TraceWriter (opened with these
+            k_values) receiving every sampled and tested candidate; the
+            caller closes it
         
     Returns:
         Tuple (p, q) if factors found, None otherwise
@@ -154,89 +126,124 @@ def gva_factor_search(N: int, k_values: Optional[List[float]] = None,
     # For production use, caller should verify N is actually composite
     # This implementation focuses on the factorization algorithm itself
     
-    # Set adaptive precision
-    required_dps = adaptive_precision(N)
-    with mp.workdps(required_dps):
-        if verbose:
-            print(f"N = {N}")
-            print(f"Bit length: {N.bit_length()}")
-            print(f"Adaptive precision: {required_dps} dps")
-        
-        # Default k values based on empirical results
-        if k_values is None:
-            k_values = [0.30, 0.35, 0.40]
-        
-        sqrt_N = int(mp.sqrt(N))
-        
-        # Search window around sqrt(N)
-        # For balanced semiprimes (p ≈ q), factors are close to sqrt(N)
-        # Window scales with sqrt(N) but with adaptive sizing
-        bit_length = N.bit_length()
-        
-        if bit_length <= 40:
-            base_window = max(1000, sqrt_N // 1000)
-        elif bit_length <= 60:
-            base_window = max(10000, sqrt_N // 5000)
-        elif bit_length <= 85:  # 80-85 bits
-            base_window = max(100000, sqrt_N // 1000)
-        elif bit_length <= 92:  # 90-92 bits
-            base_window = max(200000, sqrt_N // 500)
-        elif bit_length <= 99:  # 95-99 bits
-            base_window = max(300000, sqrt_N // 400)
-        elif bit_length <= 104:  # 100-104 bits
-            base_window = max(400000, sqrt_N // 300)
-        elif bit_length <= 109:  # 105-109 bits
-            base_window = max(500000, sqrt_N // 250)
-        elif bit_length <= 134:  # 110-134 bits
-            base_window = max(600000, sqrt_N // 200)
-        elif bit_length <= 144:  # 135-144 bits
-            base_window = max(700000, sqrt_N // 180)
-        else:  # 145+ bits
-            base_window = max(800000, sqrt_N // 160)
-        
+    # Private context at adaptive precision (the global mp.mp is left alone)
+    if ctx is None:
+        ctx = engine_context(N)
+    if verbose:
+        print(f"N = {N}")
+        print(f"Bit length: {N.bit_length()}")
+        print(f"Adaptive precision: {ctx.dps} dps")
+    
+    # Default k values based on empirical results
+    if k_values is None:
+        k_values = [0.30, 0.35, 0.40]
+    
+    sqrt_N = int(ctx.sqrt(N))
+    
+    # Search window around sqrt(N)
+    # For balanced semiprimes (p ≈ q), factors are close to sqrt(N)
+    # Window scales with sqrt(N) but with adaptive sizing
+    bit_length = N.bit_length()
+    
+    if bit_length <= 40:
+        base_window = max(1000, sqrt_N // 1000)
+    elif bit_length <= 60:
+        base_window = max(10000, sqrt_N // 5000)
+    elif bit_length <= 85:  # 80-85 bits
+        base_window = max(100000, sqrt_N // 1000)
+    elif bit_length <= 92:  # 90-92 bits
+        base_window = max(200000, sqrt_N // 500)
+    elif bit_length <= 99:  # 95-99 bits
+        base_window = max(300000, sqrt_N // 400)
+    elif bit_length <= 104:  # 100-104 bits
+        base_window = max(400000, sqrt_N // 300)
+    elif bit_length <= 109:  # 105-109 bits
+        base_window = max(500000, sqrt_N // 250)
+    elif bit_length <= 134:  # 110-134 bits
+        base_window = max(600000, sqrt_N // 200)
+    elif bit_length <= 144:  # 135-144 bits
+        base_window = max(700000, sqrt_N // 180)
+    else:  # 145+ bits
+        base_window = max(800000, sqrt_N // 160)
+    
+    if verbose:
+        print(f"Search window: ±{base_window} around sqrt(N) = {sqrt_N}")
+    
+    start_time = time.time()
+    
+    for k in k_values:
         if verbose:
-            print(f"Search window: ±{base_window} around sqrt(N) = {sqrt_N}")
+            print(f"\nTesting k = {k}")
         
-        start_time = time.time()
+        # Embed N in 7D torus
+        N_coords = embed_torus_geodesic(N, k, ctx=ctx)
         
-        for k in k_values:
-            if verbose:
-                print(f"\nTesting k = {k}")
-            
-            # Embed N in 7D torus
-            N_coords = embed_torus_geodesic(N, k)
-            
-            if use_geodesic_guidance:
-                # Geodesic-guided search: use distance metric to prioritize candidates
-                result = _geodesic_guided_search(N, sqrt_N, N_coords, k, base_window, 
-                                                max_candidates, verbose)
-                if result:
-                    elapsed = time.time() - start_time
-                    if verbose:
-                        print(f"  Elapsed: {elapsed:.3f}s")
-                    return result
-            else:
-                # Simple linear search (fallback/baseline)
-                result = _linear_search(N, sqrt_N, base_window, max_candidates, verbose)
-                if result:
-                    elapsed = time.time() - start_time
-                    if verbose:
-                        print(f"  Elapsed: {elapsed:.3f}s")
-                    return result
-        
-        elapsed = time.time() - start_time
-        if verbose:
-            print(f"\nNo factors found. Elapsed: {elapsed:.3f}s")
+        if use_geodesic_guidance:
+            # Geodesic-guided search: use distance metric to prioritize candidates
+            result = _geodesic_guided_search(N, sqrt_N, N_coords, k, base_window, 
+                                            max_candidates, verbose, trace, ctx,
+                                            trace_writer)
+            if result:
+                elapsed = time.time() - start_time
+                if verbose:
+                    print(f"  Elapsed: {elapsed:.3f}s")
+                return result
+        else:
+            # Simple linear search (fallback/baseline)
+            result = _linear_search(N, sqrt_N, base_window, max_candidates, verbose, trace,
+                                    trace_writer, k)
+            if result:
+                elapsed = time.time() - start_time
+                if verbose:
+                    print(f"  Elapsed: {elapsed:.3f}s")
+                return result
     
+    elapsed = time.time() - start_time
+    if verbose:
+        print(f"\nNo factors found. Elapsed: {elapsed:.3f}s")
+    
+    return None
+
+
+def phase1_sample_size(bit_length: int, max_candidates: int) -> Optional[int]:
+    """
+    Size of the geodesic-guided phase-1 sample when it depends on the budget.
+
+    Only N ≤ 60 bits size their sample from max_candidates; above that the
+    sample (and so the candidate order) is the same for every budget.
+
+    Args:
+        bit_length: Bit length of N
+        max_candidates: Candidate budget
+
+    Returns:
+        Sample size, or None if the sample does not depend on max_candidates
+    """
+    if bit_length <= 40:
+        return min(500, max_candidates // 4)
+    if bit_length <= 60:
+        return min(1000, max_candidates // 3)
     return None
 
 
+def _record_trace(trace: Optional[dict], hit_rank: Optional[int], candidates_tested: int,
+                  sample_seconds: float, search_seconds: float) -> None:
+    if trace is not None:
+        trace.update(hit_rank=hit_rank, candidates_tested=candidates_tested,
+                     sample_seconds=sample_seconds, search_seconds=search_seconds)
+
+
 def _linear_search(N: int, sqrt_N: int, window: int, max_candidates: int, 
-                   verbose: bool) -> Optional[Tuple[int, int]]:
+                   verbose: bool, trace: Optional[dict] = None,
+                   trace_writer: Optional[TraceWriter] = None,
+                   k: Optional[float] = None) -> Optional[Tuple[int, int]]:
     """
     Simple linear search around sqrt(N) (baseline method).
     """
+    start_time = time.time()
     candidates_tested = 0
+    if trace_writer is not None:
+        linear_phase, k_id = trace_writer.phase_id('linear'), trace_writer.k_id(k)
     
     for offset in range(-window, window + 1):
         if candidates_tested >= max_candidates:
@@ -251,9 +258,12 @@ def _linear_search(N: int, sqrt_N: int, window: int, max_candidates: int,
             continue
         
         candidates_tested += 1
+        divides = N % candidate == 0
+        if trace_writer is not None:
+            trace_writer.record(candidate, nan, candidates_tested, linear_phase, k_id, divides)
         
         # Quick divisibility test (deterministic)
-        if N % candidate == 0:
+        if divides:
             p = candidate
             q = N // candidate
             
@@ -263,14 +273,18 @@ def _linear_search(N: int, sqrt_N: int, window: int, max_candidates: int,
                 print(f"  q = {q}")
                 print(f"  Candidates tested: {candidates_tested}")
             
+            _record_trace(trace, candidates_tested, candidates_tested, 0.0, time.time() - start_time)
             return (p, q)
     
+    _record_trace(trace, None, candidates_tested, 0.0, time.time() - start_time)
     return None
 
 
 def _geodesic_guided_search(N: int, sqrt_N: int, N_coords: List[mp.mpf], k: float,
                            window: int, max_candidates: int, 
-                           verbose: bool) -> Optional[Tuple[int, int]]:
+                           verbose: bool, trace: Optional[dict] = None,
+                           ctx: Optional[MPContext] = None,
+                           trace_writer: Optional[TraceWriter] = None) -> Optional[Tuple[int, int]]:
     """
     Geodesic-guided search using Riemannian distance to prioritize candidates.
     
@@ -279,16 +293,17 @@ def _geodesic_guided_search(N: int, sqrt_N: int, N_coords: List[mp.mpf], k: floa
     promising regions more intensively.
     """
     bit_length = N.bit_length()
+    start_time = time.time()
     
     # Phase 1: Sample candidates and compute distances
     # Use adaptive sampling: denser near sqrt(N), sparser farther away
     if bit_length <= 40:
-        sample_size = min(500, max_candidates // 4)
+        sample_size = phase1_sample_size(bit_length, max_candidates)
         # For small numbers, uniform sampling works
         sample_step = max(1, (2 * window) // sample_size)
         offsets = [sample_step * i - window for i in range(sample_size)]
     elif bit_length <= 60:
-        sample_size = min(1000, max_candidates // 3)
+        sample_size = phase1_sample_size(bit_length, max_candidates)
         # Medium numbers: denser near center
         offsets = []
         # Inner region: dense sampling ±10000
@@ -485,14 +500,21 @@ def _geodesic_guided_search(N: int, sqrt_N: int, N_coords: List[mp.mpf], k: floa
             continue
         
         # Compute geodesic distance
-        cand_coords = embed_torus_geodesic(candidate, k)
-        dist = riemannian_distance(N_coords, cand_coords)
+        cand_coords = embed_torus_geodesic(candidate, k, ctx=ctx)
+        dist = riemannian_distance(N_coords, cand_coords, ctx=ctx)
         
         candidates_with_dist.append((float(dist), candidate))
     
     # Sort by distance (ascending - smallest distance first)
     candidates_with_dist.sort()
     
+    if trace_writer is not None:
+        k_id = trace_writer.k_id(k)
+        search_phase = trace_writer.phase_id('search')
+        sample_phase = trace_writer.phase_id('sample')
+        for rank, (dist, candidate) in enumerate(candidates_with_dist, start=1):
+            trace_writer.record(candidate, dist, rank, sample_phase, k_id)
+    
     if verbose and len(candidates_with_dist) > 0:
         min_dist = candidates_with_dist[0][0]
         best_cand = candidates_with_dist[0][1]
@@ -500,6 +522,7 @@ def _geodesic_guided_search(N: int, sqrt_N: int, N_coords: List[mp.mpf], k: floa
         print(f"  Best candidate offset: {best_cand - sqrt_N}")
     
     # Phase 2: Intensively search around top candidates with minimal distance
+    sample_seconds = time.time() - start_time
     candidates_tested = 0
     top_n = min(50, len(candidates_with_dist))  # Focus on top 50 candidates
     
@@ -539,9 +562,12 @@ def _geodesic_guided_search(N: int, sqrt_N: int, N_coords: List[mp.mpf], k: floa
                 continue
             
             candidates_tested += 1
+            divides = N % candidate == 0
+            if trace_writer is not None:
+                trace_writer.record(candidate, dist, candidates_tested, search_phase, k_id, divides)
             
             # Quick divisibility test (deterministic)
-            if N % candidate == 0:
+            if divides:
                 p = candidate
                 q = N // candidate
                 
@@ -553,11 +579,15 @@ def _geodesic_guided_search(N: int, sqrt_N: int, N_coords: List[mp.mpf], k: floa
                     print(f"  Geodesic distance: {dist:.6f}")
                     print(f"  Offset from sqrt(N): {candidate - sqrt_N}")
                 
+                _record_trace(trace, candidates_tested, candidates_tested, sample_seconds,
+                              time.time() - start_time - sample_seconds)
                 return (p, q)
     
     if verbose:
         print(f"  Geodesic-guided: {candidates_tested} candidates, top-{top_n} regions")
     
+    _record_trace(trace, None, candidates_tested, sample_seconds,
+                  time.time() - start_time - sample_seconds)
     return None
 
 
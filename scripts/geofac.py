@@ -15,6 +15,9 @@ Usage:
                       --precision 800 \\
                       --max-candidates 700000 \\
                       --k-values 0.30 0.35 0.40
+
+Re-certify a candidate trace written with --trace (see geofac/verify.py):
+    python3 geofac.py verify-trace run.gft --rescore 200
 """
 
 import argparse
@@ -30,8 +33,8 @@ repo_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, repo_root)
 sys.path.insert(0, os.path.join(repo_root, 'experiments', 'fractal-recursive-gva-falsification'))
 
-import mpmath as mp
-from gva_factorization import gva_factor_search, adaptive_precision
+from gva_factorization import gva_factor_search, adaptive_precision, engine_context
+from geofac.trace import TraceWriter
 from fr_gva_implementation import fr_gva_factor_search, compute_kappa
 from portfolio_router import (
     extract_structural_features,
@@ -172,10 +175,10 @@ def execute_engine(n: int, method: str, config: dict, verbose: bool = True) -> t
         for key, value in config.items():
             print(f"  {key}: {value}")
     
-    # Set adaptive precision
+    # Private mpmath context at the run's precision (global precision untouched)
     precision = adaptive_precision(n)
-    actual_precision = max(config['precision'], precision)
-    mp.mp.dps = actual_precision
+    ctx = engine_context(n, config['precision'])
+    actual_precision = ctx.dps
     
     if verbose:
         print(f"  adaptive_precision: {precision}")
@@ -196,16 +199,29 @@ def execute_engine(n: int, method: str, config: dict, verbose: bool = True) -> t
                 kappa_threshold=0.525,
                 max_candidates=config['max_candidates'],
                 verbose=verbose,
-                allow_any_range=True
+                allow_any_range=True,
+                ctx=ctx
             )
         else:  # GVA
-            factors = gva_factor_search(
-                n,
-                k_values=config['k_values'],
-                max_candidates=config['max_candidates'],
-                verbose=verbose,
-                allow_any_range=True
-            )
+            trace_writer = None
+            if config.get('trace'):
+                trace_writer = TraceWriter(config['trace'], n, config['k_values'], meta={
+                    'max_candidates': config['max_candidates'],
+                    'precision_dps': actual_precision,
+                })
+            try:
+                factors = gva_factor_search(
+                    n,
+                    k_values=config['k_values'],
+                    max_candidates=config['max_candidates'],
+                    verbose=verbose,
+                    allow_any_range=True,
+                    ctx=ctx,
+                    trace_writer=trace_writer
+                )
+            finally:
+                if trace_writer is not None:
+                    trace_writer.close()
         
         elapsed_time = time.time() - start_time
         
@@ -466,6 +482,10 @@ def generate_report(n: int, features: dict, routing_decision: str,
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'verify-trace':
+        from geofac.verify import main as verify_trace_main
+        sys.exit(verify_trace_main(sys.argv[2:]))
+    
     parser = argparse.ArgumentParser(
         description='Geofac - Router-based factorization for semiprimes',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -492,6 +512,8 @@ def main():
                        help='GVA: k-values to try (default: 0.30 0.35 0.40)')
     parser.add_argument('--no-fallback', action='store_true',
                        help='Disable fallback to alternate engine')
+    parser.add_argument('--trace', type=str, default=None,
+                       help='GVA: write a binary candidate trace to this path')
     parser.add_argument('--output-dir', type=str,
                        default='experiments/127bit-challenge-router-attack/run',
                        help='Output directory for results')
@@ -531,7 +553,8 @@ def main():
         'min_random_segments': args.min_random_segments,
         'precision': args.precision,
         'max_candidates': args.max_candidates,
-        'k_values': args.k_values
+        'k_values': args.k_values,
+        'trace': args.trace
     }
     
     # Step 5: Execute primary engine
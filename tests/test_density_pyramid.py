@@ -0,0 +1,95 @@
+"""
+Tests for the geodesic density pyramid (experiments/density_pyramid.py).
+"""
+
+import random
+
+import mpmath as mp
+
+import table_cache
+from density_pyramid import DensityPyramid, DensityStats, segment_offsets
+from gva_factorization import adaptive_precision, embed_torus_geodesic, riemannian_distance
+
+N_60 = 1000000016000000063  # 1000000007 × 1000000009
+
+
+def _reference_segment(N, sqrt_N, start_offset, end_offset, k, sample_count):
+    """score_segment's sampling loop from the two/three-stage prototypes."""
+    with mp.workdps(adaptive_precision(N)):
+        N_coords = embed_torus_geodesic(N, k)
+        step = max(1, (end_offset - start_offset) // sample_count)
+        distances = []
+        for offset in range(start_offset, end_offset, step):
+            candidate = sqrt_N + offset
+            if candidate <= 1 or candidate >= N or candidate % 2 == 0:
+                continue
+            distances.append(float(riemannian_distance(N_coords, embed_torus_geodesic(candidate, k))))
+    return distances
+
+
+def test_segment_samples_match_prototype_loop_and_are_reused():
+    pyramid = DensityPyramid(N_60, 0.35)
+    coarse = pyramid.segment_distances(-40000, 40000, 20)
+    assert coarse == _reference_segment(N_60, pyramid.sqrt_N, -40000, 40000, 0.35, 20)
+    assert pyramid.computed == len(coarse) and pyramid.reused == 0
+
+    # A 4x finer grid over the first half contains every coarse offset there
+    fine = pyramid.segment_distances(-40000, 0, 40)
+    assert fine == _reference_segment(N_60, pyramid.sqrt_N, -40000, 0, 0.35, 40)
+    coarse_in_half = [o for o in segment_offsets(-40000, 40000, 20)
+                      if o < 0 and (pyramid.sqrt_N + o) % 2]
+    assert pyramid.reused == len(coarse_in_half)
+    assert pyramid.stats(-40000, 0).score == 1.0 / (sum(fine) / len(fine) + 1e-10)
+    assert DensityStats().score == 0.0
+
+
+def test_stats_match_brute_force():
+    pyramid = DensityPyramid(N_60, 0.3, method='float')
+    rng = random.Random(5)
+    offsets = [rng.randint(-50000, 50000) for _ in range(500)]
+    pyramid.distances(pyramid.sqrt_N + o for o in offsets)
+    samples = dict(zip(offsets, pyramid.distances(pyramid.sqrt_N + o for o in offsets)))
+
+    for _ in range(200):
+        start = rng.randint(-60000, 60000)
+        end = start + rng.randint(0, 40000)
+        inside = [d for o, d in samples.items() if start <= o < end]
+        stats = pyramid.stats(start, end)
+        assert stats.count == len(inside)
+        if inside:
+            assert stats.min == min(inside)
+            assert abs(stats.mean - sum(inside) / len(inside)) < 1e-12
+    assert pyramid.stats(10, 10).count == 0
+
+
+def test_segment_stats_score_only_the_segment_grid():
+    fresh = DensityPyramid(N_60, 0.35, method='float')
+    expected = fresh.segment_stats(-20000, 0, 29)
+
+    # Samples from another grid in the range neither count nor change the score
+    pyramid = DensityPyramid(N_60, 0.35, method='float')
+    pyramid.segment_distances(-40001, 40000, 41)
+    grid = pyramid.segment_distances(-20000, 0, 29)
+    assert pyramid.stats(-20000, 0).count > len(grid)
+    reused = pyramid.reused
+    assert pyramid.segment_stats(-20000, 0, 29) == expected
+    assert expected.count == len(grid)
+    assert expected.score == 1.0 / (sum(grid) / len(grid) + 1e-10)
+    assert pyramid.reused - reused == len(grid)
+    assert DensityPyramid(N_60, 0.35, method='float').segment_stats(5, 5).count == 0
+
+
+def test_persisted_samples_are_reused(tmp_path, monkeypatch):
+    monkeypatch.setenv(table_cache.CACHE_ENV, str(tmp_path))
+    first = DensityPyramid(N_60, 0.35, method='float', persist=True)
+    expected = first.segment_distances(-1000, 1000, 50)
+    first.save()
+
+    second = DensityPyramid(N_60, 0.35, method='float', persist=True)
+    assert len(second) == len(first)
+    assert second.segment_distances(-1000, 1000, 50) == expected
+    assert second.computed == 0 and second.reused == len(expected)
+
+    # Another exponent or kernel is a different table
+    assert len(DensityPyramid(N_60, 0.3, method='float', persist=True)) == 0
+    assert len(DensityPyramid(N_60, 0.35, method='mp', persist=True)) == 0
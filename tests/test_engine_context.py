@@ -0,0 +1,67 @@
+"""
+Tests for per-engine mpmath contexts (gva_factorization.engine_context).
+
+Engines compute in a private context, so they leave the global precision
+alone and can run side by side in a thread pool.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import mpmath as mp
+
+from gva_factorization import (GATE_1_30BIT, adaptive_precision, embed_torus_geodesic,
+                               engine_context, gva_factor_search, riemannian_distance)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'experiments',
+                                'fractal-recursive-gva-falsification'))
+from fr_gva_implementation import fr_gva_factor_search
+
+FR_GVA_47BIT = 100000980001501  # 10000019 × 10000079
+
+
+def test_context_precision():
+    ctx = engine_context(GATE_1_30BIT)
+    assert ctx.dps == adaptive_precision(GATE_1_30BIT)
+    assert engine_context(GATE_1_30BIT, 800).dps == 800
+    assert ctx is not mp.mp
+
+
+def test_context_matches_global_precision():
+    n, candidate, k = 1125899772623531, 33554393, 0.35
+    ctx = engine_context(n)
+    with mp.workdps(ctx.dps):
+        expected = riemannian_distance(embed_torus_geodesic(n, k), embed_torus_geodesic(candidate, k))
+    dps = mp.mp.dps
+    distance = riemannian_distance(embed_torus_geodesic(n, k, ctx=ctx),
+                                   embed_torus_geodesic(candidate, k, ctx=ctx), ctx=ctx)
+    assert mp.mp.dps == dps
+    assert distance == expected
+
+
+def run_gva(N):
+    trace = {}
+    return gva_factor_search(N, k_values=[0.35], max_candidates=5000,
+                             allow_any_range=True, trace=trace), trace['hit_rank']
+
+
+def run_fr_gva(N):
+    metrics = {}
+    return fr_gva_factor_search(N, allow_any_range=True, metrics=metrics), metrics
+
+
+def test_engines_share_a_thread_pool():
+    dps = mp.mp.dps
+    serial = [run_gva(GATE_1_30BIT), run_fr_gva(FR_GVA_47BIT), run_gva(GATE_1_30BIT)]
+    assert mp.mp.dps == dps
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(run_gva, GATE_1_30BIT), pool.submit(run_fr_gva, FR_GVA_47BIT),
+                   pool.submit(run_gva, GATE_1_30BIT)]
+        threaded = [future.result() for future in futures]
+
+    assert threaded == serial
+    assert set(serial[0][0]) == {32749, 32771}
+    assert set(serial[1][0]) == {10000019, 10000079}
+    assert mp.mp.dps == dps
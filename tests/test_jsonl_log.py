@@ -0,0 +1,65 @@
+"""
+Tests for the buffered background JSONL writer (experiments/jsonl_log.py).
+"""
+
+import pytest
+
+from jsonl_log import BufferedJSONLWriter, read_jsonl
+
+
+def test_header_then_records_in_order(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    with BufferedJSONLWriter(path, header={'type': 'header', 'seed': 42},
+                             flush_records=7) as log:
+        for i in range(100):
+            log.write({'type': 'step', 'i': i})
+
+    records = list(read_jsonl(path))
+    assert records[0] == {'type': 'header', 'seed': 42}
+    assert [r['i'] for r in records[1:]] == list(range(100))
+
+
+def test_flush_makes_records_visible(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    log = BufferedJSONLWriter(path, flush_records=10**6, flush_interval=3600)
+    log.write({'event': 'peak'})
+    log.flush()
+    assert list(read_jsonl(path)) == [{'event': 'peak'}]
+    log.close()
+    log.close()  # idempotent
+    with pytest.raises(ValueError):
+        log.write({'event': 'late'})
+
+
+def test_flush_after_close_returns(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    log = BufferedJSONLWriter(path)
+    log.write({'event': 'complete'})
+    log.close()
+    log.flush()  # the writer thread has exited; everything is already on disk
+    assert list(read_jsonl(path)) == [{'event': 'complete'}]
+
+
+def test_gzip_round_trip(tmp_path):
+    path = str(tmp_path / "run.jsonl.gz")
+    with BufferedJSONLWriter(path) as log:
+        log.write({'event': 'complete', 'steps': 3})
+    with open(path, 'rb') as f:
+        assert f.read(2) == b'\x1f\x8b'
+    assert list(read_jsonl(path)) == [{'event': 'complete', 'steps': 3}]
+
+
+def test_unserialisable_record_surfaces_on_close(tmp_path):
+    log = BufferedJSONLWriter(str(tmp_path / "run.jsonl"))
+    log.write({'bad': object()})
+    with pytest.raises(TypeError):
+        log.close()
+
+
+def test_non_dict_record_is_rejected(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    with BufferedJSONLWriter(path) as log:
+        with pytest.raises(TypeError):
+            log.write(['not', 'a', 'dict'])
+        log.write({'event': 'complete'})
+    assert list(read_jsonl(path)) == [{'event': 'complete'}]
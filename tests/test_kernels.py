@@ -0,0 +1,122 @@
+"""
+Conformance tests for the shared geodesic kernels (geofac/kernels.py).
+
+The mpmath path must reproduce the former per-module copies bit for bit;
+the float and fixed-point paths must agree with it.
+"""
+
+import mpmath as mp
+import numpy as np
+import pytest
+
+from geofac.kernels import (FIXED_BITS, distance_matrix, embed_fixed, embed_float,
+                            embed_torus_geodesic, geodesic_distances, riemannian_distance,
+                            torus_distance_fixed)
+from gva_factorization import adaptive_precision, engine_context
+
+CHALLENGE_127 = 137524771864208156028430259349934309717
+P_127 = 10508623501177419659
+
+
+def _reference_embed(n, k, dimensions=7):
+    """embed_torus_geodesic as copied into gva_factorization and the experiments."""
+    phi = mp.mpf(1 + mp.sqrt(5)) / 2
+    coords = []
+    for d in range(dimensions):
+        phi_power = phi ** (d + 1)
+        coord = mp.fmod(n * phi_power, 1)
+        if k != 1.0:
+            coord = mp.power(coord, k)
+            coord = mp.fmod(coord, 1)
+        coords.append(coord)
+    return coords
+
+
+def _reference_distance(p1, p2):
+    dist_sq = mp.mpf(0)
+    for c1, c2 in zip(p1, p2):
+        diff = abs(c1 - c2)
+        wrap_diff = mp.mpf(1) - diff
+        min_diff = min(diff, wrap_diff)
+        dist_sq += min_diff * min_diff
+    return mp.sqrt(dist_sq)
+
+
+def _reference_distance_squared_terms(p1, p2):
+    """Variant of shell-geometry-scan-01 and gva-curvature-validation-2025."""
+    dist_sq = mp.mpf(0)
+    for x, y in zip(p1, p2):
+        diff = abs(x - y)
+        torus_diff = min(diff, 1 - diff)
+        dist_sq += torus_diff ** 2
+    return mp.sqrt(dist_sq)
+
+
+def _cases():
+    return [(1073217479, [32749, 32771, 32759]),
+            (1208925821870827034933083, [1099511627791, 1099511629813]),
+            (CHALLENGE_127, [P_127, P_127 + 2, 13086849276577416863])]
+
+
+@pytest.mark.parametrize('k', [0.3, 0.35, 1.0])
+def test_mp_path_matches_former_copies(k):
+    for N, candidates in _cases():
+        for dps in [50, adaptive_precision(N)]:
+            with mp.workdps(dps):
+                reference = _reference_embed(N, k)
+                assert embed_torus_geodesic(N, k) == reference
+                for c in candidates:
+                    coords = _reference_embed(c, k)
+                    expected = _reference_distance(reference, coords)
+                    assert riemannian_distance(reference, coords) == expected
+                    assert _reference_distance_squared_terms(reference, coords) == expected
+
+            ctx = engine_context(N, dps)
+            assert ctx.dps == max(dps, adaptive_precision(N))
+            with mp.workdps(ctx.dps):
+                reference = _reference_embed(N, k, 5)
+            assert embed_torus_geodesic(N, k, 5, ctx=ctx) == reference
+
+
+@pytest.mark.parametrize('k', [0.35, 1.0])
+def test_float_and_fixed_paths_agree(k):
+    for N, candidates in _cases():
+        candidates = candidates + [N // 3 + i for i in range(40)]
+        ctx = engine_context(N)
+        exact = geodesic_distances(N, candidates, k, method='mp', ctx=ctx)
+
+        float_distances = geodesic_distances(N, candidates, k, method='float')
+        fixed_distances = geodesic_distances(N, candidates, k, method='fixed')
+        np.testing.assert_allclose(float_distances, exact, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(fixed_distances, exact, rtol=0, atol=2.0 ** -48)
+        assert np.argsort(fixed_distances).tolist() == np.argsort(exact).tolist()
+
+        scale = ctx.mpf(2) ** FIXED_BITS
+        for c in candidates[:5]:
+            fixed = embed_fixed(c, k)
+            floors = [int(ctx.floor(x * scale)) for x in embed_torus_geodesic(c, k, ctx=ctx)]
+            assert all(abs(a - b) <= 1 for a, b in zip(fixed, floors))
+            assert np.abs(embed_float([c], k)[0] - [float(x) for x in
+                                                    embed_torus_geodesic(c, k, ctx=ctx)]).max() < 1e-14
+
+
+@pytest.mark.parametrize('method', ['float', 'fixed'])
+def test_distance_matrix_columns(method):
+    N, candidates = _cases()[2]
+    k_values = [0.25, 0.35, 1.0]
+    matrix = distance_matrix(N, candidates, k_values, method=method)
+    assert matrix.shape == (len(candidates), len(k_values))
+    for j, k in enumerate(k_values):
+        assert matrix[:, j].tolist() == geodesic_distances(N, candidates, k, method=method).tolist()
+    assert distance_matrix(N, candidates, [], method=method).shape == (len(candidates), 0)
+
+
+def test_fixed_distance_and_api_edges():
+    one = 1 << FIXED_BITS
+    assert torus_distance_fixed((0, 0), (one - 3, 4)) == 5
+    assert embed_float([], 0.35).shape == (0, 7)
+    assert geodesic_distances(CHALLENGE_127, [], 0.35).shape == (0,)
+    with pytest.raises(ValueError):
+        torus_distance_fixed((0,), (0, 0))
+    with pytest.raises(ValueError):
+        geodesic_distances(CHALLENGE_127, [P_127], 0.35, method='gpu')
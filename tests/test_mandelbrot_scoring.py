@@ -0,0 +1,56 @@
+"""
+Tests for batched Mandelbrot segment scoring (experiments/mandelbrot_scoring.py).
+"""
+
+from math import e, isqrt, log
+
+import numpy as np
+import pytest
+
+from mandelbrot_scoring import BATCH_MIN_SEGMENTS, score_segments
+
+CHALLENGE_127 = 137524771864208156028430259349934309717
+
+
+def _reference_score(segment_start, segment_end, N, sqrt_N, kappa,
+                     max_iterations=100, escape_radius=2.0):
+    """score_segment_with_mandelbrot as written in the FR-GVA experiments."""
+    segment_center = (segment_start + segment_end) // 2
+    relative_pos = (segment_center - sqrt_N) / sqrt_N if sqrt_N > 0 else 0
+    c = complex(kappa + relative_pos * 0.1, log(N) * 1e-20)
+    z = 0j
+    escape_count = 0
+    total_magnitude = 0.0
+    for iteration in range(max_iterations):
+        z = z**2 + c
+        magnitude = abs(z)
+        total_magnitude += magnitude
+        if magnitude > escape_radius:
+            escape_count += 1
+            z = z / (magnitude / escape_radius)
+    avg_magnitude = total_magnitude / max_iterations
+    escape_ratio = escape_count / max_iterations
+    score = escape_ratio * 0.6 + min(avg_magnitude / 10.0, 1.0) * 0.4
+    return min(score, 1.0)
+
+
+@pytest.mark.parametrize('N', [1073217479, 100000980001501, CHALLENGE_127])
+@pytest.mark.parametrize('count', [BATCH_MIN_SEGMENTS // 2, 3 * BATCH_MIN_SEGMENTS])
+def test_bit_identical_to_scalar(N, count):
+    sqrt_N = isqrt(N)
+    rng = np.random.default_rng(count)
+    for kappa in [0.5, 2.0 * log(N + 1) / e ** 2, 0.3, -0.75, -1.9]:
+        starts = [sqrt_N - sqrt_N // 3 + int(x) for x in rng.integers(0, 2 * (sqrt_N // 3), count)]
+        segments = [(s, s + int(w)) for s, w in zip(starts, rng.integers(1, 10**6, count))]
+        scores = score_segments(segments, N, sqrt_N, kappa)
+        assert scores.dtype == np.float64
+        assert scores.tolist() == [_reference_score(s, t, N, sqrt_N, kappa) for s, t in segments]
+
+
+def test_iteration_parameters_and_empty_batch():
+    N = 1073217479
+    sqrt_N = isqrt(N)
+    segments = [(sqrt_N + 100 * i, sqrt_N + 100 * i + 100) for i in range(-100, 100)]
+    scores = score_segments(segments, N, sqrt_N, 0.3, max_iterations=37, escape_radius=1.5)
+    assert scores.tolist() == [_reference_score(s, t, N, sqrt_N, 0.3, 37, 1.5) for s, t in segments]
+    assert score_segments([], N, sqrt_N, 0.3).shape == (0,)
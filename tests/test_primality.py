@@ -0,0 +1,60 @@
+"""
+Tests for the shared primality module (experiments/primality.py).
+"""
+
+import numpy as np
+import pytest
+
+from primality import (
+    DETERMINISTIC_LIMIT,
+    is_prime,
+    is_prime_many,
+    next_prime,
+    primes_up_to,
+)
+
+
+def test_is_prime_matches_sieve():
+    primes = set(primes_up_to(70000).tolist())
+    assert all(is_prime(n) == (n in primes) for n in range(70000))
+
+
+def test_strong_pseudoprimes_rejected():
+    # Smallest strong pseudoprimes to the first 5, 6, 7, 9 and 12 prime bases.
+    for n in (
+        2152302898747,
+        3474749660383,
+        341550071728321,
+        3825123056546413051,
+        318665857834031151167461,
+    ):
+        assert not is_prime(n)
+
+
+def test_gate_factors_are_prime():
+    # Gate 1 and Gate 2 factors (docs/VALIDATION_GATES.md)
+    for p in (32749, 32771, 1073741789, 1073741827):
+        assert is_prime(p)
+    assert not is_prime(1073741789 * 1073741827)
+
+
+def test_is_prime_rejects_out_of_range():
+    mersenne_89 = 2**89 - 1  # prime, no small factors, above the bound
+    assert mersenne_89 > DETERMINISTIC_LIMIT
+    with pytest.raises(ValueError):
+        is_prime(mersenne_89)
+
+
+def test_is_prime_many_matches_scalar():
+    values = np.arange(10**12, 10**12 + 2000)
+    assert is_prime_many(values).tolist() == [is_prime(int(v)) for v in values]
+    big = [2**64 - 59, 2**64 - 57]
+    assert is_prime_many(big).tolist() == [True, False]
+
+
+def test_next_prime():
+    assert next_prime(0) == 2
+    assert next_prime(3) == 3
+    assert next_prime(14) == 17
+    assert next_prime(1073741790) == 1073741827
+    assert next_prime(2**64) == 2**64 + 13
@@ -0,0 +1,107 @@
+"""
+Tests for the experiment result cache (experiments/result_cache.py).
+"""
+
+import importlib.util
+import textwrap
+from dataclasses import dataclass
+
+import table_cache
+from result_cache import cached_unit, source_hash
+
+ENGINE = '''
+WINDOW = {window}
+UNUSED = {unused}
+
+
+def _offsets(k):
+    return [round(k * o, 6) for o in range(WINDOW)]
+
+
+def sweep_unit(N, k):
+    return sum(_offsets(k)) + N % 7
+
+
+def report(results):
+    return sorted(results)
+'''
+
+
+def _load(tmp_path, name, **constants):
+    path = tmp_path / f'{name}.py'
+    path.write_text(textwrap.dedent(ENGINE.format(**constants)))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@dataclass
+class Config:
+    samples: int
+    threshold: float
+
+
+def test_units_are_computed_once_per_argument_set(tmp_path, monkeypatch):
+    monkeypatch.setenv(table_cache.CACHE_ENV, str(tmp_path))
+    calls = []
+
+    @cached_unit('sweep', ignore=('verbose',))
+    def unit(N, k, config, verbose=False):
+        calls.append((N, k))
+        return {'N': N, 'k': k, 'samples': config.samples}
+
+    config = Config(samples=3000, threshold=0.92)
+    N = 137524771864208156028430259349934309717
+    first = [unit(N, k, config) for k in (0.3, 0.35)]
+    # One more k value costs one new unit; verbosity is not part of the key
+    second = [unit(N, k, config, verbose=True) for k in (0.3, 0.35, 0.4)]
+    assert second[:2] == first and len(calls) == 3
+    assert (unit.hits, unit.misses) == (2, 3)
+    assert not unit.last_hit
+    unit(N, 0.3, config)
+    assert unit.last_hit
+
+    unit(N, 0.3, Config(samples=3000, threshold=0.5))
+    unit(N + 2, 0.3, config)
+    assert len(calls) == 5
+
+    monkeypatch.setenv(table_cache.CACHE_ENV, '')
+    unit(N, 0.3, config)
+    assert len(calls) == 6
+
+
+def test_code_hash_follows_the_unit_and_its_dependencies(tmp_path):
+    base = _load(tmp_path, 'engine_a', window=3, unused=1)
+    same = _load(tmp_path, 'engine_b', window=3, unused=2)
+    wider = _load(tmp_path, 'engine_c', window=4, unused=1)
+
+    # Helpers and constants the unit reads are hashed, others are not
+    assert source_hash([base.sweep_unit]) == source_hash([same.sweep_unit])
+    assert source_hash([base.sweep_unit]) != source_hash([wider.sweep_unit])
+    assert source_hash([base.report]) == source_hash([wider.report])
+
+    # Modules and files are hashed whole
+    assert source_hash([base]) != source_hash([same])
+    data = tmp_path / 'histogram.csv'
+    data.write_text('delta,density\n0,0.1\n')
+    before = source_hash([base.sweep_unit, str(data)])
+    data.write_text('delta,density\n0,0.2\n')
+    assert source_hash([base.sweep_unit, str(data)]) != before
+
+
+def test_changed_engine_is_recomputed(tmp_path, monkeypatch):
+    monkeypatch.setenv(table_cache.CACHE_ENV, str(tmp_path / 'cache'))
+    # engine_e is a byte-identical copy of engine_d; engine_f has a wider window
+    engines = [_load(tmp_path, 'engine_d', window=2, unused=0),
+               _load(tmp_path, 'engine_e', window=2, unused=0),
+               _load(tmp_path, 'engine_f', window=5, unused=0)]
+    results = []
+    for engine in engines:
+        @cached_unit('sweep', sources=[engine])
+        def unit(N, k):
+            return engine.sweep_unit(N, k)
+
+        results.append((unit(1073217479, 0.35), unit.misses))
+    assert [misses for _, misses in results] == [1, 0, 1]
+    assert results[0][0] == results[1][0] != results[2][0]
@@ -0,0 +1,90 @@
+"""
+Tests for the content-addressed table cache (experiments/table_cache.py).
+"""
+
+import mpmath as mp
+import numpy as np
+
+import table_cache
+from table_cache import cached_table, load_table, store_table, table_key, table_path
+
+
+def _counting(value):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value
+
+    return compute, calls
+
+
+def test_miss_then_hit_round_trips_exactly(tmp_path, monkeypatch):
+    monkeypatch.setenv(table_cache.CACHE_ENV, str(tmp_path))
+    with mp.workdps(708):
+        table = {2: mp.sqrt(2) - 1, 3: mp.sqrt(3) - 1}
+    compute, calls = _counting({'roots': table, 'bounds': np.arange(-5, 6, dtype=np.int64)})
+    params = {'primes': [2, 3], 'dps': 708}
+
+    first = cached_table('frac_sqrt', params, compute)
+    second = cached_table('frac_sqrt', params, compute)
+
+    assert len(calls) == 1
+    assert second['roots'] == table
+    assert second['roots'][2]._mpf_ == table[2]._mpf_
+    assert np.array_equal(second['bounds'], first['bounds'])
+
+
+def test_key_is_canonical_and_parameter_sensitive():
+    assert table_key('t', {'a': 1, 'b': 2}) == table_key('t', {'b': 2, 'a': 1})
+    assert table_key('t', {'dps': 100}) != table_key('t', {'dps': 101})
+    assert table_key('t', {'dps': 100}) != table_key('u', {'dps': 100})
+    assert table_key('t', {'dps': 100}) != table_key('t', {'dps': 100}, version=2)
+    # params cannot collide with the version fields
+    assert table_key('t', {'version': 2}) != table_key('t', {}, version=2)
+
+
+def test_bumped_version_recomputes(tmp_path, monkeypatch):
+    monkeypatch.setenv(table_cache.CACHE_ENV, str(tmp_path))
+    params = {'primes': [2, 3], 'dps': 50}
+    assert cached_table('frac_sqrt', params, lambda: 'old') == 'old'
+    assert cached_table('frac_sqrt', params, lambda: 'edited') == 'old'
+    assert cached_table('frac_sqrt', params, lambda: 'edited', version=2) == 'edited'
+    assert load_table('frac_sqrt', params, version=2) == 'edited'
+
+
+def test_corrupt_file_is_recomputed(tmp_path, monkeypatch):
+    monkeypatch.setenv(table_cache.CACHE_ENV, str(tmp_path))
+    params = {'window': 10}
+    path = table_path('boundaries', params)
+    tmp_path.joinpath(path).write_bytes(b'GEOFAC-TABLE-1\ntruncated')
+    compute, calls = _counting([1, 2, 3])
+
+    assert cached_table('boundaries', params, compute) == [1, 2, 3]
+    assert cached_table('boundaries', params, compute) == [1, 2, 3]
+    assert len(calls) == 1
+
+
+def test_empty_env_disables_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(table_cache.CACHE_ENV, '')
+    compute, calls = _counting(42)
+
+    assert cached_table('t', {}, compute) == 42
+    assert cached_table('t', {}, compute) == 42
+    assert len(calls) == 2
+    assert table_path('t', {}) is None
+
+
+def test_store_replaces_and_load_defaults(tmp_path, monkeypatch):
+    monkeypatch.setenv(table_cache.CACHE_ENV, str(tmp_path))
+    params = {'N': '1073217479', 'k': 0.35}
+    assert load_table('samples', params, {}) == {}
+
+    store_table('samples', params, {1: 0.5})
+    store_table('samples', params, {1: 0.5, 3: 0.25})
+    assert load_table('samples', params) == {1: 0.5, 3: 0.25}
+    assert cached_table('samples', params, lambda: {}) == {1: 0.5, 3: 0.25}
+
+    monkeypatch.setenv(table_cache.CACHE_ENV, '')
+    store_table('samples', params, {5: 1.0})
+    assert load_table('samples', params) is None
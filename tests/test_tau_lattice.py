@@ -0,0 +1,113 @@
+"""
+Tests for the memoised τ lattice (experiments/tau_lattice.py).
+"""
+
+import mpmath as mp
+import numpy as np
+
+from tau_lattice import TauEvaluator, TauLattice, richardson_third_derivative_float
+
+CHALLENGE_127 = 137524771864208156028430259349934309717
+
+
+def _reference_tau(N, b, phi):
+    """compute_tau as written in the τ experiments."""
+    scale = mp.power(2, b)
+    if scale < 1:
+        return mp.mpf(0)
+    log_ratio = mp.log(scale / mp.sqrt(N))
+    phase = mp.fmod(scale * phi, 1)
+    phase_alignment = mp.mpf(1) - mp.power(mp.sin(mp.pi * phase), 2)
+    decay = mp.exp(-abs(log_ratio) * 0.5)
+    return mp.log(1 + phase_alignment * decay)
+
+
+def _naive_richardson(f, b, h):
+    """The 8-evaluation Richardson stencil the τ experiments used to inline."""
+    h2 = h / 2
+    coarse = (f(b + 2*h) - 2*f(b + h) + 2*f(b - h) - f(b - 2*h)) / (2 * h**3)
+    fine = (f(b + 2*h2) - 2*f(b + h2) + 2*f(b - h2) - f(b - 2*h2)) / (2 * h2**3)
+    refined = (4 * fine - coarse) / 3
+    return refined, abs(refined - fine)
+
+
+def test_profile_evaluates_each_node_once():
+    with mp.workdps(50):
+        h = mp.mpf(1) / 8
+        lattice = TauLattice(mp.sin, mp.mpf(0), h)
+        n = 40
+        for i in range(n):
+            lattice(2 * i)
+            lattice.richardson_third_derivative(2 * i)
+        # Even nodes -4 .. 2n+2, odd nodes -1 .. 2n-1
+        assert lattice.evaluations == 2 * (n - 1) + 7
+
+
+def test_matches_inline_stencils():
+    with mp.workdps(50):
+        h = mp.mpf('0.01')
+        lattice = TauLattice(mp.exp, mp.mpf('0.3'), h)
+        for i in range(5):
+            b = lattice.point(2 * i)
+            refined, error = lattice.richardson_third_derivative(2 * i)
+            expected, expected_error = _naive_richardson(mp.exp, b, h)
+            assert abs(refined - expected) < mp.mpf('1e-40')
+            assert abs(error - expected_error) < mp.mpf('1e-40')
+            # exp''' = exp; Richardson leaves an O(h^4) error
+            assert abs(refined - mp.exp(b)) < mp.mpf('1e-8')
+            assert abs(lattice.first_derivative(2 * i) - mp.exp(b)) < mp.mpf('1e-4')
+            assert abs(lattice.second_derivative(2 * i) - mp.exp(b)) < mp.mpf('1e-4')
+
+
+def test_float_grid_reproduced_exactly():
+    start, h = 1.0, (65.5 - 1.0) / 99
+    lattice = TauLattice(lambda b: b, start, h)
+    assert [lattice.point(2 * i) for i in range(100)] == [start + i * h for i in range(100)]
+
+
+def test_cache_keyed_by_precision():
+    lattice = TauLattice(mp.sqrt, mp.mpf(2), mp.mpf(1))
+    with mp.workdps(15):
+        low = lattice(0)
+    with mp.workdps(60):
+        high = lattice(0)
+        assert high == mp.sqrt(2)
+    assert lattice.evaluations == 2
+    assert low != high
+
+
+def test_evaluator_matches_reference_tau():
+    with mp.workdps(708):
+        phi = (1 + mp.sqrt(5)) / 2
+        evaluator = TauEvaluator(CHALLENGE_127, phi)
+        for b in ['-0.5', '1', '17.25', '63.28', '63.5', '65.4']:
+            b = mp.mpf(b)
+            assert abs(evaluator(b) - _reference_tau(CHALLENGE_127, b, phi)) < mp.mpf('1e-600')
+
+
+def test_float_fast_path():
+    b_values = np.linspace(-1.0, 66.0, 301)
+    with mp.workdps(708):
+        evaluator = TauEvaluator(CHALLENGE_127)
+        exact = np.array([float(evaluator(b)) for b in b_values])
+    fast = evaluator.evaluate_float(b_values)
+    assert fast.dtype == np.float64
+    assert np.max(np.abs(fast - exact)) < 1e-12
+    # Constructed at default precision, the phase reduction still uses enough bits
+    assert np.max(np.abs(TauEvaluator(CHALLENGE_127).evaluate_float(b_values) - exact)) < 1e-12
+
+
+def test_float_richardson_screen_matches_lattice():
+    with mp.workdps(708):
+        evaluator = TauEvaluator(CHALLENGE_127)
+        h = mp.mpf(64) / 199
+        lattice = TauLattice(evaluator, mp.mpf(1), h)
+        # mpf lattice points: near b = 64 the float roundings of b land on
+        # unrelated phases
+        tau_nodes = evaluator.evaluate_float([lattice.point(j) for j in range(-4, 2 * 200 + 3)])
+        d3_float, err_float = richardson_third_derivative_float(tau_nodes, float(h))
+        assert len(d3_float) == len(err_float) == 200
+        for i in (0, 57, 190, 199):
+            d3, err = lattice.richardson_third_derivative(2 * i)
+            assert abs(d3_float[i] - float(d3)) < 1e-9 * max(1.0, abs(float(d3)))
+            assert abs(err_float[i] - float(err)) < 1e-9 * max(1.0, abs(float(err)))
@@ -0,0 +1,96 @@
+"""
+Tests for the columnar candidate trace format (geofac/trace.py).
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from geofac.trace import RECORD_DTYPE, RECORD_SIZE, TraceWriter, open_trace, read_header
+from geofac_local_global import geofac_local_global
+from gva_factorization import GATE_1_30BIT, gva_factor_search
+
+FR_GVA_47BIT = 100000980001501  # 10000019 × 10000079
+
+
+def test_round_trip_and_truncated_tail(tmp_path):
+    path = str(tmp_path / 'run.gft')
+    rows = [(3, 0.5, 1, 0, 0, False), (2**64 + 5, 0.25, 2, 1, 1, True),
+            (2**128 - 1, math.nan, 3, 2, 0, False)]
+    with TraceWriter(path, 2**200 + 1, [0.3, 0.35], meta={'budget': 10}, buffer_records=2) as w:
+        for row in rows:
+            w.record(*row)
+    assert w.records_written == 3
+
+    trace = open_trace(path)
+    assert isinstance(trace.records, np.memmap) and trace.records.dtype == RECORD_DTYPE
+    assert trace.N == 2**200 + 1 and trace.header['budget'] == 10
+    assert trace.candidates() == [row[0] for row in rows]
+    assert trace.records['rank'].tolist() == [1, 2, 3]
+    assert trace.records['predicate'].tolist() == [0, 1, 0]
+    assert trace.phase_mask('search').tolist() == [False, True, False]
+    assert trace.header['tested_phases'] == ['search', 'linear']
+
+    # A partial record at the end (interrupted write) is ignored
+    _, offset = read_header(path)
+    assert offset % 64 == 0
+    with open(path, 'ab') as f:
+        f.write(b'\0' * (RECORD_SIZE // 2))
+    assert len(open_trace(path)) == 3
+
+
+def test_rejects_bad_candidates_and_files(tmp_path):
+    writer = TraceWriter(str(tmp_path / 'bad.gft'), 15, [0.35])
+    writer.record(2**128, 1.0, 1, 1)
+    with pytest.raises(ValueError):
+        writer.close()
+    with pytest.raises(ValueError):
+        writer.k_id(0.4)
+
+    (tmp_path / 'not_a_trace').write_bytes(b'{"N": 15}')
+    with pytest.raises(ValueError):
+        open_trace(str(tmp_path / 'not_a_trace'))
+
+
+@pytest.mark.parametrize('guided', [True, False])
+def test_gva_trace_certifies_the_run(tmp_path, guided):
+    path = str(tmp_path / 'gva.gft')
+    k_values = [0.3, 0.35]
+    expected_trace = {}
+    expected = gva_factor_search(GATE_1_30BIT, k_values=k_values, allow_any_range=True,
+                                 use_geodesic_guidance=guided, trace=expected_trace)
+    trace_dict = {}
+    with TraceWriter(path, GATE_1_30BIT, k_values) as writer:
+        result = gva_factor_search(GATE_1_30BIT, k_values=k_values, allow_any_range=True,
+                                   use_geodesic_guidance=guided, trace=trace_dict,
+                                   trace_writer=writer)
+    assert result == expected and trace_dict['hit_rank'] == expected_trace['hit_rank']
+
+    trace = open_trace(path)
+    tested = trace.phase_mask('search' if guided else 'linear')
+    records = trace.records[tested]
+    candidates = trace.candidates(records)
+    assert records['predicate'].tolist() == [GATE_1_30BIT % c == 0 for c in candidates]
+    assert records['rank'][-1] == trace_dict['hit_rank'] and records['predicate'][-1]
+    assert candidates[-1] in result
+
+    sample = trace.records[trace.phase_mask('sample')]
+    if guided:
+        assert len(sample) > 0 and not sample['predicate'].any()
+        assert np.all(np.diff(sample['score']) >= 0)
+    else:
+        assert len(sample) == 0
+
+
+def test_local_global_trace_matches_json_log(tmp_path):
+    path = str(tmp_path / 'lg.gft')
+    log = geofac_local_global(FR_GVA_47BIT, window=100_000, samples=2000, top_k=200,
+                              trace_path=path)
+    trace = open_trace(path)
+    assert trace.header['engine'] == 'local_global'
+    assert trace.header['tested_phases'] == ['certify']
+    assert trace.candidates() == [entry['d'] for entry in log['candidates']]
+    assert trace.records['score'].tolist() == [entry['score'] for entry in log['candidates']]
+    assert trace.records['predicate'].astype(bool).tolist() == [
+        entry['is_factor'] for entry in log['candidates']]
@@ -0,0 +1,80 @@
+"""
+Tests for trace re-certification (geofac/verify.py).
+"""
+
+import shutil
+
+import numpy as np
+
+from geofac.trace import RECORD_DTYPE, TraceWriter, read_header
+from geofac.verify import check_predicates, main, verify_trace
+from gva_factorization import GATE_1_30BIT, gva_factor_search
+
+K_VALUES = [0.3, 0.35]
+
+
+def _gva_trace(tmp_path):
+    path = str(tmp_path / 'gva.gft')
+    trace = {}
+    with TraceWriter(path, GATE_1_30BIT, K_VALUES) as writer:
+        result = gva_factor_search(GATE_1_30BIT, k_values=K_VALUES, allow_any_range=True,
+                                   trace=trace, trace_writer=writer)
+    return path, result, trace['hit_rank']
+
+
+def _tamper(path, **fields):
+    """Overwrite fields of single records in place: field=(index, value)."""
+    _, offset = read_header(path)
+    records = np.memmap(path, dtype=RECORD_DTYPE, mode='r+', offset=offset)
+    for name, (index, value) in fields.items():
+        records[name][index] = value
+    records.flush()
+    del records
+
+
+def test_gva_run_is_certified(tmp_path):
+    path, result, hit_rank = _gva_trace(tmp_path)
+    report = verify_trace(path, workers=1, rescore=50, expected_factor=result[1],
+                          expected_rank=hit_rank)
+    assert report.ok, report.to_dict()
+    assert report.factor in result and report.factor_rank == hit_rank
+    assert report.factor_phase == 'search' and report.tested > 0
+    assert report.rescored == 50 and report.max_drift < 1e-12
+
+    assert main([path, '--hit-rank', str(hit_rank), '--rescore', '5']) == 0
+    assert main([path, '--hit-rank', str(hit_rank + 1)]) == 1
+
+
+def test_tampered_trace_is_rejected(tmp_path):
+    path, result, _ = _gva_trace(tmp_path)
+    sample_index = 0  # the sample phase is logged first
+    first_divisor = verify_trace(path, workers=1).records - 1  # the run stops at its hit
+
+    bad = str(tmp_path / 'bad.gft')
+    shutil.copy(path, bad)
+    _tamper(bad, predicate=(first_divisor, 0), score=(sample_index, 0.5))
+    report = verify_trace(bad, workers=1, rescore=10_000)
+    assert first_divisor in report.predicate_mismatches
+    assert report.factor in result  # found by the recomputed predicate
+    assert report.drifted == [sample_index]
+    assert not report.ok
+
+    _tamper(bad, predicate=(first_divisor, 1), rank=(first_divisor, 7))
+    report = verify_trace(bad, workers=1)
+    assert report.rank_errors == [first_divisor] and not report.ok
+
+
+def test_parallel_chunks_match_serial(tmp_path):
+    path = str(tmp_path / 'big.gft')
+    N = 137524771864208156028430259349934309717
+    p = 10508623501177419659
+    rng = np.random.default_rng(3)
+    candidates = [p - 2**40 + int(o) for o in rng.integers(0, 2**41, size=5000)] + [p]
+    with TraceWriter(path, N, [0.35]) as writer:
+        for rank, candidate in enumerate(candidates, start=1):
+            writer.record(candidate, 0.0, rank, writer.phase_id('search'), 0, N % candidate == 0)
+    _tamper(path, predicate=(17, 1))
+
+    serial = check_predicates(path, workers=1, chunk_records=1000)
+    assert check_predicates(path, workers=2, chunk_records=1000) == serial
+    assert serial == ([17], [5000], 5001)
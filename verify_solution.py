@@ -16,6 +16,7 @@ import math
 import datetime
 try:
     import mpmath as mp
+    from geofac import kernels
     HAS_MPMATH = True
 except ImportError:
     HAS_MPMATH = False
@@ -43,29 +44,13 @@ def embed_torus_geodesic(n, k, dimensions=7):
         return []
     
     # Precision assumed set by caller via set_adaptive_precision
-    phi = mp.mpf(1 + mp.sqrt(5)) / 2
-    coords = []
-    for d in range(dimensions):
-        phi_power = phi ** (d + 1)
-        coord = mp.fmod(n * phi_power, 1)
-        if k != 1.0:
-            coord = mp.power(coord, k)
-            coord = mp.fmod(coord, 1)
-        coords.append(coord)
-    return coords
+    return kernels.embed_torus_geodesic(n, k, dimensions)
 
 def riemannian_distance(p1, p2):
     """Compute Riemannian geodesic distance on 7D torus."""
     if not HAS_MPMATH or not p1 or not p2:
         return 0.0
-        
-    dist_sq = mp.mpf(0)
-    for c1, c2 in zip(p1, p2):
-        diff = abs(c1 - c2)
-        wrap_diff = mp.mpf(1) - diff
-        min_diff = min(diff, wrap_diff)
-        dist_sq += min_diff * min_diff
-    return float(mp.sqrt(dist_sq))
+    return float(kernels.riemannian_distance(p1, p2))
 
 def verify_solution():
     print("=" * 70)